@@ -1,5 +1,5 @@
 # api_routes.py (exemplo dentro do mesmo blueprint já existente)
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, session
 from pathlib import Path
 import json
 import csv
@@ -7,17 +7,15 @@ from datetime import datetime
 
 api_routes = Blueprint('api_routes', __name__)  # se já existir, reutilize o mesmo
 
-RESULTS_ROOT = Path("outputs/resultados")
+def _latest_results_dir() -> Path | None:
+    # execução mais recente do usuário (ou da estratégia/upload pedidos) pelo índice result_runs
+    from app.core.paths import ultimo_resultado_dir
 
-def _latest_results_dir(root: Path) -> Path | None:
-    if not root.exists():
-        return None
-    dirs = [p for p in root.iterdir() if p.is_dir()]
-    if not dirs:
-        return None
-    # ordenar pela data do nome (…_YYYYMMDD_HHMMSS) ou pela mtime se preferir
-    dirs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return dirs[0]
+    return ultimo_resultado_dir(
+        owner=session.get("user"),
+        strategy_id=request.args.get("strategy_id", None, type=int),
+        upload_id=request.args.get("upload_id", None, type=int),
+    )
 
 def _safe_float(x):
     try:
@@ -92,14 +90,28 @@ def _read_backtest(dirpath: Path) -> dict | None:
                 return json.loads(p.read_text(encoding="utf-8"))
             except:
                 pass
-    return None
+    # resultado_backtest no store colunar (Arrow) → mesmo dict orient="split"
+    from services.utils.artefatos import carregar_split
+    return carregar_split(str(dirpath), "resultado_backtest")
 
 @api_routes.route("/api/comparativo", methods=["GET"])
 def api_comparativo():
-    latest = _latest_results_dir(RESULTS_ROOT)
+    from services.logic.comparativo import carregar_comparativo
+
+    latest = _latest_results_dir()
     if not latest:
         return jsonify({"error": "sem_resultados"}), 404
 
+    # registro pré-agregado pelo pipeline/backtest (leitura única, cache do processo)
+    agregado = carregar_comparativo(latest)
+    if agregado:
+        return jsonify({
+            **agregado,
+            "dir": latest.name,
+            "ts": datetime.now().isoformat(timespec="seconds")
+        }), 200
+
+    # pastas antigas (sem comparativo.json): varre o CSV
     base = _read_insight_futures_results(latest)
     if not base:
         return jsonify({"error": "sem_csv_base"}), 404
@@ -129,3 +141,34 @@ def api_comparativo():
         "ts": datetime.now().isoformat(timespec="seconds")
     }
     return jsonify(payload), 200
+
+
+@api_routes.route("/api/comparativo/execucoes", methods=["GET"])
+def api_comparativo_execucoes():
+    """
+    Comparativo lado a lado das execuções mais recentes do usuário (índice result_runs +
+    comparativo.json de cada pasta). Query: limit (<= 50), strategy_id, upload_id.
+    """
+    from services.logic.comparativo import carregar_comparativo
+    from services.repository.strategy_service import list_result_runs
+
+    limit = max(1, min(request.args.get("limit", 10, type=int), 50))
+    runs = list_result_runs(
+        owner=session.get("user"),
+        strategy_id=request.args.get("strategy_id", None, type=int),
+        upload_id=request.args.get("upload_id", None, type=int),
+        limit=limit,
+    )
+    execucoes = []
+    for run in runs:
+        agregado = carregar_comparativo(run["result_dir"]) if Path(run["result_dir"]).is_dir() else None
+        if not agregado:
+            continue
+        execucoes.append({
+            "dir": Path(run["result_dir"]).name,
+            "strategy_id": run["strategy_id"],
+            "upload_id": run["upload_id"],
+            "completed_at": run["completed_at"],
+            **agregado,
+        })
+    return jsonify({"execucoes": execucoes, "count": len(execucoes)}), 200
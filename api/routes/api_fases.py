@@ -10,10 +10,10 @@ def _load_json_duplo(temp_path: str, nome: str):
     Mantém compatibilidade com versões anteriores do salvamento.
     """
     # 1ª tentativa: dentro de /drawdown
-    dado = carregar_json(temp_path, f"drawdown/{nome}")
+    dado = carregar_json(temp_path, f"drawdown/{nome}", raise_if_missing=False)
     if dado is None:
-        # 2ª tentativa: na raiz do temp_path
-        dado = carregar_json(temp_path, nome)
+        # 2ª tentativa: na raiz do temp_path (hardlink: mesma entrada do cache)
+        dado = carregar_json(temp_path, nome, raise_if_missing=False)
     return dado
 
 @bp.route("/fases", methods=["GET"])
@@ -1,5 +1,6 @@
-from flask import Blueprint, jsonify, session
+from flask import Blueprint, jsonify, request, session
 from services.utils.file_io import carregar_json
+from services.utils.artefatos import carregar_split
 
 bp = Blueprint("api_insights", __name__, url_prefix="/api")
 
@@ -14,8 +15,9 @@ def get_insights():
         }), 400
 
     ultimos_resultados = carregar_json(temp_path, "ultimo_ciclo_completo.json")
-    ultimas_quantidades = carregar_json(temp_path, "ultimo_resultado.json")
-    prebacktest = carregar_json(temp_path, "prebacktest.json")
+    # DFs ficam no store colunar; o front recebe o mesmo formato orient="split" de antes
+    ultimas_quantidades = carregar_split(temp_path, "ultimo_resultado")
+    prebacktest = carregar_split(temp_path, "prebacktest")
 
     return jsonify({
         "status": "ok",
@@ -23,3 +25,45 @@ def get_insights():
         "ultimas_quantidades_periodo": ultimas_quantidades,
         "prebacktest": prebacktest
     })
+
+
+@bp.route("/insights/linhas/<artefato>", methods=["GET"])
+def get_insights_linhas(artefato: str):
+    """
+    Linhas paginadas de ultimo_resultado/prebacktest (o front busca só a página/janela visível).
+
+    Query: offset, limit (<= 10000), inicio/fim (período no índice de data/hora),
+           colunas=a,b,c (aceita nomes legados), max_pontos + metodo=passo|lttb|minmax
+           (redução para gráficos; no zoom o front pede só a janela visível).
+    """
+    from services.unified.linhas import ARTEFATOS_LINHAS, LIMITE_PADRAO, consultar_linhas
+
+    temp_path = session.get("temp_path", None)
+    if not temp_path:
+        return jsonify({
+            "status": "erro",
+            "mensagem": "Nenhum arquivo foi carregado na sessão."
+        }), 400
+    if artefato not in ARTEFATOS_LINHAS:
+        return jsonify({"status": "erro", "mensagem": f"Artefato inválido: {artefato}"}), 404
+
+    args = request.args
+    colunas = [c.strip() for c in args.get("colunas", "").split(",") if c.strip()] or None
+    try:
+        pagina = consultar_linhas(
+            temp_path,
+            artefato,
+            offset=args.get("offset", 0, type=int),
+            limit=args.get("limit", LIMITE_PADRAO, type=int),
+            inicio=args.get("inicio") or None,
+            fim=args.get("fim") or None,
+            colunas=colunas,
+            max_pontos=args.get("max_pontos", None, type=int),
+            metodo=args.get("metodo", "passo"),
+        )
+    except FileNotFoundError as e:
+        return jsonify({"status": "erro", "mensagem": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"status": "erro", "mensagem": str(e)}), 400
+
+    return jsonify({"status": "ok", "artefato": artefato, **pagina})
@@ -2,16 +2,34 @@
 from flask import Blueprint, session, jsonify, url_for, request, current_app
 from services.repository.strategy_service import list_strategy_cards , update_strategy, get_strategy
 from itsdangerous import URLSafeSerializer
+import os
+
+from app.core.config import settings
+from services.utils.tarefas import pendente
+from visual.miniaturas import arquivo_miniatura
 
 
 
 bp = Blueprint("api_strategies", __name__, url_prefix="/api/strategies")
 
+THUMBS_DIR = os.path.join(settings.static_dir, "thumbs")
+
+
+def _thumb(upload_id):
+    """(url do thumb pronto ou None, gerando?) — o card mostra placeholder enquanto não há url."""
+    if not upload_id:
+        return None, False
+    nome = arquivo_miniatura(THUMBS_DIR, upload_id)
+    if nome:
+        return url_for("static", filename=f"thumbs/{nome}"), False
+    return None, pendente(f"thumb:{int(upload_id)}")
+
+
 @bp.get("/recent")
 def recent_strategies():
     """
     Retorna cards de estratégias do usuário logado.
-    Pode receber ?limit=6 (padrão) para limitar a quantidade.
+    Pode receber ?limit=6 (padrão, máx. 100) e ?offset=0 para paginar (LIMIT/OFFSET no SQL).
     """
     user = session.get("user")
     if not user:
@@ -21,18 +39,23 @@ def recent_strategies():
         limit = int(request.args.get("limit", 6))
     except ValueError:
         limit = 6
+    limit = max(1, min(limit, 100))
+    offset = max(0, request.args.get("offset", 0, type=int))
 
-    rows = list_strategy_cards(owner=user) or []
+    rows = list_strategy_cards(owner=user, limit=limit, offset=offset) or []
 
     items = []
-    for r in rows[:limit]:
+    for r in rows:
         last_upload = (r.get("last_upload") or {})
+        thumb_url, thumb_pendente = _thumb(last_upload.get("id"))
         items.append({
             "id": r.get("id"),
             "title": r.get("nome") or f"Estratégia #{r.get('id')}",
             "filename": last_upload.get("filename"),
             "created_at": r.get("created_at"),
             "result_dir": r.get("result_dir"),
+            "thumb_url": thumb_url,
+            "thumb_pendente": thumb_pendente,
             "actions": {
                 "analise_pre": url_for("painel_routes.analise_pre"),
                 "analise_padronizada": url_for("painel_routes.analise_pad"),
@@ -0,0 +1,132 @@
+"""
+PT:
+    Camada HTTP compartilhada das APIs JSON: ETag/Last-Modified, 304 e compressão.
+
+    - Rotas que só leem artefatos da sessão (ROTAS_ARTEFATOS): a ETag vem do estado da pasta
+      `temp_path` (nome/mtime/tamanho dos arquivos da raiz, drawdown/ e backtest/). Se o
+      cliente mandar If-None-Match igual, responde 304 ANTES de executar a view.
+    - Demais GETs JSON em /api: ETag pelo hash do corpo (economiza banda, não CPU).
+    - gzip/deflate conforme Accept-Encoding para corpos JSON a partir de JSON_COMPRESS_MIN_BYTES.
+
+EN:
+    Shared response layer for the dashboard JSON APIs: artifact-derived ETags (304 before
+    running the view), body-hash ETags elsewhere, and gzip/deflate negotiation.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from flask import Flask, g, request, session
+
+# rotas cujo corpo depende só da sessão (temp_path) + arquivos + query string
+ROTAS_ARTEFATOS = (
+    "/api/ciclos",
+    "/api/graficos",
+    "/api/backtest",
+    "/api/insights",
+    "/api/fases",
+    "/api/fluxo",
+    "/api/padronizacao",
+    "/api/prepadronizacao",
+    "/api/ativos",
+    "/api/ciclos_estatisticas",
+)
+_SUBPASTAS = ("", "drawdown", "backtest")
+
+# muda a cada deploy/reinício: ETags antigas não sobrevivem a mudanças de código
+_BOOT = str(time.time_ns())
+
+
+def versao_artefatos(temp_path: str) -> Optional[Tuple[str, float]]:
+    """(hash do estado dos arquivos, mtime mais recente) de temp_path; None se a pasta não existe."""
+    if not temp_path or not os.path.isdir(temp_path):
+        return None
+    h = hashlib.blake2b(digest_size=12)
+    ultimo = 0
+    for sub in _SUBPASTAS:
+        pasta = os.path.join(temp_path, sub) if sub else temp_path
+        try:
+            entradas = sorted(os.scandir(pasta), key=lambda e: e.name)
+        except OSError:
+            continue
+        for e in entradas:
+            try:
+                if not e.is_file():
+                    continue
+                st = e.stat()
+            except OSError:
+                continue
+            h.update(f"{sub}/{e.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+            ultimo = max(ultimo, st.st_mtime_ns)
+    return h.hexdigest(), ultimo / 1e9
+
+
+def _rota_de_artefatos(path: str) -> bool:
+    return any(path == p or path.startswith(p + "/") for p in ROTAS_ARTEFATOS)
+
+
+def _comprimir(response, minimo: int) -> None:
+    if "Content-Encoding" in response.headers or response.direct_passthrough:
+        return
+    response.vary.add("Accept-Encoding")
+    codificacao = request.accept_encodings.best_match(("gzip", "deflate"))
+    if codificacao is None:
+        return
+    dados = response.get_data()
+    if len(dados) < minimo:
+        return
+    if codificacao == "gzip":
+        dados = gzip.compress(dados, compresslevel=6)
+    else:
+        dados = zlib.compress(dados, 6)
+    response.set_data(dados)
+    response.headers["Content-Encoding"] = codificacao
+
+
+def register_http_cache(app: Flask) -> None:
+    app.config.setdefault("JSON_COMPRESS_MIN_BYTES", 1024)
+
+    @app.before_request
+    def _etag_de_artefatos():
+        if request.method not in ("GET", "HEAD") or not _rota_de_artefatos(request.path):
+            return None
+        temp_path = session.get("temp_path")
+        versao = versao_artefatos(str(temp_path)) if temp_path else None
+        if versao is None:
+            return None
+        chave = f"{_BOOT}|{request.full_path}|{temp_path}|{versao[0]}".encode()
+        g.etag_artefatos = hashlib.blake2b(chave, digest_size=16).hexdigest()
+        g.mtime_artefatos = versao[1]
+        if request.if_none_match.contains_weak(g.etag_artefatos):
+            resp = app.response_class(status=304)
+            resp.set_etag(g.etag_artefatos, weak=True)
+            resp.cache_control.private = True
+            resp.cache_control.no_cache = True
+            return resp
+        return None
+
+    @app.after_request
+    def _cache_e_compressao(response):
+        if (request.method not in ("GET", "HEAD") or response.status_code != 200
+                or not request.path.startswith("/api") or not response.is_json):
+            return response
+
+        etag = g.pop("etag_artefatos", None)
+        if etag:
+            response.set_etag(etag, weak=True)
+            response.last_modified = datetime.fromtimestamp(g.pop("mtime_artefatos"), tz=timezone.utc)
+        else:
+            response.add_etag(weak=True)  # hash do corpo
+        response.cache_control.private = True  # depende da sessão
+        response.cache_control.no_cache = True  # sempre revalida (ETag)
+        response.make_conditional(request)
+
+        if response.status_code == 200:
+            _comprimir(response, app.config["JSON_COMPRESS_MIN_BYTES"])
+        return response
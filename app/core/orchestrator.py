@@ -30,99 +30,188 @@ from services.analysis.lucro import (
 from services.input.leitura import ler_arquivo_financeiro
 from services.input.escrita import valida_periodo_minimo
 
-from services.logic.assign_variables import atribuir_variaveis_ao_insight
+from services.logic.assign_variables import (
+    atribuir_variaveis_ao_insight, aplicar_resumos, NOS_RESUMO, RESUMOS, RESUMOS_RETIDOS,
+)
 from services.logic.excel_export import salvar_arquivos_resultados
 from services.logic.backtest import executar_backtest_completo
 from services.logic.save_data import salvar_todos_resultados, salvar_resultados_backtest
+from services.utils.dtypes import compactar_dtypes, logar_relatorio_dtypes
+from services.utils.pipeline_dag import No, PipelineDAG
+from services.utils.contexto import ContextoPipeline
+from visual.graficos_prontos import pre_gerar_graficos
+from app.core.paths import registrar_ultimo_resultado
 
 
 # logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
 class InsightFutures:
-    def __init__(self, file_path, contratos_usuario=None):
+    def __init__(self, file_path, contratos_usuario=None, temp_path="temp", exportar_csv=True):
         logging.info("🚀 Entrou na classe InsightFutures!")
 
         self.file_path = file_path
         logging.info("🚀 Arquivo armazenado com sucesso!")
 
-        self.temp_path = "temp"
+        # temp_path próprio permite rodar vários arquivos em paralelo sem disputar "temp/"
+        self.temp_path = str(temp_path)
         os.makedirs(self.temp_path, exist_ok=True)
 
-        df = self.tratar_planilha(contratos_usuario=contratos_usuario)
-        logging.info("🚀 Planilha tratada pela função tratar_planilha!")
-
-        self.data = df
-        logging.info("🚀 Dataframe armazenado em Data!")
-
-        atribuir_variaveis_ao_insight(self, self.data)
-
-        salvar_todos_resultados(self, self.temp_path)
-        salvar_arquivos_resultados(self, df)
-
-        # depois de salvar_todos_resultados(...) e salvar_arquivos_resultados(...)
-        try:
-            from scripts.validate_outputs import validate_outputs_dir
-            relatorio = validate_outputs_dir(self.temp_path)
-            for linha in relatorio:
-                # usa INFO pros OK/skip e WARNING pros FAIL
-                (logging.warning if linha.startswith("[FAIL]") else logging.info)(linha)
-        except Exception as e:
-            logging.warning("Validação por JSON Schema não executada: %s", e)
+        # relatório de memória por etapa (dtypes compactos)
+        self.relatorio_dtypes = []
+        # contexto sem cópias (INSIGHT_DEBUG_COPIAS=1 → bytes copiados por etapa)
+        self._ctx = ContextoPipeline()
+
+        # pipeline declarado como DAG (cache por nó; resumos em paralelo)
+        self._dag = self._construir_pipeline()
+        self._params = {
+            "file_path": self.file_path,
+            "contratos_usuario": contratos_usuario,
+            "temp_path": self.temp_path,
+            "exportar_csv": exportar_csv,
+        }
+        self.executar_pipeline()
+        # validação por JSON Schema acontece no salvamento (só dos artefatos gravados, em memória)
+        logging.info("🚀 Planilha tratada, variáveis atribuídas e resultados salvos!")
+
+    # ------------------------------------------------------------------
+    # Pipeline (DAG)
+    # ------------------------------------------------------------------
+    def _construir_pipeline(self):
+        """
+        leitura → cabecalho → preprocessamento → padronizacao → fluxo → metricas_divida
+        → metricas_lucro → df_final → resumos (paralelos) → atribuicao → exportacao.
+        `backtest` só roda quando pedido (rodar_backtest_completo).
+        Entre execuções o cache guarda só o que o recálculo reaproveita (pré-padronização,
+        resumos pré e o backtest); os DataFrames intermediários saem junto com a execução.
+        """
+        nos = [
+            No("leitura", self._no_leitura, params=("file_path", "assinatura_arquivo")),
+            No("cabecalho", self._no_cabecalho, depende=("leitura",)),
+            No("preprocessamento", self._no_preprocessamento, depende=("cabecalho",)),
+            No("padronizacao", self._no_padronizacao, depende=("preprocessamento",),
+               params=("contratos_usuario",)),
+            No("fluxo", self._no_fluxo, depende=("padronizacao",)),
+            No("metricas_divida", lambda df: self._ctx.etapa(
+                "metricas_divida", calcular_maxima_media_e_posicao_relativa, df), depende=("fluxo",)),
+            No("metricas_lucro", self._no_metricas_lucro, depende=("metricas_divida",)),
+            No("df_final", lambda df: self._compactar(df, "fluxo"), depende=("metricas_lucro",)),
+            *NOS_RESUMO,
+            No("atribuicao", self._no_atribuicao, depende=("df_final", *RESUMOS), cache=False),
+            No("exportacao", self._no_exportacao, depende=("df_final", "atribuicao", *RESUMOS),
+               params=("temp_path", "exportar_csv")),
+            No("backtest", self._no_backtest, depende=("completo",),
+               params=("parametros_backtest", "temp_path")),
+        ]
+        return PipelineDAG(nos, reter=("leitura", "cabecalho", "preprocessamento", *RESUMOS_RETIDOS, "backtest"))
+
+    def executar_pipeline(self, alvos=("exportacao",), entradas=None, **params):
+        """
+        Roda (ou re-roda) o DAG com os parâmetros atualizados; só os nós invalidados executam.
+        Ex.: executar_pipeline(contratos_usuario=3) reaproveita leitura/cabeçalho/pré-processamento.
+        `entradas` fornece saídas prontas de nós (não executados).
+        """
+        if not os.path.exists(self.file_path):
+            logging.error("⚠️ ERRO: O arquivo '%s' não foi encontrado.", self.file_path)
+            self.data = None
+            return None
+        self._params.update(params)
+        st = os.stat(self.file_path)
+        self._params["assinatura_arquivo"] = (st.st_size, st.st_mtime_ns)
+        saidas = self._dag.executar(self._params, alvos=alvos, entradas=entradas)
+        return saidas
 
     def tratar_planilha(self, contratos_usuario=None):
+        """Compat: roda o pipeline até o DF final (sem resumos/exportação) e o devolve."""
         logging.info("Iniciando processamento do arquivo...")
+        saidas = self.executar_pipeline(alvos=("df_final",), contratos_usuario=contratos_usuario)
+        return saidas["df_final"] if saidas else None
 
-        if not os.path.exists(self.file_path):
-            logging.error("⚠️ ERRO: O arquivo '%s' não foi encontrado.", self.file_path)
-            return None
+    def _no_leitura(self, file_path, assinatura_arquivo=None):
+        # 1) Leitura (inclui detecção/normalização de cabeçalho)
+        return ler_arquivo_financeiro(file_path)
 
-        # 1) Leitura
-        df = ler_arquivo_financeiro(self.file_path)
-        df = definir_indice_e_datas(df, dayfirst=True)
-        df = limpar_colunas_desnecessarias(df, keep_extra=["Lado"])
+    def _no_cabecalho(self, df):
+        ctx = self._ctx
+        df = ctx.etapa("indice", definir_indice_e_datas, df, dayfirst=True)
+        df = ctx.etapa("limpeza", limpar_colunas_desnecessarias, df, keep_extra=["Lado"])
         print(df.columns)
+        return self._compactar(df, "ingestao")
 
+    def _no_preprocessamento(self, df):
         valida_periodo_minimo(df, min_dias=15)
 
-        out = criar_colunas_operacoes(df)
+        out = self._ctx.etapa("operacoes", criar_colunas_operacoes, df)
         if isinstance(out, tuple):
             df, _params_pre = out
         else:
             df, _params_pre = out, None
+        return df
 
-
+    def _no_padronizacao(self, df, contratos_usuario=None):
         # 3) Padronização (também garante que vem DataFrame)
-        out = padronizar_estrategia(df, contratos_usuario)
+        out = self._ctx.etapa("padronizacao", padronizar_estrategia, df, contratos_usuario)
         if isinstance(out, tuple):
             df, parametros = out
         else:
             df = out
             parametros = None
 
-        df = identificar_diferenca_com_validacao(df)
-
-
-        # guarda um snapshot “pré-backtest” se o teu fluxo precisar depois
-        self.df_prebacktest = df.copy()
+        df = self._ctx.etapa("delta", identificar_diferenca_com_validacao, df)
+        return self._compactar(df, "padronizacao")
 
+    def _no_fluxo(self, df):
         # 4) Fluxo Financeiro
-        df = calcular_fluxo_estrategia(df)
+        df = self._ctx.etapa("fluxo", calcular_fluxo_estrategia, df)
 
         # métricas por ciclo linha a linha (se o módulo estiver presente)
         try:
-            df = adicionar_fluxo_por_ciclo_linha_a_linha(df)
+            df = self._ctx.etapa("fluxo_ciclo", adicionar_fluxo_por_ciclo_linha_a_linha, df)
         except Exception as e:
             logging.warning("Endividamento opcional não aplicado: %s", e)
+        return df
 
+    def _no_metricas_lucro(self, df):
         # 5) Métricas complementares
-        df = calcular_maxima_media_e_posicao_relativa(df)
-
         try:
-            df = adicionar_metricas_lucro_linha_a_linha(df)
+            df = self._ctx.etapa("metricas_lucro", adicionar_metricas_lucro_linha_a_linha, df)
         except Exception as e:
             logging.warning("Métricas de lucro opcionais não aplicadas: %s", e)
+        return df
+
+    def _no_atribuicao(self, df, *resumos):
+        self.data = df
+        aplicar_resumos(self, *resumos)
 
+    def _no_exportacao(self, df, _atribuicao, *resumos, temp_path, exportar_csv):
+        salvar_todos_resultados(self, temp_path)
+        pre_gerar_graficos(temp_path)  # payloads prontos para /api/graficos/*
+        try:
+            registrar_ultimo_resultado(temp_path)  # card "Estado Atual" / downloads do painel
+        except OSError as e:
+            logging.warning("Ponteiro da última pasta de resultados não atualizado: %s", e)
+        if exportar_csv:
+            salvar_arquivos_resultados(self, df)
+
+    def _no_backtest(self, completo, parametros_backtest, temp_path):
+        return executar_backtest_completo(
+            completo.get("df_prebacktest", self.data),
+            parametros_backtest or {},
+            temp_path=temp_path,
+        )
+
+    def _compactar(self, df, etapa):
+        """Aplica a política de dtypes compactos e registra os bytes economizados da etapa."""
+        try:
+            df, relatorio = compactar_dtypes(df)
+        except Exception as e:
+            logging.warning("Compactação de dtypes não aplicada (%s): %s", etapa, e)
+            return df
+        relatorio["etapa"] = etapa
+        if not hasattr(self, "relatorio_dtypes"):
+            self.relatorio_dtypes = []
+        self.relatorio_dtypes.append(relatorio)
+        logar_relatorio_dtypes(relatorio, etapa)
         return df
 
     def rodar_backtest_completo(self, parametros_usuario: dict):
@@ -130,39 +219,67 @@ class InsightFutures:
         Executa o backtest completo: regras de ativação, fluxo financeiro e métricas.
         Atribui os resultados a atributos do objeto e salva os arquivos resultantes.
         """
-        self.df_backtest, self.metricas_backtest, self.metricas_original = executar_backtest_completo(
-            getattr(self, "df_prebacktest", self.data),  # ⚠️ fallback se não existir
-            parametros_usuario,
-            temp_path=self.temp_path,
-        )
+        if getattr(self, "_params", None) is not None and self.file_path:
+            # via DAG: reaproveita o backtest se parâmetros e df_prebacktest não mudaram
+            # (a entrada vem do insight; o cache não guarda os nós intermediários)
+            saidas = self.executar_pipeline(
+                alvos=("backtest",),
+                entradas={"completo": {"df_prebacktest": getattr(self, "df_prebacktest", self.data)}},
+                parametros_backtest=parametros_usuario,
+            )
+            resultado = saidas["backtest"]
+        else:
+            resultado = executar_backtest_completo(
+                getattr(self, "df_prebacktest", self.data),  # ⚠️ fallback se não existir
+                parametros_usuario,
+                temp_path=self.temp_path,
+            )
+        # executar_backtest_completo devolve também o df comparativo
+        self.df_backtest, self.metricas_backtest, self.metricas_original = resultado[:3]
         salvar_resultados_backtest(self, self.temp_path)
 
-    def recalcular_com_novos_contratos(self, contratos_usuario):
-        from services.processing.standardization import padronizar_estrategia
-        from services.processing.fluxo_financeiro import (
-            calcular_fluxo_estrategia,
-            calcular_maxima_media_e_posicao_relativa,
-        )
-        from services.analysis.endividamento import adicionar_fluxo_por_ciclo_linha_a_linha
-        from services.analysis.lucro import adicionar_metricas_lucro_linha_a_linha
-        from services.logic.assign_variables import atribuir_variaveis_ao_insight
-
-        df, _ = padronizar_estrategia(self.data, contratos_usuario=contratos_usuario)
-        self.df_prebacktest = df.copy()
-
-        df = calcular_fluxo_estrategia(df)
-        try:
-            df = adicionar_fluxo_por_ciclo_linha_a_linha(df)
-        except Exception:
-            pass
-
-        df = calcular_maxima_media_e_posicao_relativa(df)
-
+    @classmethod
+    def de_resultados(cls, temp_path):
+        """
+        Reconstrói a instância a partir dos artefatos já persistidos em `temp_path`
+        (store colunar: ultimo_resultado / prebacktest), sem reler a planilha nem rodar o pipeline.
+        """
+        from services.unified.inputs import load_prebacktest, load_ultimo_resultado
+
+        obj = cls.__new__(cls)
+        obj.file_path = None
+        obj.temp_path = str(temp_path)
+        obj.relatorio_dtypes = []
+        obj._ctx = ContextoPipeline()
+        obj.data = load_ultimo_resultado(obj.temp_path)
         try:
-            df = adicionar_metricas_lucro_linha_a_linha(df)
-        except Exception:
-            pass
+            obj.df_prebacktest = load_prebacktest(obj.temp_path)
+        except Exception as e:
+            logging.info("ℹ️ prebacktest indisponível em %s: %s", obj.temp_path, e)
+            obj.df_prebacktest = obj.data.copy()
+        return obj
 
+    def recalcular_com_novos_contratos(self, contratos_usuario):
+        from services.processing.escala_contratos import escalar_por_contratos, recalcular_razao
+
+        # Fast path: P&L e razão FIFO são lineares nos contratos → só reescala os valores
+        # (atribuir_variaveis_ao_insight regenera o df_prebacktest a partir do df escalado)
+        escalado = escalar_por_contratos(self.data, contratos_usuario)
+        if escalado is not None:
+            self.data = escalado
+            atribuir_variaveis_ao_insight(self, escalado)
+            logging.info("⚡ Recalculo com novos contratos por reescala (%s contratos).", contratos_usuario)
+            return
+
+        # Caminho completo (ex.: relatório misto com contratos padrão por ativo)
+        if getattr(self, "_params", None) is not None and self.file_path:
+            # DAG: leitura/cabeçalho/pré-processamento e resumos pré (RESUMOS_RETIDOS) vêm do cache
+            self.executar_pipeline(alvos=("atribuicao",), contratos_usuario=contratos_usuario)
+            logging.info("✅ Recalculo com novos contratos concluído (pipeline).")
+            return
+
+        df = recalcular_razao(self.data, contratos_usuario)
+        df = self._compactar(df, "recalculo")
         self.data = df
         atribuir_variaveis_ao_insight(self, df)
         logging.info("✅ Recalculo com novos contratos concluído.")
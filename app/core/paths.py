@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from app.core.config import settings
 
@@ -21,6 +22,9 @@ Path(UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
 
 ALLOWED_EXTENSIONS = {"csv", "xlsx"}
 
+# ponteiro para a pasta de resultados mais recente (evita varrer outputs/resultados)
+PONTEIRO_ULTIMO = RESULTADOS_DIR / ".ultimo"
+
 
 def criar_diretorio_resultado(usuario: str = "admin"):
     """
@@ -32,3 +36,57 @@ def criar_diretorio_resultado(usuario: str = "admin"):
     path = RESULTADOS_DIR / nome
     path.mkdir(parents=True, exist_ok=True)
     return path, nome
+
+
+def registrar_ultimo_resultado(temp_path) -> None:
+    """Atualiza o ponteiro se `temp_path` é uma pasta de outputs/resultados (rodadas fora dela não contam)."""
+    from services.utils.artefatos import gravar_atomico
+
+    pasta = Path(temp_path).resolve()
+    if pasta.parent != RESULTADOS_DIR.resolve():
+        return
+    gravar_atomico(str(PONTEIRO_ULTIMO), pasta.name.encode("utf-8"))
+
+
+def ultimo_resultado_dir(
+    owner: Optional[str] = None,
+    strategy_id: Optional[int] = None,
+    upload_id: Optional[int] = None,
+) -> Optional[Path]:
+    """
+    Pasta de resultados mais recente (do owner/estratégia/upload, se informados): consulta
+    indexada em result_runs. Sem filtro e sem execução indexada (pastas antigas/CLI), cai no
+    ponteiro; sem ponteiro, varre uma vez e grava.
+    """
+    try:
+        from services.repository.strategy_service import latest_result_dir
+
+        indexada = latest_result_dir(owner=owner, strategy_id=strategy_id, upload_id=upload_id)
+    except Exception:
+        indexada = None
+    if indexada and Path(indexada).is_dir():
+        return Path(indexada)
+    if owner or strategy_id is not None or upload_id is not None:
+        return None
+    return _ultimo_do_ponteiro()
+
+
+def _ultimo_do_ponteiro() -> Optional[Path]:
+    try:
+        nome = PONTEIRO_ULTIMO.read_text(encoding="utf-8").strip()
+        if nome and (RESULTADOS_DIR / nome).is_dir():
+            return RESULTADOS_DIR / nome
+    except OSError:
+        pass
+
+    if not RESULTADOS_DIR.exists():
+        return None
+    dirs = [p for p in RESULTADOS_DIR.iterdir() if p.is_dir()]
+    if not dirs:
+        return None
+    recente = max(dirs, key=lambda p: p.stat().st_mtime)
+    try:
+        registrar_ultimo_resultado(recente)
+    except OSError:
+        pass
+    return recente
@@ -8,6 +8,8 @@ from app.core.config import settings
 from app.core.paths import UPLOAD_FOLDER, OUTPUTS_DIR
 from app.core.logging import init_logging
 from app.core.error_handlers import register_error_handlers
+from app.core.http_cache import register_http_cache
+from services.utils.contexto import ativar_copy_on_write
 
 # Blueprints existentes
 from web.routes.auth_routes import bp as auth_bp
@@ -29,6 +31,8 @@ class IFJSONProvider(DefaultJSONProvider):
 
 def create_app() -> Flask:
     init_logging()
+    # CoW do pandas ligado uma vez para o processo (opção global: nunca alternar por requisição)
+    ativar_copy_on_write()
 
     app = Flask(
         __name__,
@@ -61,6 +65,8 @@ def create_app() -> Flask:
         return {"status": "ok", "env": settings.ENV}, 200
     # ✅ registrar handlers de erro
     register_error_handlers(app)
+    # ETag/304 + gzip/deflate para as APIs JSON
+    register_http_cache(app)
     # Sanitiza qualquer Path que tenha ido parar na sessão
     @app.after_request
     def _sanitize_session(response):
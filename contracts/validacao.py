@@ -0,0 +1,199 @@
+# contracts/validacao.py
+"""
+PT:
+    Validação dos artefatos contra contracts/jsonschema, em memória e com validadores
+    construídos uma vez por processo.
+
+    - REGISTRO_SCHEMAS: arquivo de dados → schema (único registro; save_data e
+      scripts/validate_outputs usam este).
+    - `validador(schema)`: Draft 2020-12 carregado/checado uma vez (lru_cache). O type
+      checker aceita escalares NumPy e tuplas, então o payload Python é validado ANTES de
+      serializar, sem reler o arquivo.
+    - Artefatos linha a linha (listas grandes) podem ser validados por amostra:
+        INSIGHT_VALIDACAO=completa | amostra (padrão) | off
+        INSIGHT_VALIDACAO_AMOSTRA=200  (itens: primeiros, últimos e espaçados)
+    - `validar_lista_modelo`: lista de itens Pydantic validada num único TypeAdapter.
+
+EN:
+    In-memory artifact validation with per-process cached JSON Schema validators,
+    NumPy-aware type checking, optional sampling for row-level lists and batched
+    Pydantic list validation.
+"""
+from __future__ import annotations
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from jsonschema import Draft202012Validator, validators
+    _HAS_JSONSCHEMA = True
+except ImportError:  # dependência opcional
+    Draft202012Validator = validators = None
+    _HAS_JSONSCHEMA = False
+
+# contracts/validacao.py → contracts/jsonschema (independe do cwd)
+SCHEMA_DIR = Path(__file__).resolve().parent / "jsonschema"
+_STATS_REUSAVEL = "stats_ciclo.v1.json"
+
+REGISTRO_SCHEMAS: Dict[str, str] = {
+    "variaveis_pre.json":                 "variaveis_pre.v1.json",
+    "variaveis_fluxo.json":               "variaveis_fluxo.v1.json",
+    "ultimo_resultado.json":              "ultimo_resultado.v1.json",
+    "prebacktest.json":                   "prebacktest.v1.json",
+    "ultimo_ciclo.json":                  "ultimo_ciclo.v1.json",
+    "ultimo_ciclo_completo.json":         "ultimo_ciclo_completo.v1.json",
+    "resultados_completos.json":          "resultados_completos.v1.json",
+    "resultados_fluxo_ciclo.json":        "resultados_fluxo_ciclo.v1.json",
+    "resultados_ciclos_lucro.json":       "resultados_ciclos_lucro.v1.json",
+    "resumo_ciclos_divida.json":          "resumo_ciclos_divida.v1.json",
+    "padronizacao.json":                  "padronizacao.v1.json",
+    "parametros_ativo.json":              "parametros_ativo.v1.json",
+    "ciclos_drawdown.json":               "ciclos_drawdown.v1.json",
+    "estatisticas_ciclos_lucro.json":     "estatisticas_ciclos_lucro.v1.json",
+    "estatisticas_duracao_ciclos.json":   "estatisticas_duracao_ciclos.v1.json",
+    "estatisticas_positivas_negativas.json": "estatisticas_positivas_negativas.v1.json",
+    "ativo.json":  "ativo.v1.json",
+    "ativos.json": "ativos.v1.json",
+
+    # reutilizam o mesmo schema:
+    "estatisticas_ciclo_amortizacao.json": _STATS_REUSAVEL,
+    "estatisticas_ciclo_emprestimo.json":  _STATS_REUSAVEL,
+    "estatisticas_ciclo_lucro.json":       _STATS_REUSAVEL,
+    "estats_qtd_luc_ciclo.json":           _STATS_REUSAVEL,
+    "estats_qtd_emp_ciclo.json":           _STATS_REUSAVEL,
+    "estats_qtd_amo_ciclo.json":           _STATS_REUSAVEL,
+}
+
+# artefatos linha a linha (listas longas) — elegíveis para validação por amostra
+LINHA_A_LINHA = frozenset({
+    "ultimo_ciclo_completo.json",
+    "resultados_completos.json",
+    "resultados_ciclos_lucro.json",
+    "resumo_ciclos_divida.json",
+    "ciclos_drawdown.json",
+})
+
+_MODO_ENV = "INSIGHT_VALIDACAO"
+_AMOSTRA_ENV = "INSIGHT_VALIDACAO_AMOSTRA"
+
+
+def modo_validacao() -> str:
+    modo = os.getenv(_MODO_ENV, "amostra").strip().lower()
+    return modo if modo in ("completa", "amostra", "off") else "amostra"
+
+
+def tamanho_amostra() -> int:
+    try:
+        return max(1, int(os.getenv(_AMOSTRA_ENV, "200")))
+    except ValueError:
+        return 200
+
+
+# ------------------------------------------------------------------------------
+# Validadores compilados (uma vez por processo)
+# ------------------------------------------------------------------------------
+
+if _HAS_JSONSCHEMA:
+    _tipos = Draft202012Validator.TYPE_CHECKER
+    _TYPE_CHECKER = _tipos.redefine_many({
+        "array": lambda c, x: isinstance(x, (list, tuple)),
+        "integer": lambda c, x: (_tipos.is_type(x, "integer")
+                                 or (isinstance(x, np.integer) and not isinstance(x, np.bool_))),
+        "number": lambda c, x: (_tipos.is_type(x, "number")
+                                or isinstance(x, (np.integer, np.floating)) and not isinstance(x, np.bool_)),
+        "boolean": lambda c, x: isinstance(x, (bool, np.bool_)),
+    })
+    _ValidadorPayload = validators.extend(Draft202012Validator, type_checker=_TYPE_CHECKER)
+
+
+@lru_cache(maxsize=None)
+def validador(schema_name: str):
+    """Validador do schema (lido do disco e checado uma única vez); None se ausente."""
+    if not _HAS_JSONSCHEMA:
+        return None
+    caminho = SCHEMA_DIR / schema_name
+    if not caminho.exists():
+        return None
+    with caminho.open("r", encoding="utf-8") as f:
+        schema = json.load(f)
+    Draft202012Validator.check_schema(schema)
+    return _ValidadorPayload(schema)
+
+
+def _amostrar(itens: Sequence[Any], n: int) -> List[Any]:
+    """Primeiros, últimos e espaçados (determinístico) — bordas costumam ter os casos especiais."""
+    total = len(itens)
+    if total <= n:
+        return list(itens)
+    borda = max(1, n // 4)
+    meio = np.linspace(borda, total - borda - 1, num=max(0, n - 2 * borda), dtype=int)
+    idx = sorted(set(range(borda)) | set(meio.tolist()) | set(range(total - borda, total)))
+    return [itens[i] for i in idx]
+
+
+def validar_payload(nome: str, dados: Any, modo: Optional[str] = None) -> List[str]:
+    """
+    Valida o payload registrado para `nome`: objeto Python (antes de serializar) ou
+    bytes JSON (ex.: df.to_json / arquivo lido).
+    Retorna mensagens [OK]/[FAIL]/[SKIP]/[ERRO] no formato usado nos logs.
+    """
+    modo = modo or modo_validacao()
+    if modo == "off":
+        return []
+    schema_name = REGISTRO_SCHEMAS.get(nome)
+    if not schema_name:
+        return [f"[SKIP] {nome}: sem schema cadastrado"]
+    if not _HAS_JSONSCHEMA:
+        return [f"[SKIP] {nome}: jsonschema indisponível"]
+    v = validador(schema_name)
+    if v is None:
+        return [f"[ERRO] {nome}: schema {schema_name} não encontrado em {SCHEMA_DIR}"]
+
+    if isinstance(dados, (bytes, bytearray)):
+        from services.utils.serializacao import desserializar_json
+        dados = desserializar_json(dados)
+
+    sufixo = ""
+    if modo == "amostra" and nome in LINHA_A_LINHA and isinstance(dados, list):
+        n = tamanho_amostra()
+        if len(dados) > n:
+            dados = _amostrar(dados, n)
+            sufixo = f" (amostra de {len(dados)})"
+
+    erros = sorted(v.iter_errors(dados), key=lambda e: list(e.path))
+    msgs: List[str] = []
+    for e in erros:
+        loc = " → ".join(map(str, e.path)) if e.path else "(raiz)"
+        msgs.append(f"[FAIL] {nome} @ {loc}: {e.message}{sufixo}")
+    return msgs or [f"[OK] {nome} ✓{sufixo}"]
+
+
+def validar_arquivo(caminho: Path, modo: Optional[str] = "completa") -> List[str]:
+    """Valida um .json já gravado (uso em scripts/CLI)."""
+    with Path(caminho).open("rb") as f:
+        return validar_payload(Path(caminho).name, f.read(), modo=modo)
+
+
+# ------------------------------------------------------------------------------
+# Pydantic em lote
+# ------------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _adaptador_lista(modelo):
+    from pydantic import TypeAdapter
+    return TypeAdapter(List[modelo])
+
+
+def validar_lista_modelo(modelo, itens: Sequence[Dict[str, Any]], modo: Optional[str] = None) -> None:
+    """Valida a lista inteira (ou amostra) num único TypeAdapter; levanta ValidationError."""
+    modo = modo or modo_validacao()
+    if modo == "off":
+        return
+    if modo == "amostra":
+        itens = _amostrar(itens, tamanho_amostra())
+    _adaptador_lista(modelo).validate_python(list(itens))
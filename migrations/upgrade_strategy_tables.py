@@ -0,0 +1,52 @@
+"""Migration script to bring existing strategy databases up to the current models.
+
+create_all only creates missing tables; older databases also need the steps below.
+Idempotent: safe to run on new or already upgraded databases.
+"""
+
+from sqlalchemy import inspect, text
+
+from models.strategy import Strategy
+from services.repository.strategy_service import engine
+
+
+def add_upload_result_dir() -> None:
+    """Adiciona uploads.result_dir se ainda não existir (create_all não altera tabelas)."""
+    cols = {c["name"] for c in inspect(engine).get_columns("uploads")}
+    if "result_dir" not in cols:
+        with engine.begin() as con:
+            con.execute(text("ALTER TABLE uploads ADD COLUMN result_dir VARCHAR(1024)"))
+
+
+def create_strategy_indexes() -> None:
+    """Índices novos de strategies (ex.: ix_strategies_owner_created); create_all não os adiciona."""
+    for ix in Strategy.__table__.indexes:
+        ix.create(engine, checkfirst=True)
+
+
+def backfill_result_runs() -> None:
+    """Indexa uma vez os result_dir já gravados nos uploads (tabela result_runs vazia)."""
+    with engine.begin() as con:
+        if con.execute(text("SELECT 1 FROM result_runs LIMIT 1")).first() is not None:
+            return
+        con.execute(text(
+            """
+            INSERT OR IGNORE INTO result_runs (result_dir, owner, strategy_id, upload_id, completed_at)
+            SELECT u.result_dir, u.owner,
+                   (SELECT su.strategy_id FROM strategy_uploads su
+                     WHERE su.upload_id = u.id ORDER BY su.id DESC LIMIT 1),
+                   u.id, u.created_at
+              FROM uploads u
+             WHERE u.result_dir IS NOT NULL AND u.result_dir != ''
+            """
+        ))
+
+
+def run() -> None:
+    add_upload_result_dir()
+    create_strategy_indexes()
+    backfill_result_runs()
+
+
+if __name__ == "__main__":
+    run()
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy import (
-    String, Text, DateTime, ForeignKey, UniqueConstraint
+    String, Text, DateTime, ForeignKey, Index, UniqueConstraint
 )
 from sqlalchemy.orm import (
     declarative_base, relationship, Mapped, mapped_column
@@ -25,6 +25,10 @@ class Strategy(Base):
     owner: Mapped[str] = mapped_column(String(80), default="anonimo", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_strategies_owner_created", "owner", "created_at"),
+    )
+
     # N-N com Upload via strategy_uploads
     uploads: Mapped[List["Upload"]] = relationship(
         "Upload",
@@ -64,6 +68,7 @@ class Upload(Base):
     filetype: Mapped[Optional[str]] = mapped_column(String(20))
     size_bytes: Mapped[Optional[int]]
     checksum: Mapped[Optional[str]] = mapped_column(String(64))  # md5/sha256
+    result_dir: Mapped[Optional[str]] = mapped_column(String(1024))  # outputs/resultados/<user>_<ts>
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     # N-N com Strategy
@@ -83,6 +88,7 @@ class Upload(Base):
             "filetype": self.filetype,
             "size_bytes": self.size_bytes,
             "checksum": self.checksum,
+            "result_dir": self.result_dir,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
@@ -101,6 +107,36 @@ class StrategyUpload(Base):
     )
 
 
+# ------------ Índice de execuções (pastas de resultados) ------------
+class ResultRun(Base):
+    """Uma pasta de resultados concluída; consultas "última execução" por owner/estratégia/upload."""
+    __tablename__ = "result_runs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    result_dir: Mapped[str] = mapped_column(String(1024), nullable=False, unique=True)
+    owner: Mapped[str] = mapped_column(String(80), default="anonimo", nullable=False)
+    strategy_id: Mapped[Optional[int]] = mapped_column(ForeignKey("strategies.id", ondelete="SET NULL"))
+    upload_id: Mapped[Optional[int]] = mapped_column(ForeignKey("uploads.id", ondelete="SET NULL"))
+    completed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_result_runs_owner_completed", "owner", "completed_at"),
+        Index("ix_result_runs_strategy_completed", "strategy_id", "completed_at"),
+        Index("ix_result_runs_upload_completed", "upload_id", "completed_at"),
+        Index("ix_result_runs_completed", "completed_at"),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "result_dir": self.result_dir,
+            "owner": self.owner,
+            "strategy_id": self.strategy_id,
+            "upload_id": self.upload_id,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
+
+
 # ------------ Insight (1-N a Strategy) ------------
 class Insight(Base):
     __tablename__ = "insights"
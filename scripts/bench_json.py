@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da serialização JSON dos artefatos de uma pasta de resultados.
+
+Para cada .json da pasta (e subpastas drawdown/, backtest/) compara:
+  - antigo: converter_valores_json_serializaveis + json.dumps(indent=2)
+  - novo:   services.utils.serializacao.serializar_json (compacto)
+e a leitura (json.loads vs desserializar_json), com tamanho em bytes.
+
+Uso:
+  python scripts/bench_json.py outputs/resultados/<pasta>
+  python scripts/bench_json.py temp --repeticoes 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.getcwd())
+
+from services.utils.formatters import converter_valores_json_serializaveis  # noqa: E402
+from services.utils.serializacao import _HAS_ORJSON, desserializar_json, serializar_json  # noqa: E402
+
+
+def _antigo(dados):
+    if isinstance(dados, dict):
+        dados = converter_valores_json_serializaveis(dados)
+    return json.dumps(dados, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _cronometrar(func, arg, repeticoes: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeticoes):
+        func(arg)
+    return (time.perf_counter() - t0) / repeticoes * 1000  # ms
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("pasta", help="pasta de resultados (ex.: temp ou outputs/resultados/<id>)")
+    ap.add_argument("--repeticoes", type=int, default=20)
+    args = ap.parse_args()
+
+    arquivos = sorted(Path(args.pasta).rglob("*.json"))
+    if not arquivos:
+        print(f"Nenhum .json em {args.pasta}")
+        return 1
+
+    print(f"backend: {'orjson' if _HAS_ORJSON else 'json (stdlib)'} | {len(arquivos)} arquivo(s)\n")
+    print(f"{'arquivo':<45}{'bytes ant':>11}{'bytes novo':>11}{'dump ant':>10}{'dump novo':>10}"
+          f"{'load ant':>10}{'load novo':>10}")
+    tot = [0, 0, 0.0, 0.0, 0.0, 0.0]
+    for p in arquivos:
+        dados = json.loads(p.read_text(encoding="utf-8"))
+        b_ant, b_novo = _antigo(dados), serializar_json(dados, pretty=False)
+        linha = [
+            len(b_ant), len(b_novo),
+            _cronometrar(_antigo, dados, args.repeticoes),
+            _cronometrar(lambda d: serializar_json(d, pretty=False), dados, args.repeticoes),
+            _cronometrar(json.loads, b_ant, args.repeticoes),
+            _cronometrar(desserializar_json, b_novo, args.repeticoes),
+        ]
+        tot = [a + b for a, b in zip(tot, linha)]
+        nome = str(p.relative_to(args.pasta))
+        print(f"{nome[:44]:<45}{linha[0]:>11}{linha[1]:>11}{linha[2]:>10.3f}{linha[3]:>10.3f}"
+              f"{linha[4]:>10.3f}{linha[5]:>10.3f}")
+
+    print(f"\n{'TOTAL':<45}{tot[0]:>11}{tot[1]:>11}{tot[2]:>10.3f}{tot[3]:>10.3f}{tot[4]:>10.3f}{tot[5]:>10.3f}")
+    print(f"bytes: {tot[1] / max(tot[0], 1):.0%} do antigo | dump {tot[2] / max(tot[3], 1e-9):.1f}x | "
+          f"load {tot[4] / max(tot[5], 1e-9):.1f}x  (tempos em ms por arquivo)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
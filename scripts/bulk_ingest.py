@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ingestão em lote de relatórios (Profit/MetaTrader) — diretório ou .zip.
+
+Roda o pipeline completo (InsightFutures) por arquivo num pool de processos, limitado
+por memória, grava os artefatos em outputs/resultados/<owner>_<ts>_<n>/ e registra
+upload + estratégia no banco em transações por lote (strategy_service).
+
+Uso:
+  python scripts/bulk_ingest.py relatorios/ --owner backoffice
+  python scripts/bulk_ingest.py historico.zip --owner backoffice --workers 4 --lote 100
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.getcwd())
+
+from app.core.paths import ALLOWED_EXTENSIONS, RESULTADOS_DIR, UPLOAD_FOLDER  # noqa: E402
+
+# pico de memória estimado por arquivo: base do processo + fator × tamanho em disco
+_MB = 1024 * 1024
+_BASE_POR_ARQUIVO = 200 * _MB
+_FATOR_TAMANHO = 60
+
+
+def _md5(path: str, chunk: int = 1024 * 1024) -> str:
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for b in iter(lambda: f.read(chunk), b""):
+            h.update(b)
+    return h.hexdigest()
+
+
+def _memoria_disponivel() -> int:
+    """Bytes disponíveis (MemAvailable no Linux; fallback 2 GB)."""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for linha in f:
+                if linha.startswith("MemAvailable:"):
+                    return int(linha.split()[1]) * 1024
+    except Exception:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 2048 * _MB
+
+
+def _estimar_memoria(path: str) -> int:
+    try:
+        tamanho = os.path.getsize(path)
+    except OSError:
+        tamanho = 0
+    return _BASE_POR_ARQUIVO + _FATOR_TAMANHO * tamanho
+
+
+def _extensao_ok(nome: str) -> bool:
+    return "." in nome and nome.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def coletar_arquivos(origem: str) -> List[str]:
+    """Lista os relatórios do diretório (recursivo) ou extrai o .zip para uploads/lote_<ts>/."""
+    p = Path(origem)
+    if p.is_dir():
+        return sorted(str(f.resolve()) for f in p.rglob("*") if f.is_file() and _extensao_ok(f.name))
+
+    if p.is_file() and zipfile.is_zipfile(p):
+        destino = Path(UPLOAD_FOLDER) / f"lote_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        destino.mkdir(parents=True, exist_ok=True)
+        arquivos = []
+        with zipfile.ZipFile(p) as zf:
+            for i, info in enumerate(zf.infolist()):
+                nome = Path(info.filename).name  # ignora diretórios do zip (evita path traversal)
+                if info.is_dir() or not nome or nome.startswith(".") or not _extensao_ok(nome):
+                    continue
+                alvo = destino / f"{i:05d}_{nome}"
+                with zf.open(info) as src, open(alvo, "wb") as dst:
+                    while True:
+                        bloco = src.read(_MB)
+                        if not bloco:
+                            break
+                        dst.write(bloco)
+                arquivos.append(str(alvo.resolve()))
+        return arquivos
+
+    if p.is_file() and _extensao_ok(p.name):
+        return [str(p.resolve())]
+
+    raise FileNotFoundError(f"Origem inválida: {origem}")
+
+
+def _processar_arquivo(path: str, result_dir: str) -> Dict[str, Any]:
+    """Worker: roda o pipeline de um arquivo e devolve o resumo para registro."""
+    from app.core.orchestrator import InsightFutures
+    from services.utils.process_lock import create_processing_lock, clear_processing_lock
+
+    res: Dict[str, Any] = {"path": path, "result_dir": result_dir, "ok": False}
+    create_processing_lock(result_dir)
+    try:
+        insight = InsightFutures(path, temp_path=result_dir, exportar_csv=False)
+        df = getattr(insight, "data", None)
+        if df is None or getattr(df, "empty", True):
+            res["erro"] = "DataFrame vazio após processamento"
+            return res
+        res.update({
+            "ok": True,
+            "ativo": getattr(insight, "ativo", None) or None,
+            "linhas": int(len(df)),
+            "checksum": _md5(path),
+            "size_bytes": os.path.getsize(path),
+        })
+    except Exception as e:
+        res["erro"] = f"{type(e).__name__}: {e}"
+    finally:
+        clear_processing_lock(result_dir)
+    return res
+
+
+def _registrar(pendentes: List[Dict[str, Any]], owner: str, strategy_id: Optional[int]) -> int:
+    if not pendentes:
+        return 0
+    from services.repository.strategy_service import register_uploads_batch
+
+    itens = []
+    for r in pendentes:
+        nome = Path(r["path"]).name
+        ativo = r.get("ativo")
+        itens.append({
+            "owner": owner,
+            "filename": nome,
+            "path": r["path"],
+            "filetype": "xlsx" if nome.lower().endswith(".xlsx") else "csv",
+            "size_bytes": r.get("size_bytes"),
+            "checksum": r.get("checksum"),
+            "result_dir": r["result_dir"],
+            "strategy_id": strategy_id,
+            "nome": nome,
+            "ativo": ativo if isinstance(ativo, str) else None,
+        })
+    register_uploads_batch(itens)
+    logging.info("💾 Lote registrado: %d upload(s)", len(itens))
+    return len(itens)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Ingestão em lote de relatórios (diretório ou .zip).")
+    ap.add_argument("origem", help="diretório com .xlsx/.csv ou arquivo .zip")
+    ap.add_argument("--owner", default="anonimo", help="dono dos uploads/estratégias")
+    ap.add_argument("--strategy-id", type=int, default=None, help="anexa tudo a uma estratégia existente")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="máximo de processos")
+    ap.add_argument("--mem-max-mb", type=int, default=None,
+                    help="orçamento de memória para arquivos em voo (padrão: 80%% da memória disponível)")
+    ap.add_argument("--lote", type=int, default=50, help="uploads por transação no banco")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    arquivos = coletar_arquivos(args.origem)
+    if not arquivos:
+        logging.warning("Nenhum .xlsx/.csv encontrado em %s", args.origem)
+        return 1
+
+    orcamento = args.mem_max_mb * _MB if args.mem_max_mb else int(_memoria_disponivel() * 0.8)
+    workers = max(1, min(args.workers, len(arquivos)))
+    logging.info("📦 %d arquivo(s) | %d worker(s) | orçamento %.0f MB", len(arquivos), workers, orcamento / _MB)
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    fila = list(enumerate(arquivos))
+    fila.reverse()  # pop() do fim mantém a ordem original
+
+    ok = falhas = 0
+    pendentes: List[Dict[str, Any]] = []
+    em_voo: Dict[Any, int] = {}
+    em_uso = 0
+
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, max_tasks_per_child=20) as pool:
+        while fila or em_voo:
+            # submete enquanto houver worker livre e memória no orçamento (sempre ao menos 1 em voo)
+            while fila and len(em_voo) < workers:
+                i, path = fila[-1]
+                custo = _estimar_memoria(path)
+                if em_voo and em_uso + custo > orcamento:
+                    break
+                fila.pop()
+                result_dir = RESULTADOS_DIR / f"{args.owner}_{ts}_{i:04d}"
+                result_dir.mkdir(parents=True, exist_ok=True)
+                em_voo[pool.submit(_processar_arquivo, path, str(result_dir))] = custo
+                em_uso += custo
+
+            feitos, _ = wait(list(em_voo), return_when=FIRST_COMPLETED)
+            for fut in feitos:
+                em_uso -= em_voo.pop(fut)
+                try:
+                    r = fut.result()
+                except Exception as e:
+                    r = {"ok": False, "path": "?", "erro": f"worker: {e}"}
+                if r.get("ok"):
+                    ok += 1
+                    pendentes.append(r)
+                    logging.info("✅ %s → %s", Path(r["path"]).name, r["result_dir"])
+                else:
+                    falhas += 1
+                    logging.error("❌ %s: %s", r.get("path"), r.get("erro"))
+                    if r.get("result_dir"):
+                        shutil.rmtree(r["result_dir"], ignore_errors=True)
+
+            if len(pendentes) >= args.lote:
+                _registrar(pendentes, args.owner, args.strategy_id)
+                pendentes = []
+
+    _registrar(pendentes, args.owner, args.strategy_id)
+    logging.info("🏁 Concluído: %d ok, %d falha(s)", ok, falhas)
+    return 0 if falhas == 0 else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
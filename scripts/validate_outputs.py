@@ -6,76 +6,37 @@ Uso:
   python scripts/validate_outputs.py --dir outputs/resultados/meu_lote
   python scripts/validate_outputs.py --file outputs/resultados/meu_lote/variaveis_fluxo.json
 """
-import argparse, json, sys
+import argparse, os, sys
 from pathlib import Path
-from jsonschema import Draft202012Validator
 
-# ajuste o caminho base se necessário
-SCHEMA_DIR = Path("contracts/jsonschema")
+sys.path.insert(0, os.getcwd())
 
-# 1) registry: arquivo_de_dados -> arquivo_de_schema
-STATS_REUSAVEL = "stats_ciclo.v1.json"
-REGISTRY = {
-    "variaveis_pre.json":                 "variaveis_pre.v1.json",
-    "variaveis_fluxo.json":               "variaveis_fluxo.v1.json",
-    "ultimo_resultado.json":              "ultimo_resultado.v1.json",
-    "prebacktest.json":                   "prebacktest.v1.json",
-    "ultimo_ciclo.json":                  "ultimo_ciclo.v1.json",
-    "ultimo_ciclo_completo.json":         "ultimo_ciclo_completo.v1.json",
-    "resultados_completos.json":          "resultados_completos.v1.json",
-    "resultados_fluxo_ciclo.json":        "resultados_fluxo_ciclo.v1.json",
-    "resultados_ciclos_lucro.json":       "resultados_ciclos_lucro.v1.json",
-    "resumo_ciclos_divida.json":          "resumo_ciclos_divida.v1.json",
-    "padronizacao.json":                  "padronizacao.v1.json",
-    "parametros_ativo.json":              "parametros_ativo.v1.json",
-    "ciclos_drawdown.json":               "ciclos_drawdown.v1.json",
-    "estatisticas_ciclos_lucro.json":     "estatisticas_ciclos_lucro.v1.json",
-    "estatisticas_duracao_ciclos.json":   "estatisticas_duracao_ciclos.v1.json",
-    "estatisticas_positivas_negativas.json": "estatisticas_positivas_negativas.v1.json",
+# registro único e validadores compilados uma vez (mesmos usados no salvamento)
+from contracts.validacao import REGISTRO_SCHEMAS as REGISTRY, validar_arquivo  # noqa: E402
 
-    # Reutilizam o mesmo schema (stats_ciclo.v1.json):
-    "estatisticas_ciclo_amortizacao.json": STATS_REUSAVEL,
-    "estatisticas_ciclo_emprestimo.json":  STATS_REUSAVEL,
-    "estatisticas_ciclo_lucro.json":       STATS_REUSAVEL,
-    "estats_qtd_luc_ciclo.json":           STATS_REUSAVEL,
-    "estats_qtd_emp_ciclo.json":           STATS_REUSAVEL,
-    "estats_qtd_amo_ciclo.json":           STATS_REUSAVEL,
 
-    # seleção de ativos
-    "ativo.json":  "ativo.v1.json",
-    "ativos.json": "ativos.v1.json",
-}
-
-def load_json(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-def validate_one(data_path: Path) -> tuple[bool, str]:
+def validate_one(data_path: Path, modo: str = "completa") -> tuple[bool, str]:
     name = data_path.name
-    schema_name = REGISTRY.get(name)
-    if not schema_name:
-        return (False, f"[SKIP] Sem schema cadastrado para {name} (adicione no REGISTRY).")
+    if name not in REGISTRY:
+        return (False, f"[SKIP] Sem schema cadastrado para {name} (adicione em contracts/validacao.py).")
+    msgs = validar_arquivo(data_path, modo=modo)
+    ok = all(m.startswith("[OK]") for m in msgs)
+    if ok:
+        return (True, f"[OK] {name} validado com {REGISTRY[name]}")
+    return (False, "\n".join(msgs))
 
-    schema_path = SCHEMA_DIR / schema_name
-    if not schema_path.exists():
-        return (False, f"[ERRO] Schema {schema_name} não encontrado em {SCHEMA_DIR}.")
 
-    data = load_json(data_path)
-    schema = load_json(schema_path)
-    validator = Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(data), key=lambda e: e.path)
-    if errors:
-        msgs = []
-        for e in errors:
-            loc = " → ".join([str(p) for p in e.path]) if e.path else "(raiz)"
-            msgs.append(f"- {name}: {loc}: {e.message}")
-        return (False, "\n".join(msgs))
-    return (True, f"[OK] {name} validado com {schema_name}")
+def validate_outputs_dir(base_dir, modo: str = "completa") -> list[tuple[bool, str]]:
+    """Valida os .json de base_dir (validadores reaproveitados entre arquivos)."""
+    base = Path(base_dir)
+    return [validate_one(p, modo) for p in sorted(base.iterdir()) if p.suffix == ".json"]
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--dir", help="Pasta com JSONs de saída", default=None)
     ap.add_argument("--file", help="Arquivo JSON único para validar", default=None)
+    ap.add_argument("--modo", choices=("completa", "amostra"), default="completa",
+                    help="amostra: listas linha a linha validadas por amostra (INSIGHT_VALIDACAO_AMOSTRA)")
     args = ap.parse_args()
 
     targets = []
@@ -98,7 +59,7 @@ def main():
     ok, fail = 0, 0
     reports = []
     for path in sorted(targets):
-        is_ok, msg = validate_one(path)
+        is_ok, msg = validate_one(path, args.modo)
         reports.append(msg)
         if is_ok:
             ok += 1
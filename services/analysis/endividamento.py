@@ -9,6 +9,8 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 
+from services.utils.contexto import copia_rasa
+
 # -----------------------------------------------------------------------------
 # Utilidades básicas
 # -----------------------------------------------------------------------------
@@ -51,7 +53,7 @@ def adicionar_fluxo_por_ciclo_linha_a_linha(df: pd.DataFrame) -> pd.DataFrame:
       - qtd_emprestimos_ciclo / qtd_amortizacoes_ciclo / qtd_lucros_ciclo
     """
     try:
-        out = df.copy()
+        out = copia_rasa(df)
 
         def _extrai_ciclo_id(serie: pd.Series) -> pd.Series:
             s = serie.astype(str).str.extract(r"(D\d+)", expand=False)
@@ -249,7 +251,7 @@ def preparar_bases_por_ciclo(df: pd.DataFrame) -> pd.DataFrame:
     Prepara colunas-chave e um inteiro de ciclo (0-based) para agrupamentos.
     (Mantém nomes do original para compatibilidade.)
     """
-    base = _ensure_id_ciclo(df.copy())
+    base = _ensure_id_ciclo(copia_rasa(df))
     # ciclo inteiro (0-based internamente)
     base["ciclo"] = base["ID Ciclo"].astype(int) - 1
 
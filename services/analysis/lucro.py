@@ -9,6 +9,7 @@ import pandas as pd
 
 # usamos o mesmo formatador de duração do módulo de endividamento
 from services.analysis.endividamento import formatar_duracao
+from services.utils.contexto import copia_rasa
 
 _LUCRO_RE = re.compile(r"L(\d+)", re.IGNORECASE)
 _CICLO_DIV_RE = re.compile(r"D(\d+)", re.IGNORECASE)
@@ -144,7 +145,7 @@ def adicionar_metricas_lucro_linha_a_linha(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return df
 
-    out = df.copy()
+    out = copia_rasa(df)
     luc = _ensure_series_num(out.get("Lucro Gerado", 0.0))
     ciclo = _ensure_ciclo_int(out)
 
@@ -175,20 +176,25 @@ def adicionar_metricas_lucro_linha_a_linha(df: pd.DataFrame) -> pd.DataFrame:
     ).reset_index(drop=True)
 
     # 3) para cada linha, média/p25 das 'best' de ciclos anteriores ao seu ciclo
-    # mapeia ciclo atual -> índice de posição em best_list
+    # mapeia ciclo atual -> índice de posição em best_list; estatísticas uma vez por posição
     ciclo_pos = out["__ciclo__"].map({c: i for i, c in enumerate(best_list["__ciclo__"])})
-    medias = []
-    p25s = []
-    for i, cpos in ciclo_pos.items():
-        if pd.isna(cpos) or cpos <= 0:
-            medias.append(out.at[i, "__max_ciclo__"])
-            p25s.append(out.at[i, "__max_ciclo__"])
-        else:
-            prev = best_list.loc[: int(cpos) - 1, "best"].values
-            media = float(prev.mean()) if prev.size else float(out.at[i, "__max_ciclo__"])
-            p25 = float(np.percentile(prev, 25)) if prev.size >= 2 else media
-            medias.append(round(media, 2))
-            p25s.append(round(p25, 2))
+    pos = ciclo_pos.to_numpy(dtype=float)
+    anteriores = ~np.isnan(pos) & (pos > 0)
+    pos_int = np.where(anteriores, pos, 0).astype(int)
+
+    best = best_list["best"].to_numpy(dtype=float)
+    media_pos = np.zeros(len(best))
+    p25_pos = np.zeros(len(best))
+    for cpos in np.unique(pos_int[anteriores]):
+        prev = best[:cpos]
+        media = float(prev.mean())
+        p25 = float(np.percentile(prev, 25)) if prev.size >= 2 else media
+        media_pos[cpos], p25_pos[cpos] = round(media, 2), round(p25, 2)
+
+    # primeiro ciclo (sem anteriores): o próprio máximo corrente
+    max_ciclo = out["__max_ciclo__"].to_numpy(dtype=float)
+    medias = np.where(anteriores, media_pos[pos_int], max_ciclo)
+    p25s = np.where(anteriores, p25_pos[pos_int], max_ciclo)
 
     out["Média das Máximas dos Lucros"] = medias
     out["Percentil 25 das Máximas dos Lucros"] = p25s
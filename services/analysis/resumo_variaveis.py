@@ -1,6 +1,9 @@
 
 import pandas as pd
 from services.utils.metrics import gerar_indicador_posicional, obter_periodo
+from services.utils.formatters import converter_numero_br
+from services.utils.contexto import copia_rasa
+from services.utils.aliases import espelhar_aliases
 import logging
 
 
@@ -12,23 +15,9 @@ __all__ = [
 ]
 # >>> cole logo após os imports atuais
 
-# mapeia nomes legados -> nomes novos
-_ALIASES = {
-    # padronização
-    "Resultado Simulado Padronizado Bruto":        "pl_bruto_padronizado",
-    "Resultado Simulado Padronizado Líquido":      "pl_liquido_padronizado",
-    "Resultado Simulado Padronizado Bruto Acumulado":   "pl_bruto_acumulado",
-    "Resultado Simulado Padronizado Líquido Acumulado": "pl_liquido_acumulado",
-    "Taxas Acumuladas Padronização":               "custos_operacionais_acumulados",
-}
-
 def _apply_aliases(df: pd.DataFrame) -> pd.DataFrame:
-    """Cria colunas legadas a partir das novas, quando necessário."""
-    df = df.copy()
-    for antigo, novo in _ALIASES.items():
-        if antigo not in df.columns and novo in df.columns:
-            df[antigo] = df[novo]
-    return df
+    """Cria colunas legadas a partir das novas (registro em services.utils.aliases), sem copiar dados."""
+    return espelhar_aliases(copia_rasa(df))
 
 def _ensure_id_ciclo(df: pd.DataFrame) -> pd.DataFrame:
     """Garante 'ID Ciclo' a partir de 'ID Dívida' ou 'ID Operação' (D#)."""
@@ -71,10 +60,9 @@ def obter_variaveis_pre_padronizacao(df: pd.DataFrame) -> dict:
             if col not in df.columns:
                 raise ValueError(f"Coluna obrigatória não encontrada: {col}")
 
-        df = df.copy()
+        df = copia_rasa(df)
 
-        def _num(s: pd.Series) -> pd.Series:
-            return pd.to_numeric(s.astype(str).str.replace(',', '.'), errors='coerce').fillna(0.0)
+        _num = converter_numero_br
 
         # normalização numérica
         df['Resultado líquido antes da padronização'] = _num(df['Resultado líquido antes da padronização'])
@@ -150,9 +138,10 @@ def obter_variaveis_padronizacao(df: pd.DataFrame) -> dict:
         ativo = df['Ativo'].dropna().iloc[0]
         parametros = identificar_parametros_por_ativo(ativo)
 
-        # Totais
+        # Totais (contratos efetivamente usados na padronização; padrão do ativo se não uniforme)
+        from services.processing.escala_contratos import inferir_contratos_padronizados
         total_operacoes = len(df)
-        contratos = parametros.contratos
+        contratos = inferir_contratos_padronizados(df) or parametros.contratos
         taxa_unitaria = parametros.taxa
         taxa_total_por_operacao = contratos * 2 * taxa_unitaria
 
@@ -218,7 +207,7 @@ def obter_variaveis_fluxo(df: pd.DataFrame) -> dict:
             if col not in df.columns:
                 raise ValueError(f"Coluna obrigatória não encontrada: {col}")
 
-        df = df.copy()
+        df = copia_rasa(df)
 
         to_num_cols = [
             'Taxas Acumuladas Padronização', 'Caixa Líquido',
@@ -301,11 +290,8 @@ def classificar_e_contar_resultados(
         if coluna_resultado not in df.columns:
             raise ValueError(f"A coluna '{coluna_resultado}' não foi encontrada no DataFrame.")
 
-        df = df.copy()
-        df[coluna_resultado] = pd.to_numeric(
-            df[coluna_resultado].astype(str).str.replace(',', '.'),
-            errors='coerce'
-        ).fillna(0.0)
+        df = copia_rasa(df)
+        df[coluna_resultado] = converter_numero_br(df[coluna_resultado])
 
         df['Tipo Resultado'] = df[coluna_resultado].apply(
             lambda x: 'Positiva' if x > 0 else ('Negativa' if x < 0 else 'Neutra')
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import List, Any
 from collections import namedtuple
 from collections.abc import Iterable
 
+import numpy as np
+import pandas as pd
+
 def analisar_ativos(df) -> List[str]:
     """
     PT: Retorna a lista ordenada de ativos encontrados na coluna 'Ativo'.
@@ -50,11 +54,14 @@ def identificar_parametros_por_ativo(ativo: Any) -> ParametrosAtivo:
     """
     PT: Retorna parâmetros padrão para um único ativo (heurística simples).
         Aceita string ou coleção; usa o primeiro valor não vazio.
+        Memoizado por ticker: o log sai uma vez por ativo distinto.
     EN: Returns default parameters for a single asset (simple heuristic).
-        Accepts str or collection; uses the first non-empty value.
+        Accepts str or collection; uses the first non-empty value. Memoized per ticker.
     """
-    ativo_limpo = _limpar_nome_ativo(_coagir_para_str_ativo(ativo))
+    return _parametros_por_ticker(_limpar_nome_ativo(_coagir_para_str_ativo(ativo)))
 
+@lru_cache(maxsize=256)
+def _parametros_por_ticker(ativo_limpo: str) -> ParametrosAtivo:
     if not ativo_limpo:
         logging.warning("⚠️ Ativo vazio/não informado. Usando parâmetros padrão.")
         return ParametrosAtivo(1.00, 0.30, 5.0, 0.20, 5)
@@ -73,3 +80,22 @@ def identificar_parametros_por_ativo(ativo: Any) -> ParametrosAtivo:
         parametros.valor_por_ponto, parametros.contratos
     )
     return parametros
+
+def tabela_parametros_por_linha(ativos: pd.Series) -> pd.DataFrame:
+    """
+    PT: Mapeia a coluna 'Ativo' para uma tabela de parâmetros por linha (mesmo índice).
+        Resolve os parâmetros uma vez por ativo distinto (factorize) e expande com take().
+        Linhas sem ativo herdam o primeiro ativo válido (comportamento antigo).
+    EN: Maps the 'Ativo' column to a per-row parameter table (same index), resolving
+        parameters once per distinct asset.
+    """
+    s = pd.Series(ativos)
+    validos = s.dropna()
+    padrao = validos.iloc[0] if len(validos) else ""
+    codes, uniques = pd.factorize(s.where(s.notna(), padrao).astype(str), sort=False)
+    tabela = np.array([tuple(identificar_parametros_por_ativo(u)) for u in uniques], dtype=float).reshape(-1, len(ParametrosAtivo._fields))
+    if len(codes) and (codes < 0).any():
+        # NaN residual (sem nenhum ativo válido) → parâmetros padrão
+        tabela = np.vstack([tabela, np.array(tuple(identificar_parametros_por_ativo("")), dtype=float)])
+        codes = np.where(codes < 0, len(tabela) - 1, codes)
+    return pd.DataFrame(tabela.take(codes, axis=0), index=s.index, columns=list(ParametrosAtivo._fields))
@@ -1,4 +1,3 @@
-import logging
 from services.features_engineering.features import selecionar_colunas_essenciais
 from services.processing.fluxo_financeiro import (calcular_estatisticas_painel_a_partir_df, construir_resumo_ciclos_fases)
 from services.analysis.endividamento import  extrair_fluxo_final_por_ciclo
@@ -10,138 +9,226 @@ from visual.graficos_plotly import gerar_grafico_fluxo_caixa
 from services.analysis.lucro import  resumir_ciclos_lucro_real, gerar_resumo_e_dataframe_ciclos_lucro
 from services.analysis.completo import gerar_dataframe_completo
 
-def atribuir_variaveis_ao_insight(self, df):
-    self.variaveis_pre = obter_variaveis_pre_padronizacao(df)
-    self.variaveis_padronizacao = obter_variaveis_padronizacao(df)
-    self.variaveis_fluxo = obter_variaveis_fluxo(df)
+from services.utils.pipeline_dag import No, PipelineDAG
 
-    # Lista de ativos detectados
-    self.ativos = analisar_ativos(df) or []
 
-    # usa o primeiro ativo válido para parametrização global
-    if isinstance(self.ativos, str):
-        ativo_principal = self.ativos
-    elif isinstance(self.ativos, list) and self.ativos:
-        ativo_principal = self.ativos[0]
-    else:
-        ativo_principal = ""
+# ------------------------------------------------------------------------------
+# Nós de resumo (independentes entre si → rodam em paralelo no PipelineDAG).
+# Cada nó recebe o DF final e devolve {atributo: valor} para o insight.
+# ------------------------------------------------------------------------------
 
-    # normaliza ticker
-    self.ativo = ativo_principal.replace("[R] ", "").strip().upper()
+# colunas lidas pelo resumo pré-padronização (não mudam com contratos → cache)
+_COLUNAS_PRE = (
+    'Resultado líquido antes da padronização',
+    'Resultado líquido Total Acumulado antes da padronização',
+    'Resultado Total Acumulado em pontos',
+    'Resultado da Operação em real antes da padronização',
+    'Taxas antes da padronização',
+    'Contratos Negociados',
+    'Lado',
+    'Ativo',
+)
 
-    # parâmetros do ativo escolhido
-    self.parametros_ativo = identificar_parametros_por_ativo(self.ativo)
 
+def _coluna_datetime(df):
+    return ("Abertura" if "Abertura" in df.columns else
+            "DataHora" if "DataHora" in df.columns else None)
 
-    self.resultados_fluxo_ciclo = extrair_fluxo_final_por_ciclo(df)
 
-    self.estatisticas_ciclo_emprestimo = calcular_estatisticas_painel_a_partir_df(df, 'emprestimo_acumulado_ciclo')
-    self.estatisticas_ciclo_amortizacao = calcular_estatisticas_painel_a_partir_df(df, 'amortizacao_acumulada_ciclo')
-    self.estatisticas_ciclo_lucro = calcular_estatisticas_painel_a_partir_df(df, 'lucro_acumulado_ciclo')
+def _coluna_acumulado(df):
+    return ("Resultado Líquido Total Acumulado"
+            if "Resultado Líquido Total Acumulado" in df.columns else
+            "Resultado Simulado Padronizado Líquido Acumulado"
+            if "Resultado Simulado Padronizado Líquido Acumulado" in df.columns else
+            "Caixa Líquido")
 
-    self.estats_qtd_emp_ciclo = calcular_estatisticas_painel_a_partir_df(df, 'qtd_emprestimos_ciclo')
-    self.estats_qtd_amo_ciclo = calcular_estatisticas_painel_a_partir_df(df, 'qtd_amortizacoes_ciclo')
-    self.estats_qtd_luc_ciclo = calcular_estatisticas_painel_a_partir_df(df, 'qtd_lucros_ciclo')
 
-    self.resumo_ciclos_drawdown, self.ciclos_drawdown = gerar_resumo_e_dataframe_ciclos_divida(df)
+def _resumo_pre(df):
+    return {"variaveis_pre": obter_variaveis_pre_padronizacao(df)}
 
-    self.ultimo_ciclo = self.resumo_ciclos_drawdown[-1] if self.resumo_ciclos_drawdown else {}
-    df, metricas = classificar_e_contar_resultados(
-        df, coluna_resultado='Resultado Simulado Padronizado Líquido'
-    )
-    # depois de montar self.ciclos_drawdown (lista/dict) a partir do detector de ciclos:
+
+def _resumo_padronizacao(df):
+    return {"variaveis_padronizacao": obter_variaveis_padronizacao(df)}
+
+
+def _resumo_fluxo(df):
+    return {"variaveis_fluxo": obter_variaveis_fluxo(df)}
+
+
+def _ativos(df):
+    # Lista de ativos detectados
+    ativos = analisar_ativos(df) or []
+
+    # usa o primeiro ativo válido para parametrização global
+    if isinstance(ativos, str):
+        ativo_principal = ativos
+    elif isinstance(ativos, list) and ativos:
+        ativo_principal = ativos[0]
+    else:
+        ativo_principal = ""
+
+    # normaliza ticker
+    ativo = ativo_principal.replace("[R] ", "").strip().upper()
+    return {
+        "ativos": ativos,
+        "ativo": ativo,
+        # parâmetros do ativo escolhido
+        "parametros_ativo": identificar_parametros_por_ativo(ativo),
+    }
+
+
+def _fluxo_por_ciclo(df):
+    return {
+        "resultados_fluxo_ciclo": extrair_fluxo_final_por_ciclo(df),
+        "estatisticas_ciclo_emprestimo": calcular_estatisticas_painel_a_partir_df(df, 'emprestimo_acumulado_ciclo'),
+        "estatisticas_ciclo_amortizacao": calcular_estatisticas_painel_a_partir_df(df, 'amortizacao_acumulada_ciclo'),
+        "estatisticas_ciclo_lucro": calcular_estatisticas_painel_a_partir_df(df, 'lucro_acumulado_ciclo'),
+        "estats_qtd_emp_ciclo": calcular_estatisticas_painel_a_partir_df(df, 'qtd_emprestimos_ciclo'),
+        "estats_qtd_amo_ciclo": calcular_estatisticas_painel_a_partir_df(df, 'qtd_amortizacoes_ciclo'),
+        "estats_qtd_luc_ciclo": calcular_estatisticas_painel_a_partir_df(df, 'qtd_lucros_ciclo'),
+    }
+
+
+def _ciclos_divida(df):
     import pandas as pd
-    from services.processing.fluxo_financeiro import contagens_para_resumo, contar_operacoes_por_fase,  construir_resumo_ciclos_fases
+    from services.processing.fluxo_financeiro import contagens_para_resumo, contar_operacoes_por_fase
 
-    df_ciclos = pd.DataFrame(self.ciclos_drawdown)
+    resumo_ciclos_drawdown, ciclos_drawdown = gerar_resumo_e_dataframe_ciclos_divida(df)
+    ultimo_ciclo = resumo_ciclos_drawdown[-1] if resumo_ciclos_drawdown else {}
 
     # conte por datas (sem idx)
     df_ciclos_contado = contar_operacoes_por_fase(
-        self.data,
-        df_ciclos,
-        coluna_datetime=("Abertura" if "Abertura" in self.data.columns else
-                         "DataHora" if "DataHora" in self.data.columns else None),
-        coluna_acumulado=("Resultado Líquido Total Acumulado"
-                          if "Resultado Líquido Total Acumulado" in self.data.columns else
-                          "Resultado Simulado Padronizado Líquido Acumulado"
-                          if "Resultado Simulado Padronizado Líquido Acumulado" in self.data.columns else
-                          "Caixa Líquido")
+        df,
+        pd.DataFrame(ciclos_drawdown),
+        coluna_datetime=_coluna_datetime(df),
+        coluna_acumulado=_coluna_acumulado(df),
     )
 
-    self.df_ciclos_drawdown = df_ciclos_contado
-    self.ciclos_drawdown = df_ciclos_contado.to_dict(orient="records")
-
-    # (se você também enriquece o resumo com as 6 datas/durações:)
-    resumo_base_df = pd.DataFrame(self.resumo_ciclos_drawdown)
+    # enriquece o resumo com as 6 datas/durações
     resumo_fases_df = construir_resumo_ciclos_fases(
-        df_base=self.data,
-        df_ciclos=self.df_ciclos_drawdown,
-        coluna_datetime=("Abertura" if "Abertura" in self.data.columns else
-                         "DataHora" if "DataHora" in self.data.columns else None),
-        coluna_acumulado=("Resultado Líquido Total Acumulado"
-                          if "Resultado Líquido Total Acumulado" in self.data.columns else
-                          "Resultado Simulado Padronizado Líquido Acumulado"
-                          if "Resultado Simulado Padronizado Líquido Acumulado" in self.data.columns else
-                          "Caixa Líquido"),
-        resumo_antigo=resumo_base_df
+        df_base=df,
+        df_ciclos=df_ciclos_contado,
+        coluna_datetime=_coluna_datetime(df),
+        coluna_acumulado=_coluna_acumulado(df),
+        resumo_antigo=pd.DataFrame(resumo_ciclos_drawdown),
     )
 
     # mesclar as CONTAGENS no resumo
-    contagens_df = contagens_para_resumo(self.df_ciclos_drawdown)
+    contagens_df = contagens_para_resumo(df_ciclos_contado)
     resumo_final_df = resumo_fases_df.merge(
         contagens_df.assign(**{
             "ID Ciclo": pd.to_numeric(contagens_df["ID Ciclo"], errors="coerce").astype("Int64")
         }),
         on="ID Ciclo", how="left"
     )
+    resumo_ciclos_drawdown = resumo_final_df.to_dict(orient="records")
+
+    return {
+        "ultimo_ciclo": ultimo_ciclo,
+        "df_ciclos_drawdown": df_ciclos_contado,
+        "ciclos_drawdown": df_ciclos_contado.to_dict(orient="records"),
+        "resumo_ciclos_drawdown": resumo_ciclos_drawdown,
+        "estatisticas_duracao_ciclos": obter_estatisticas_duracao_ciclos(resumo_ciclos_drawdown),
+    }
+
+
+def _classificacao(df):
+    """Devolve (df com 'Tipo Resultado', métricas) — base de gráficos e do DF completo."""
+    return classificar_e_contar_resultados(df, coluna_resultado='Resultado Simulado Padronizado Líquido')
+
+
+def _resumo_classificacao(classificado):
+    _, metricas = classificado
+    return {
+        # 🔸 guarda tudo num único atributo
+        "metricas_positivas_negativas": metricas,
+        # quantidades
+        "qtd_positivas": metricas["qtd_positivas"],
+        "qtd_negativas": metricas["qtd_negativas"],
+        "qtd_neutras": metricas["qtd_neutras"],
+        # porcentagens
+        "pct_positivas": metricas["pct_positivas"],
+        "pct_negativas": metricas["pct_negativas"],
+        "pct_neutras": metricas["pct_neutras"],
+        # somas
+        "soma_positivas": metricas["soma_positivas"],
+        "soma_negativas": metricas["soma_negativas"],
+        "soma_neutras": metricas["soma_neutras"],
+        # médias
+        "media_positivas": metricas["media_positivas"],
+        "media_negativas": metricas["media_negativas"],
+        # percentis
+        "perc_positivas": metricas["perc75_positivas"],
+        "perc_negativas": metricas["perc25_negativas"],
+    }
+
+
+def _graficos(classificado):
+    return {"grafico_json": gerar_grafico_fluxo_caixa(classificado[0])}
+
+
+def _completo(classificado):
+    df = classificado[0]
+    return {
+        "df_completo": gerar_dataframe_completo(df),
+        "df_prebacktest": selecionar_colunas_essenciais(df),
+    }
+
+
+def _ciclos_lucro(df):
+    resumo_ciclos_lucro, df_ciclos_lucro = gerar_resumo_e_dataframe_ciclos_lucro(df)
+    return {
+        "resumo_ciclos_lucro": resumo_ciclos_lucro,
+        "df_ciclos_lucro": df_ciclos_lucro,
+        "resumo_lucros_estatisticos": resumir_ciclos_lucro_real(df_ciclos_lucro),
+    }
+
+
+def _sem_df_final():
+    raise RuntimeError("Nó 'df_final' precisa ser fornecido via entradas.")
+
+
+# nó de entrada: DF final do pipeline (fornecido pelo orquestrador ou por `entradas`)
+NO_DF_FINAL = No("df_final", _sem_df_final, cache=False)
+
+NOS_RESUMO = [
+    No("resumo_pre", _resumo_pre, depende=("df_final",), colunas=_COLUNAS_PRE),
+    No("ativos", _ativos, depende=("df_final",), colunas=("Ativo",)),
+    No("resumo_padronizacao", _resumo_padronizacao, depende=("df_final",)),
+    No("resumo_fluxo", _resumo_fluxo, depende=("df_final",)),
+    No("fluxo_por_ciclo", _fluxo_por_ciclo, depende=("df_final",)),
+    No("ciclos_divida", _ciclos_divida, depende=("df_final",)),
+    No("ciclos_lucro", _ciclos_lucro, depende=("df_final",)),
+    No("classificacao", _classificacao, depende=("df_final",)),
+    No("resumo_classificacao", _resumo_classificacao, depende=("classificacao",)),
+    No("graficos", _graficos, depende=("classificacao",)),
+    No("completo", _completo, depende=("classificacao",)),
+]
+
+# resumos pequenos que leem só colunas pré-padronização: mantidos no cache do DAG
+RESUMOS_RETIDOS = ("resumo_pre", "ativos")
+
+# nós cujas saídas são atributos do insight (ordem de aplicação)
+RESUMOS = (
+    "resumo_pre", "resumo_padronizacao", "resumo_fluxo", "ativos", "fluxo_por_ciclo",
+    "ciclos_divida", "resumo_classificacao", "graficos", "ciclos_lucro", "completo",
+)
+
+
+def aplicar_resumos(self, *resumos):
+    """Atribui ao insight os dicionários produzidos pelos nós de RESUMOS (mesma ordem)."""
+    for attrs in resumos:
+        for k, v in (attrs or {}).items():
+            setattr(self, k, v)
 
-    self.resumo_ciclos_drawdown = resumo_final_df.to_dict(orient="records")
-
-
-    # 🔸 guarda tudo num único atributo
-    self.metricas_positivas_negativas = metricas
-
-    # quantidades
-    self.qtd_positivas = metricas["qtd_positivas"]
-    self.qtd_negativas = metricas["qtd_negativas"]
-    self.qtd_neutras = metricas["qtd_neutras"]
-
-    # porcentagens
-    self.pct_positivas = metricas["pct_positivas"]
-    self.pct_negativas = metricas["pct_negativas"]
-    self.pct_neutras = metricas["pct_neutras"]
-
-    # somas
-    self.soma_positivas = metricas["soma_positivas"]
-    self.soma_negativas = metricas["soma_negativas"]
-    self.soma_neutras = metricas["soma_neutras"]
-
-    # médias
-    self.media_positivas = metricas["media_positivas"]
-    self.media_negativas = metricas["media_negativas"]
 
-    # percentis
-    self.perc_positivas = metricas["perc75_positivas"]
-    self.perc_negativas = metricas["perc25_negativas"]
-
-    self.estatisticas_duracao_ciclos = obter_estatisticas_duracao_ciclos(self.resumo_ciclos_drawdown)
-
-    #Atruir graficos
-    self.grafico_json = gerar_grafico_fluxo_caixa(df)
-
-    self.resumo_ciclos_lucro, self.df_ciclos_lucro = (
-        gerar_resumo_e_dataframe_ciclos_lucro(self.data)
-    )
-    self.resumo_lucros_estatisticos = resumir_ciclos_lucro_real(self.df_ciclos_lucro)
-
-    self.df_completo = gerar_dataframe_completo(df)
-
-    self.df_prebacktest= selecionar_colunas_essenciais(df)
-
-    # Temporary debug logs for drawdown screen (restored)
-    logging.info("--- DEBUGGING DRAWDOWN SCREEN ---")
-    logging.info("resumo_ciclos_drawdown: %s", self.resumo_ciclos_drawdown)
-    logging.info("resumo_ciclos_lucro: %s", self.resumo_ciclos_lucro)
-    logging.info("df_completo: %s", getattr(self, 'df_completo', None).head() if hasattr(self, 'df_completo') else None)
-    logging.info("ultimo_ciclo: %s", self.ultimo_ciclo)
-    logging.info("--- END DEBUGGING ---")
+def atribuir_variaveis_ao_insight(self, df):
+    """
+    Calcula os resumos do DF final e atribui ao insight. Usa o PipelineDAG do insight
+    (cache por nó: ex. resumo pré e ativos não recalculam quando só mudam contratos).
+    """
+    dag = getattr(self, "_dag", None)
+    if dag is None:
+        dag = self._dag = PipelineDAG([NO_DF_FINAL, *NOS_RESUMO], reter=RESUMOS_RETIDOS)
+    saidas = dag.executar(alvos=RESUMOS, entradas={"df_final": df})
+    aplicar_resumos(self, *(saidas[n] for n in RESUMOS))
@@ -8,6 +8,23 @@ from services.logic.simulator import simular_ciclo
 import logging                      
 logger = logging.getLogger(__name__)
 
+# colunas do prebacktest lidas pelo backtest (simulador, condições, recálculo, métricas e
+# comparativo) — o resto do artefato não precisa sair do disco
+COLUNAS_BACKTEST = (
+    'Resultado Simulado Padronizado Líquido',
+    'Resultado Simulado Padronizado Líquido Acumulado',
+    'Dívida Acumulada',
+    'Valor Emprestado',
+    'Amortização',
+    'Lucro Gerado',
+    'Máxima Dívida Acumulada',
+    'Média das Máximas Dívidas',
+    'Percentil 25 das Máximas Dívidas',
+    'Posição Relativa Lucro',
+    'Ativação Automação',
+    'ID Dívida',
+)
+
 
 def recalcular_fluxo_apos_ativacao(df_backtest):
     df_ativado = df_backtest[df_backtest['Estado Automação'] == 'ativada'].copy()
@@ -111,9 +128,10 @@ def comparar_ciclos(df_pre, df_backtest, temp_path=""):
     return df_comp
 
 def executar_backtest_completo(df_prebacktest, parametros_usuario: dict, temp_path: str = "", salvar_resultados=True):
-    from services.logic.save_data import salvar_json
+    from services.logic.save_data import salvar_metricas_backtest
     import os
     from services.utils.formatters import converter_valores_json_serializaveis
+    from services.utils.artefatos import salvar_dataframe
 
     df_prebacktest['Condicao Processada'] = False
 
@@ -141,10 +159,10 @@ def executar_backtest_completo(df_prebacktest, parametros_usuario: dict, temp_pa
 
 
     if salvar_resultados and temp_path:
-        salvar_json(converter_valores_json_serializaveis(metricas_backtest), os.path.join(temp_path, "metricas_backtest.json"))
-        salvar_json(converter_valores_json_serializaveis(metricas_original), os.path.join(temp_path, "metricas_original.json"))
+        salvar_metricas_backtest(temp_path, converter_valores_json_serializaveis(metricas_backtest),
+                                 converter_valores_json_serializaveis(metricas_original))
         if df_backtest_recalculado is not None:
-            df_backtest_recalculado.to_json(os.path.join(temp_path, "resultado_backtest.json"), orient="split", force_ascii=False)
+            salvar_dataframe(df_backtest_recalculado, temp_path, "resultado_backtest")
         if df_comparativo is not None:
             df_comparativo.to_json(os.path.join(temp_path, "comparativo_ciclos.json"), orient="split", force_ascii=False)
 
@@ -0,0 +1,127 @@
+# services/logic/comparativo.py
+"""
+PT:
+    Agregados do comparativo "sempre ligada" × "Insight Futures" (/api/comparativo).
+
+    - `agregados_fluxo`: contagens e extremos da estratégia original, calculados uma vez no
+      pipeline (contagens de variaveis_fluxo quando disponíveis; o resto vetorizado no DF).
+    - `agregados_backtest`: as mesmas chaves a partir de metricas_backtest.
+    - `comparativo.json` guarda os dois lados; o backtest atualiza só o lado "insight_futures".
+      A rota e a visão entre execuções só leem esse registro (cache do processo).
+
+EN:
+    Pre-aggregated comparativo record (always-on vs automated), written by the pipeline
+    and the backtest; the API reads it instead of rescanning the results CSV.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from services.utils.file_io import carregar_json
+
+ARQUIVO_COMPARATIVO = "comparativo.json"
+
+CHAVES = (
+    "total_operacoes",
+    "operacoes_negativas",
+    "operacoes_amortizacao",
+    "operacoes_lucro",
+    "lucro_final",
+    "drawdown_maximo",
+    "maior_lucro_acumulado",
+)
+
+# chave do comparativo → nomes aceitos no JSON do backtest (metricas_backtest primeiro)
+_CHAVES_BACKTEST = {
+    "total_operacoes": ("n_operacoes_automacao_ativada", "total_operacoes", "ops_total", "qtd_operacoes"),
+    "operacoes_negativas": ("n_operacoes_negativas", "operacoes_negativas", "qtd_negativas"),
+    "operacoes_amortizacao": ("n_operacoes_amortizacao", "operacoes_amortizacao", "qtd_amortizacoes"),
+    "operacoes_lucro": ("n_operacoes_positivas", "operacoes_lucro", "qtd_lucros"),
+    "lucro_final": ("resultado_liquido_final", "lucro_final", "resultado_liquido"),
+    "drawdown_maximo": ("drawdown_maximo", "dd_maximo"),
+    "maior_lucro_acumulado": ("maior_lucro_acumulado", "lucro_max_acum"),
+}
+
+
+def _serie(df: pd.DataFrame, coluna: str) -> Optional[pd.Series]:
+    if coluna not in df.columns:
+        return None
+    return pd.to_numeric(df[coluna], errors="coerce")
+
+
+def _arred(valor: Any) -> float:
+    try:
+        v = float(valor)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if pd.isna(v) else round(v, 2)
+
+
+def agregados_fluxo(df: Optional[pd.DataFrame], variaveis_fluxo: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Agregados da execução sempre ligada (mesmas definições de calcular_metricas_backtest)."""
+    if df is None or len(df) == 0:
+        return {k: 0 for k in CHAVES}
+    vf = variaveis_fluxo or {}
+
+    def contar(chave_vf: str, coluna: str, positivo: bool) -> int:
+        if vf.get(chave_vf) is not None:
+            return int(vf[chave_vf])
+        s = _serie(df, coluna)
+        if s is None:
+            return 0
+        return int((s > 0).sum() if positivo else (s < 0).sum())
+
+    divida = _serie(df, "Dívida Acumulada")
+    lucro_acum = _serie(df, "Lucro Acumulado")
+    resultado = _serie(df, "Resultado Simulado Padronizado Líquido Acumulado")
+    if resultado is None:
+        resultado = _serie(df, "pl_liquido_acumulado")
+    resultado = resultado.dropna() if resultado is not None else None
+
+    return {
+        "total_operacoes": int(vf.get("total_linhas") or len(df)),
+        "operacoes_negativas": contar("qtde_emprestado", "Valor Emprestado", positivo=False),
+        "operacoes_amortizacao": contar("qtde_amortizacao", "Amortização", positivo=True),
+        "operacoes_lucro": contar("qtde_lucro", "Lucro Gerado", positivo=True),
+        "lucro_final": _arred(resultado.iloc[-1]) if resultado is not None and len(resultado) else 0.0,
+        "drawdown_maximo": _arred(divida.min()) if divida is not None else 0.0,
+        "maior_lucro_acumulado": _arred(lucro_acum.max()) if lucro_acum is not None else 0.0,
+    }
+
+
+def agregados_backtest(metricas: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Normaliza as métricas do backtest para as chaves do comparativo; None sem backtest."""
+    if not metricas:
+        return None
+    out = {}
+    for chave, nomes in _CHAVES_BACKTEST.items():
+        out[chave] = next((metricas[n] for n in nomes if metricas.get(n) is not None), None)
+    return out
+
+
+def montar_comparativo(sempre_ligada: Dict[str, Any], metricas_backtest: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Registro completo; sem backtest, o lado "insight_futures" repete a base marcado como fallback."""
+    insight = agregados_backtest(metricas_backtest)
+    if insight is None:
+        insight = {**sempre_ligada, "from_fallback": True}
+    return {"sempre_ligada": sempre_ligada, "insight_futures": insight}
+
+
+def atualizar_comparativo_backtest(escritor, metricas_backtest: Optional[Dict[str, Any]]) -> None:
+    """Regrava comparativo.json de `escritor.base_dir` com o lado do backtest (se já houver a base)."""
+    atual = carregar_json(escritor.base_dir, ARQUIVO_COMPARATIVO, raise_if_missing=False, cache=False)
+    if not atual or "sempre_ligada" not in atual:
+        logging.info("ℹ️ comparativo.json sem base em %s; backtest não agregado.", escritor.base_dir)
+        return
+    escritor.gravar_json(ARQUIVO_COMPARATIVO, montar_comparativo(atual["sempre_ligada"], metricas_backtest))
+
+
+def carregar_comparativo(dirpath: str) -> Optional[Dict[str, Any]]:
+    """Registro pré-agregado da execução (cache do processo; não altere o retorno); None se não existir."""
+    try:
+        return carregar_json(str(dirpath), ARQUIVO_COMPARATIVO)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,88 @@
+# services/logic/estado_atual.py
+"""
+PT:
+    Snapshot do "Estado Atual da Estratégia" (card HTMX /painel/_estado_atual).
+
+    O pipeline grava `estado_atual.json` (última dívida, fase, média/P25 das máximas,
+    posição relativa e recomendação) a partir das duas últimas linhas do fluxo; o card
+    só lê esse JSON pequeno, sem carregar o CSV inteiro a cada poll.
+
+EN:
+    Tiny current-state snapshot written by the pipeline and served by the HTMX card.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from services.logic.conditions import decidir_estado_a_partir_df
+
+ARQUIVO_ESTADO = "estado_atual.json"
+
+ESTADO_VAZIO = {
+    "fase": "—",
+    "divida_atual": None,
+    "media_maximas_dividas": None,
+    "p25_maximas_dividas": None,
+    "posicao_relativa_divida": None,
+    "recomendacao": "MANTER",
+    "motivo": "Sem dados recentes encontrados.",
+}
+
+
+def inferir_fase(df: pd.DataFrame) -> str:
+    """
+    Deduz a fase a partir da 'Dívida Acumulada':
+      - < 0 e caindo -> DECLINIO
+      - < 0 e subindo (indo a zero) -> RECUPERACAO
+      - >= 0 -> LUCRO
+    """
+    try:
+        if "Dívida Acumulada" not in df.columns or len(df) == 0:
+            return "LUCRO"
+        div = pd.to_numeric(df["Dívida Acumulada"], errors="coerce").fillna(0.0)
+        if len(div) < 2:
+            return "RECUPERACAO" if div.iloc[-1] < 0 else "LUCRO"
+        atual = div.iloc[-1]
+        prev = div.iloc[-2]
+        if atual < 0 and atual < prev:
+            return "DECLINIO"
+        if atual < 0 and atual >= prev:
+            return "RECUPERACAO"
+        return "LUCRO"
+    except Exception:
+        return "LUCRO"
+
+
+def _numero(valor: Any) -> Optional[float]:
+    try:
+        v = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(v) else v
+
+
+def montar_estado_atual(df: Optional[pd.DataFrame], parametros: Optional[dict] = None) -> Dict[str, Any]:
+    """Estado do card a partir do DF do fluxo (só as duas últimas linhas são usadas)."""
+    if df is None or len(df) == 0:
+        return dict(ESTADO_VAZIO)
+    cauda = df.iloc[-2:]
+    row = cauda.iloc[-1]
+
+    # decisão consolidada (parâmetros vazios por padrão, como no card)
+    try:
+        recomendacao, motivo = decidir_estado_a_partir_df(cauda, parametros=parametros or {})
+    except Exception:
+        recomendacao, motivo = ("MANTER", "Sem decisão consolidada.")
+
+    return {
+        "fase": inferir_fase(cauda),
+        "divida_atual": _numero(row.get("Dívida Acumulada", None)),
+        "media_maximas_dividas": _numero(row.get("Média das Máximas Dívidas", None)),
+        "p25_maximas_dividas": _numero(row.get("Percentil 25 das Máximas Dívidas", None)),
+        "posicao_relativa_divida": _numero(row.get("Posição Relativa Dívida", None)),
+        "recomendacao": recomendacao,
+        "motivo": motivo,
+    }
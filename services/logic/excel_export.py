@@ -2,16 +2,10 @@ from services.utils.file_io import salvar_resultados, salvar_json
 import pandas as pd
 import logging
 
-# --- helpers defensivos -------------------------------------------------------
+from services.utils.contexto import copia_rasa
+from services.utils.aliases import espelhar_aliases
 
-_ALIASES = {
-    # padronização (nomes “novos” -> nomes legados que o export espera)
-    "Resultado Simulado Padronizado Bruto":        "pl_bruto_padronizado",
-    "Resultado Simulado Padronizado Líquido":      "pl_liquido_padronizado",
-    "Resultado Simulado Padronizado Bruto Acumulado":   "pl_bruto_acumulado",
-    "Resultado Simulado Padronizado Líquido Acumulado": "pl_liquido_acumulado",
-    "Taxas Acumuladas Padronização":               "custos_operacionais_acumulados",
-}
+# --- helpers defensivos -------------------------------------------------------
 
 _DEFAULTS = {
     # validação/diferenças
@@ -31,14 +25,11 @@ _DEFAULTS = {
 }
 
 def _apply_aliases(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    for legado, novo in _ALIASES.items():
-        if legado not in df.columns and novo in df.columns:
-            df[legado] = df[novo]
-    return df
+    # o CSV tem contrato com os nomes legados (ex.: api_comparativo)
+    return espelhar_aliases(copia_rasa(df))
 
 def _ensure_cols(df: pd.DataFrame, defaults: dict) -> pd.DataFrame:
-    df = df.copy()
+    df = copia_rasa(df)
     for col, val in defaults.items():
         if col not in df.columns:
             df[col] = val
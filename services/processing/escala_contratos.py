@@ -0,0 +1,266 @@
+# services/processing/escala_contratos.py
+"""
+Reescala por contratos (fast path do recálculo).
+
+O P&L padronizado é linear no número de contratos:
+    ticks × multiplicador × contratos − taxa × 2 × contratos
+e o razão FIFO multiplicado por uma constante positiva gera os mesmos IDs (D#/E#/A#/L#)
+com valores proporcionalmente escalados. Logo, trocar de N para M contratos (iguais em
+todas as linhas) é só multiplicar as colunas monetárias por M/N — sem reler a planilha
+e sem rodar o razão de novo. Contagens, IDs, datas e posições relativas não mudam.
+
+Médias/percentis das máximas são gravados arredondados a 2 casas; reescalar o valor
+arredondado desvia do recálculo completo, então eles são recalculados a partir do razão
+reescalado (não arredondado).
+
+Limite: só vale quando os contratos atuais são iguais em todas as linhas. Num relatório
+misto com o contrato padrão de cada ativo (ex.: WIN + WDO), a razão muda por linha e o
+razão FIFO precisa ser refeito (caminho completo).
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from services.input.ativos import tabela_parametros_por_linha
+from services.utils.contexto import copia_rasa
+from services.utils.aliases import ALIASES_LEGADOS, espelhar_aliases
+
+# Monetárias por linha arredondadas a 2 casas na padronização (centavos exatos: reescala sem desvio)
+COLUNAS_ESCALA_2CASAS = [
+    "pl_bruto_padronizado",
+    "pl_liquido_padronizado",
+    "pl_bruto_acumulado",
+    "pl_liquido_acumulado",
+    "custos_operacionais_acumulados",
+    "Resultado Simulado Padronizado Bruto",
+    "Resultado Simulado Padronizado Líquido",
+    "Resultado Simulado Padronizado Bruto Acumulado",
+    "Resultado Simulado Padronizado Líquido Acumulado",
+    "Taxas Acumuladas Padronização",
+]
+
+# Monetárias do razão e métricas por ciclo (sem arredondamento na origem)
+COLUNAS_ESCALA = [
+    "Caixa Líquido",
+    "Dívida Acumulada",
+    "Valor Emprestado",
+    "Valores Recebidos",
+    "Amortização",
+    "Lucro Gerado",
+    "emprestimo_acumulado_ciclo",
+    "amortizacao_acumulada_ciclo",
+    "lucro_acumulado_ciclo",
+]
+
+# Agregados arredondados na origem: recalculados do razão reescalado (não reescalados)
+COLUNAS_RECALCULADAS = [
+    "Máxima Dívida Acumulada",
+    "Média das Máximas Dívidas",
+    "Percentil 25 das Máximas Dívidas",
+    "Lucro Acumulado",
+    "Média das Máximas dos Lucros",
+    "Percentil 25 das Máximas dos Lucros",
+]
+
+# Células com listas de valores
+COLUNAS_ESCALA_LISTA = [
+    "Sequencia_Valores_Emprestados",
+    "Sequencia_Valores_Recebidos",
+]
+
+# Tudo o que o razão FIFO e as métricas pós-razão produzem (recalculado no caminho completo)
+COLUNAS_POS_RAZAO = [
+    "ID Operação", "ID Dívida", "ID Empréstimo", "ID Amortização/ID Empréstimo", "ID Lucro",
+    "ID Sequencias", "ID Ciclo",
+    "qtd_emprestimos_ciclo", "qtd_amortizacoes_ciclo", "qtd_lucros_ciclo",
+    "Posição Relativa Dívida", "Posição Relativa Lucro",
+    *COLUNAS_ESCALA, *COLUNAS_ESCALA_LISTA, *COLUNAS_RECALCULADAS,
+]
+
+_COLS_CUSTOS = ("custos_operacionais_acumulados", "Taxas Acumuladas Padronização")
+
+
+def inferir_contratos_padronizados(df: pd.DataFrame) -> Optional[int]:
+    """
+    Deduz os contratos usados na padronização a partir dos custos acumulados
+    (taxa_op = taxa × 2 × contratos). Retorna None se não for uniforme entre as linhas
+    (ex.: relatório misto com contratos padrão por ativo) ou se faltar informação.
+    """
+    if df is None or df.empty or "Ativo" not in df.columns:
+        return None
+    col = next((c for c in _COLS_CUSTOS if c in df.columns), None)
+    if col is None:
+        return None
+    custos = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+    if np.isnan(custos).any():
+        return None
+    taxa_op = np.diff(custos, prepend=0.0)
+    taxa = tabela_parametros_por_linha(df["Ativo"])["taxa"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        contratos = np.rint(taxa_op / (2.0 * taxa))
+    if not len(contratos) or not np.isfinite(contratos).all():
+        return None
+    c = contratos[0]
+    if c <= 0 or not (contratos == c).all():
+        return None
+    return int(c)
+
+
+def escalar_por_contratos(df: pd.DataFrame, contratos_novos: int) -> Optional[pd.DataFrame]:
+    """
+    Devolve uma cópia de `df` com as colunas monetárias reescaladas para `contratos_novos`.
+    Retorna None quando o fast path não se aplica (contratos atuais não uniformes/indedutíveis),
+    e o chamador deve recalcular pelo caminho completo.
+    """
+    try:
+        novos = int(contratos_novos)
+    except (TypeError, ValueError):
+        return None
+    if novos <= 0:
+        return None
+    atuais = inferir_contratos_padronizados(df)
+    if atuais is None:
+        return None
+
+    out = copia_rasa(df)
+    if novos == atuais:
+        return out
+
+    k = novos / atuais
+    for c in COLUNAS_ESCALA_2CASAS:
+        if c in out.columns and ALIASES_LEGADOS.get(c) not in out.columns:
+            out[c] = (pd.to_numeric(out[c], errors="coerce") * k).round(2)
+    for c in COLUNAS_ESCALA:
+        if c in out.columns:
+            out[c] = pd.to_numeric(out[c], errors="coerce") * k
+    for c in COLUNAS_ESCALA_LISTA:
+        if c in out.columns:
+            out[c] = [
+                [v * k for v in cel] if isinstance(cel, (list, tuple)) else cel
+                for cel in out[c]
+            ]
+    try:
+        out = _recalcular_agregados(out)
+    except Exception as e:  # sem IDs/ciclos utilizáveis → caminho completo
+        logging.warning("Reescala por contratos sem agregados recalculados (%s); usando caminho completo.", e)
+        return None
+    # colunas legadas voltam a apontar para as canônicas reescaladas
+    return espelhar_aliases(out, sobrescrever=True)
+
+
+def _recalcular_agregados(df: pd.DataFrame) -> pd.DataFrame:
+    """Máximas/médias/P25 de dívida e lucro a partir do razão já reescalado."""
+    from services.processing.fluxo_financeiro import calcular_maxima_media_e_posicao_relativa
+    from services.analysis.lucro import adicionar_metricas_lucro_linha_a_linha
+
+    out = df
+    if "Dívida Acumulada" in out.columns and ("ID Dívida" in out.columns or "ID Operação" in out.columns):
+        out = calcular_maxima_media_e_posicao_relativa(out)
+    if "Lucro Gerado" in out.columns:
+        out = adicionar_metricas_lucro_linha_a_linha(out)
+    return out
+
+
+def recalcular_razao(df: pd.DataFrame, contratos: int) -> pd.DataFrame:
+    """
+    Caminho completo: re-padroniza com `contratos` a partir das colunas pré-razão de `df`
+    e roda de novo razão FIFO + métricas por ciclo (usado quando a reescala não se aplica).
+    """
+    from services.processing.standardization import padronizar_estrategia
+    from services.processing.fluxo_financeiro import (
+        calcular_fluxo_estrategia,
+        calcular_maxima_media_e_posicao_relativa,
+    )
+    from services.analysis.endividamento import adicionar_fluxo_por_ciclo_linha_a_linha
+    from services.analysis.lucro import adicionar_metricas_lucro_linha_a_linha
+
+    base = df.drop(columns=[c for c in COLUNAS_POS_RAZAO if c in df.columns])
+    out, _ = padronizar_estrategia(base, contratos_usuario=contratos)
+    out = calcular_fluxo_estrategia(out)
+    try:
+        out = adicionar_fluxo_por_ciclo_linha_a_linha(out)
+    except Exception:
+        pass
+    out = calcular_maxima_media_e_posicao_relativa(out)
+    try:
+        out = adicionar_metricas_lucro_linha_a_linha(out)
+    except Exception:
+        pass
+    return out
+
+
+def _ultimo(df: pd.DataFrame, col: str) -> float:
+    if col not in df.columns or df.empty:
+        return 0.0
+    v = pd.to_numeric(df[col], errors="coerce").iloc[-1]
+    return 0.0 if pd.isna(v) else float(v)
+
+
+def curva_contratos(df: pd.DataFrame, contratos=10) -> pd.DataFrame:
+    """
+    Curva "what-if" por número de contratos, numa única passada.
+
+    `contratos`: int N (avalia 1..N) ou lista de contagens. Calcula as métricas uma vez
+    sobre o df processado (ou, se os contratos atuais não forem uniformes, sobre um
+    recálculo com 1 contrato) e reescala linearmente para cada contagem.
+
+    Retorna um DataFrame compacto (uma linha por contagem):
+        contratos, resultado_final, total_taxas, maxima_divida, media_maximas_dividas,
+        qtd_ciclos_lucro, maior_lucro_ciclo, media_lucro_ciclo, p75_lucro_ciclo
+    """
+    from services.analysis.lucro import gerar_resumo_e_dataframe_ciclos_lucro
+    from services.processing.fluxo_financeiro import maximas_dividas
+
+    if isinstance(contratos, (int, np.integer)):
+        lista = list(range(1, int(contratos) + 1))
+    else:
+        lista = sorted({int(c) for c in contratos})
+    lista = [c for c in lista if c > 0]
+    colunas = [
+        "contratos", "resultado_final", "total_taxas", "maxima_divida", "media_maximas_dividas",
+        "qtd_ciclos_lucro", "maior_lucro_ciclo", "media_lucro_ciclo", "p75_lucro_ciclo",
+    ]
+    if df is None or df.empty or not lista:
+        return pd.DataFrame(columns=colunas)
+
+    atuais = inferir_contratos_padronizados(df)
+    if atuais is None:
+        df, atuais = recalcular_razao(df, 1), 1
+
+    # métricas-base (não arredondadas) para `atuais` contratos: máxima/média das dívidas vêm
+    # do razão (as colunas gravadas já estão com 2 casas e reescalá-las desvia)
+    if "Dívida Acumulada" in df.columns and ("ID Dívida" in df.columns or "ID Operação" in df.columns):
+        max_div, media_div = maximas_dividas(df)
+    else:
+        max_div, media_div = 0.0, 0.0
+    _, df_ciclos = gerar_resumo_e_dataframe_ciclos_lucro(df)
+    lucros = (
+        pd.to_numeric(df_ciclos["Lucro Gerado no Ciclo"], errors="coerce").fillna(0.0).to_numpy()
+        if "Lucro Gerado no Ciclo" in df_ciclos.columns else np.empty(0)
+    )
+    qtd = int(lucros.size)
+    base = np.array([
+        _ultimo(df, "Resultado Simulado Padronizado Líquido Acumulado"),
+        _ultimo(df, "Taxas Acumuladas Padronização"),
+        max_div,
+        media_div,
+        float(lucros.max()) if qtd else 0.0,
+        float(lucros.mean()) if qtd else 0.0,
+        (float(np.percentile(lucros, 75)) if qtd >= 2 else float(lucros.mean())) if qtd else 0.0,
+    ])
+
+    # todas as contagens de uma vez: (n_contagens × 1) ⊗ (1 × n_métricas)
+    k = np.asarray(lista, dtype=float)[:, None] / atuais
+    valores = np.round(k * base[None, :], 2)
+
+    out = pd.DataFrame(valores, columns=[
+        "resultado_final", "total_taxas", "maxima_divida", "media_maximas_dividas",
+        "maior_lucro_ciclo", "media_lucro_ciclo", "p75_lucro_ciclo",
+    ])
+    out.insert(0, "contratos", np.asarray(lista, dtype="int32"))
+    out.insert(5, "qtd_ciclos_lucro", qtd)
+    return out[colunas]
@@ -12,6 +12,7 @@ Funções públicas principais
 ---------------------------
 - calcular_fluxo_estrategia(df) -> pd.DataFrame
 - calcular_maxima_media_e_posicao_relativa(df) -> pd.DataFrame
+- maximas_dividas(df) -> (float, float)
 - construir_resumo_ciclos_fases(df_base, df_ciclos, ...) -> pd.DataFrame
 - contar_operacoes_por_fase(df_base, df_ciclos, ...) -> pd.DataFrame
 - contagens_para_resumo(df) -> pd.DataFrame
@@ -31,6 +32,7 @@ import numpy as np
 import pandas as pd
 
 from services.utils.metrics import gerar_indicador_posicional
+from services.utils.contexto import copia_rasa
 
 logger = logging.getLogger(__name__)
 
@@ -243,9 +245,9 @@ def calcular_fluxo_estrategia(df: pd.DataFrame) -> pd.DataFrame:
     logger.info("Iniciando cálculo do fluxo financeiro...")
 
     if df is None or df.empty:
-        return df.copy()
+        return copia_rasa(df)
 
-    base = df.copy()
+    base = copia_rasa(df)
 
     # Normalização (não altera semântica)
     for c in (COL_RES_LIQ, COL_RES_LIQ_ACUM):
@@ -314,6 +316,49 @@ def calcular_fluxo_estrategia(df: pd.DataFrame) -> pd.DataFrame:
 # Métricas de dívida/posição relativa (linha a linha)
 # ---------------------------------------------------------------------
 
+def _dividas_por_trecho(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Dívida por linha, trecho de cada linha e mínima de cada trecho (não arredondadas).
+    Ciclos = trechos consecutivos com o mesmo D#.
+    """
+    id_raw = df["ID Dívida"] if "ID Dívida" in df.columns else df["ID Operação"]
+    id_vec = id_raw.astype(str).str.extract(r"D(\d+)", expand=False).fillna("0").astype(int).to_numpy()
+    div = pd.to_numeric(df["Dívida Acumulada"], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    inicio = np.ones(len(div), dtype=bool)
+    inicio[1:] = id_vec[1:] != id_vec[:-1]
+    trecho = np.cumsum(inicio) - 1
+    min_trecho = pd.Series(div).groupby(trecho).min().to_numpy()
+    return div, trecho, min_trecho
+
+
+def _estatisticas_maximas(min_trecho: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Média/P25 das mínimas dos trechos encerrados, vistas de cada trecho: as estatísticas só
+    mudam na troca de ciclo, então são calculadas uma vez por trecho (não por linha).
+    """
+    media_trecho = np.zeros(len(min_trecho))
+    p25_trecho = np.zeros(len(min_trecho))
+    for t in range(1, len(min_trecho)):
+        max_validas = min_trecho[:t][min_trecho[:t] < 0]
+        media = float(np.mean(max_validas)) if len(max_validas) else 0.0
+        media_trecho[t] = media
+        p25_trecho[t] = float(np.percentile(max_validas, 25)) if len(max_validas) >= 2 else media
+    return media_trecho, p25_trecho
+
+
+def maximas_dividas(df: pd.DataFrame) -> Tuple[float, float]:
+    """
+    (máxima dívida do período, média das máximas dívidas na última linha), sem arredondar —
+    os mesmos valores que calcular_maxima_media_e_posicao_relativa grava com 2 casas.
+    Para reescalar por contratos antes de arredondar uma única vez.
+    """
+    if df is None or df.empty:
+        return 0.0, 0.0
+    div, _, min_trecho = _dividas_por_trecho(df)
+    media_trecho, _ = _estatisticas_maximas(min_trecho)
+    return float(div.min()), float(media_trecho[-1])
+
+
 def calcular_maxima_media_e_posicao_relativa(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calcula por linha:
@@ -324,7 +369,7 @@ def calcular_maxima_media_e_posicao_relativa(df: pd.DataFrame) -> pd.DataFrame:
     Requer: 'Dívida Acumulada' e 'ID Dívida' ou 'ID Operação'.
     """
     if df is None or df.empty:
-        return df.copy()
+        return copia_rasa(df)
     if "Dívida Acumulada" not in df.columns:
         raise KeyError("Faltou 'Dívida Acumulada' (rode calcular_fluxo_estrategia antes).")
     if ("ID Dívida" not in df.columns) and ("ID Operação" not in df.columns):
@@ -336,45 +381,15 @@ def calcular_maxima_media_e_posicao_relativa(df: pd.DataFrame) -> pd.DataFrame:
         m = re.search(r"D(\d+)", str(v))
         return int(m.group(1)) if m else None
 
-    out = df.copy()
-    n = len(out)
-
-    id_raw = out["ID Dívida"] if "ID Dívida" in out.columns else out["ID Operação"]
-    id_vec = id_raw.astype(str).str.extract(r"D(\d+)", expand=False).fillna("0").astype(int).to_numpy()
-    div = pd.to_numeric(out["Dívida Acumulada"], errors="coerce").fillna(0.0).to_numpy()
-
-    col_max, col_mean, col_p25, col_pos = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
-
-    current_id = None
-    current_min = None
-    mins_encerrados: List[float] = []
-
-    for i in range(n):
-        d_id = int(id_vec[i])
-        v = float(div[i])
-
-        # troca de ciclo → fecha o anterior
-        if current_id is not None and d_id != current_id:
-            if current_min is not None:
-                mins_encerrados.append(current_min)
-            current_id = d_id
-            current_min = v
-        else:
-            if current_id is None:
-                current_id = d_id
-                current_min = v
-            else:
-                current_min = min(current_min, v)
-
-        max_validas = [x for x in mins_encerrados if x < 0]
-        media = float(np.mean(max_validas)) if max_validas else 0.0
-        p25 = float(np.percentile(max_validas, 25)) if len(max_validas) >= 2 else media
-        pos = (abs(v) / abs(p25)) if p25 else 0.0
+    out = copia_rasa(df)
+    div, trecho, min_trecho = _dividas_por_trecho(out)
+    col_max = pd.Series(div).groupby(trecho).cummin().to_numpy()
+    media_trecho, p25_trecho = _estatisticas_maximas(min_trecho)
 
-        col_max[i] = current_min if current_min is not None else 0.0
-        col_mean[i] = media
-        col_p25[i] = p25
-        col_pos[i] = pos
+    col_mean = media_trecho[trecho]
+    col_p25 = p25_trecho[trecho]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        col_pos = np.where(col_p25 != 0, np.abs(div) / np.abs(col_p25), 0.0)
 
     out["Máxima Dívida Acumulada"] = np.round(col_max, 2)
     out["Média das Máximas Dívidas"] = np.round(col_mean, 2)
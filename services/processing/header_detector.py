@@ -4,43 +4,59 @@ This module contains the logic for header detection and normalization.
 """
 import pandas as pd
 
-import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from .headers_helper import (
     CANONICAL_HEADERS,
-    VARIATIONS_NORM,
     CANON_NORM,
+    NORM_INDEX,
+    VARIATIONS_REGEX,
+    _REGEX_GRUPOS,
     norm,
     normalize_tokens,
-    similarity,
+    levenshtein,
 )
 
 def try_immediate_map(raw: Any) -> Dict[str, Any]:
     n = normalize_tokens(norm(raw))
     if not n:
         return {}
-    for c, cn in CANON_NORM:
-        if n == cn:
-            return {"canonical": c, "via": "exact"}
-    for c in CANONICAL_HEADERS:
-        for v in VARIATIONS_NORM[c]:
-            if isinstance(v, re.Pattern):
-                if re.fullmatch(v, n):
-                    return {"canonical": c, "via": "variation"}
-            elif v == n:
-                return {"canonical": c, "via": "variation"}
+    hit = NORM_INDEX.get(n)
+    if hit:
+        return {"canonical": hit[0], "via": hit[1]}
+    if VARIATIONS_REGEX is not None:
+        m = VARIATIONS_REGEX.fullmatch(n)
+        if m and m.lastgroup:
+            return {"canonical": _REGEX_GRUPOS[m.lastgroup], "via": "variation"}
     return {}
 
+@lru_cache(maxsize=4096)
+def _fuzzy_norm(n: str, threshold: float) -> Tuple[Optional[str], float]:
+    """Melhor canônico para `n` já normalizado; poda por limites de comprimento."""
+    best_c, best_s = None, 0.0
+    ln = len(n)
+    for c, cn in CANON_NORM:
+        lc = len(cn)
+        denom = max(ln, lc, 1)
+        # dist >= |ln - lc| → teto do score; se não bate threshold nem o melhor atual, pula
+        teto = 1 - abs(ln - lc) / denom
+        if teto < threshold or teto <= best_s:
+            continue
+        max_dist = int((1 - threshold) * denom + 1e-9)
+        dist = levenshtein(n, cn, max_dist=max_dist)
+        if dist > max_dist:
+            continue
+        s = 1 - dist / denom
+        if s > best_s:
+            best_c, best_s = c, s
+    return best_c, best_s
+
 def fuzzy_map_one(raw: Any, threshold: float = 0.78) -> Dict[str, Any]:
     n = normalize_tokens(norm(raw))
     if not n:
         return {}
-    best = {"score": 0.0}
-    for c, cn in CANON_NORM:
-        s = similarity(n, cn)
-        if s > best["score"]:
-            best = {"canonical": c, "score": s}
-    return best if best.get("score", 0.0) >= threshold else {}
+    c, score = _fuzzy_norm(n, float(threshold))
+    return {"canonical": c, "score": score} if c is not None and score >= threshold else {}
 
 def looks_like_trading_header(cells: List[Any]) -> Dict[str, float]:
     hits = 0
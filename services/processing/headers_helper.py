@@ -4,7 +4,8 @@ This module contains helper functions and data for header detection and normaliz
 """
 import re
 import unicodedata
-from typing import List, Dict, Union, Tuple
+from functools import lru_cache
+from typing import List, Dict, Optional, Union, Tuple
 
 CANONICAL_HEADERS = [
     'Ativo',
@@ -156,44 +157,59 @@ VARIATIONS: Dict[str, List[Union[str, re.Pattern]]] = {
     ],
 }
 
-def norm(s: object) -> str:
-    if s is None:
-        return ''
-    s = str(s)
+_RE_PARENS = re.compile(r'[().]')
+_RE_NAO_ALNUM = re.compile(r'[^a-z0-9% ]+')
+_RE_ESPACOS = re.compile(r'\s+')
+
+# Uma única alternação para todos os sinônimos de token (as substituições não se
+# sobrepõem, então uma passada equivale à sequência original de re.sub).
+_RE_TOKENS = re.compile(
+    r'\b(?:(?P<qtd>qtde?)|(?P<compra>compras?)|(?P<venda>vendas?)'
+    r'|(?P<operacao>operacao(?:oes|es)?)|(?P<pct>porcentagem|percentual))\b'
+)
+_TOKENS_MAP = {
+    'qtd': 'quantidade',
+    'compra': 'compra',
+    'venda': 'venda',
+    'operacao': 'operacao',
+    'pct': 'pct',
+}
+
+
+@lru_cache(maxsize=8192)
+def _norm_str(s: str) -> str:
     s = ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
     s = s.lower()
-    s = re.sub(r'[().]', ' ', s)
-    s = re.sub(r'[^a-z0-9% ]+', ' ', s)
-    s = re.sub(r'\s+', ' ', s)
+    s = _RE_PARENS.sub(' ', s)
+    s = _RE_NAO_ALNUM.sub(' ', s)
+    s = _RE_ESPACOS.sub(' ', s)
     return s.strip()
 
+def norm(s: object) -> str:
+    if s is None:
+        return ''
+    return _norm_str(str(s))
+
+@lru_cache(maxsize=8192)
 def normalize_tokens(s: str) -> str:
-    s = re.sub(r'\bqtde?\b', 'quantidade', s)
-    s = re.sub(r'\bqtd\b', 'quantidade', s)
-    s = re.sub(r'\bcompra(s)?\b', 'compra', s)
-    s = re.sub(r'\bvenda(s)?\b', 'venda', s)
-    s = re.sub(r'\bpreco\b', 'preco', s)
-    s = re.sub(r'\boperacao(oes|es)?\b', 'operacao', s)
-    
-    s = re.sub(r'\bintervalo\b', 'intervalo', s)
-    s = re.sub(r'\bmax\b', 'max', s)
-    s = re.sub(r'\bmedio\b', 'medio', s)
-    s = re.sub(r'\bporcentagem\b', 'pct', s)
-    s = re.sub(r'\bpercentual\b', 'pct', s)
-    return s
-
-def levenshtein(a: str, b: str) -> int:
+    return _RE_TOKENS.sub(lambda m: _TOKENS_MAP[m.lastgroup], s)
+
+def levenshtein(a: str, b: str, max_dist: Optional[int] = None) -> int:
+    """Distância de edição; com `max_dist`, para cedo e devolve max_dist + 1 quando excede."""
     m, n = len(a), len(b)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
+    if max_dist is not None and abs(m - n) > max_dist:
+        return max_dist + 1
+    prev = list(range(n + 1))
     for i in range(1, m + 1):
+        cur = [i] + [0] * n
+        ai = a[i - 1]
         for j in range(1, n + 1):
-            cost = 0 if a[i - 1] == b[j - 1] else 1
-            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + cost)
-    return dp[m][n]
+            cost = 0 if ai == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+        if max_dist is not None and min(cur) > max_dist:
+            return max_dist + 1
+        prev = cur
+    return prev[n]
 
 def similarity(a: str, b: str) -> float:
     if not a and not b:
@@ -207,3 +223,25 @@ VARIATIONS_NORM: Dict[str, List[Union[str, re.Pattern]]] = {
     c: [v if isinstance(v, re.Pattern) else normalize_tokens(norm(v)) for v in VARIATIONS[c]]
     for c in CANONICAL_HEADERS
 }
+
+# Índice pré-computado: token normalizado -> (canônico, via).
+# Prioridade igual à varredura antiga: nomes canônicos primeiro, depois variações na ordem.
+NORM_INDEX: Dict[str, Tuple[str, str]] = {}
+for _c, _cn in CANON_NORM:
+    NORM_INDEX.setdefault(_cn, (_c, "exact"))
+for _c in CANONICAL_HEADERS:
+    for _v in VARIATIONS_NORM[_c]:
+        if not isinstance(_v, re.Pattern):
+            NORM_INDEX.setdefault(_v, (_c, "variation"))
+
+# Variações em regex (se houver) viram uma única alternação com grupos nomeados.
+_REGEX_GRUPOS: Dict[str, str] = {}
+_partes: List[str] = []
+for _c in CANONICAL_HEADERS:
+    for _v in VARIATIONS_NORM[_c]:
+        if isinstance(_v, re.Pattern):
+            _g = f"v{len(_partes)}"
+            _REGEX_GRUPOS[_g] = _c
+            _partes.append(f"(?P<{_g}>{_v.pattern})")
+VARIATIONS_REGEX: Optional[re.Pattern] = re.compile("|".join(_partes)) if _partes else None
+
@@ -4,6 +4,10 @@ import logging
 import pandas as pd
 from typing import Iterable, Optional, Set, Dict, Any
 
+# Parser BR numérico compartilhado (fast path para colunas já numéricas)
+from services.utils.formatters import converter_numero_br as _to_num
+from services.utils.contexto import copia_rasa
+
 # Nomes canônicos que o pipeline usa desde o início
 COL_DT_ABERTURA   = "Abertura"
 COL_DT_FECHAMENTO = "Fechamento"
@@ -14,22 +18,6 @@ COL_RES_PCT       = "Res. Operação (%)"
 COL_PRECO_C       = "Preço Compra"
 COL_PRECO_V       = "Preço Venda"
 
-# --- Parser BR numérico (robusto, sem escalar %) ---
-def _to_num(s: pd.Series) -> pd.Series:
-    """
-    Converte strings BR em número:
-      - remove '%', não escala (mantém semântica atual)
-      - se houver vírgula decimal, remove pontos de milhar antes
-      - troca ',' -> '.'
-      - coerces inválidos para 0.0
-    """
-    st = s.astype(str).str.strip()
-    st = st.str.replace("%", "", regex=False)
-    has_comma = st.str.contains(",", regex=False)
-    st = st.mask(has_comma, st.str.replace(".", "", regex=False))
-    st = st.str.replace(",", ".", regex=False)
-    return pd.to_numeric(st, errors="coerce").fillna(0.0)
-
 # --- Definir índice temporal (sem excluir Fechamento, sem remover duplicadas) ---
 def definir_indice_e_datas(
     df: pd.DataFrame,
@@ -45,7 +33,7 @@ def definir_indice_e_datas(
       3) NÃO remove duplicadas (várias operações no mesmo instante são mantidas).
       4) Opcionalmente ordena pelo índice.
     """
-    out = df.copy()
+    out = copia_rasa(df)
 
     col_dt = None
     if prefer in out.columns:
@@ -104,7 +92,7 @@ def limpar_colunas_desnecessarias(
     drop_cols = [c for c in df.columns if c not in cols_keep]
     if drop_cols:
         logging.info("🧹 Limpando %d colunas desnecessárias.", len(drop_cols))
-        return df[cols_keep].copy()
+        return copia_rasa(df[cols_keep])
 
     return df
 
@@ -112,7 +100,8 @@ from typing import Tuple, Optional
 import pandas as pd
 import numpy as np
 # importa os parâmetros do ativo (como no teu arquivo original)
-from services.input.ativos import identificar_parametros_por_ativo, ParametrosAtivo
+from services.input.ativos import identificar_parametros_por_ativo, ParametrosAtivo, tabela_parametros_por_linha
+from services.utils.aliases import espelhar_aliases
 
 # nomes de origem que vêm do Profit/planilha
 COL_ATIVO     = "Ativo"
@@ -120,10 +109,6 @@ COL_QTD       = "Qtd Compra"
 COL_RES_REAL  = "Res. Operação"
 COL_RES_PCT   = "Res. Operação (%)"
 
-def _to_num(s: pd.Series) -> pd.Series:
-    # conversor simples BR: só troca vírgula por ponto e coerce
-    return pd.to_numeric(s.astype(str).str.replace(',', '.'), errors='coerce').fillna(0.0)
-
 def criar_colunas_operacoes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[ParametrosAtivo]]:
     """
     Cria as colunas canônicas 'antes da padronização' e retorna (df, params).
@@ -135,20 +120,20 @@ def criar_colunas_operacoes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[Pa
     - resultado_pontos_acumulado
     E cria espelhos legados para compat com o front/assign.
     """
-    out = df.copy()
+    out = copia_rasa(df)
 
     # canônicos a partir das colunas de origem
     if COL_QTD in out.columns:
         out["contratos_negociados"] = _to_num(out[COL_QTD])
-        out["Contratos Negociados"] = out["contratos_negociados"]
+        espelhar_aliases(out, ["Contratos Negociados"], sobrescrever=True)
 
     if COL_RES_REAL in out.columns:
         out["resultado_operacao_real_antes"] = _to_num(out[COL_RES_REAL])
-        out["Resultado da Operação em real antes da padronização"] = out["resultado_operacao_real_antes"]
+        espelhar_aliases(out, ["Resultado da Operação em real antes da padronização"], sobrescrever=True)
 
     if COL_RES_PCT in out.columns:
         out["deslocamento_antes"] = _to_num(out[COL_RES_PCT])
-        out["Deslocamento do ativo antes da padronização"] = out["deslocamento_antes"]
+        espelhar_aliases(out, ["Deslocamento do ativo antes da padronização"], sobrescrever=True)
 
     # requeridos para seguir com cálculo de taxas/rl
     req = {"contratos_negociados", "resultado_operacao_real_antes", "deslocamento_antes", COL_ATIVO}
@@ -165,8 +150,12 @@ def criar_colunas_operacoes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[Pa
         # default (como estava no código)
         params = ParametrosAtivo(1.0, 0.30, 1, 1.0, 1.0)
 
-    # taxas por operação (duas pontas * taxa * contratos)
-    taxas = (out["contratos_negociados"] * 2 * float(params.taxa)).round(2)
+    # taxas por operação (duas pontas * taxa * contratos), com a taxa do ativo de cada linha
+    if ativos_series.size:
+        taxa_linha = tabela_parametros_por_linha(out[COL_ATIVO])["taxa"]
+    else:
+        taxa_linha = float(params.taxa)
+    taxas = (out["contratos_negociados"] * 2 * taxa_linha).round(2)
     rl    = (out["resultado_operacao_real_antes"] - taxas).round(2)
 
     out["taxas_antes"] = taxas
@@ -174,11 +163,13 @@ def criar_colunas_operacoes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[Pa
     out["resultado_liquido_acumulado_antes"] = rl.cumsum().round(2)
     out["resultado_pontos_acumulado"] = out["deslocamento_antes"].cumsum().round(2)
 
-    # espelhos legados (nomes esperados pelo assign/painel)
-    out["Taxas antes da padronização"] = out["taxas_antes"]
-    out["Resultado líquido antes da padronização"] = out["resultado_liquido_antes"]
-    out["Resultado líquido Total Acumulado antes da padronização"] = out["resultado_liquido_acumulado_antes"]
-    out["Resultado Total Acumulado em pontos"] = out["resultado_pontos_acumulado"]
+    # espelhos legados (nomes esperados pelo assign/painel) — referências, sem cópia
+    espelhar_aliases(out, [
+        "Taxas antes da padronização",
+        "Resultado líquido antes da padronização",
+        "Resultado líquido Total Acumulado antes da padronização",
+        "Resultado Total Acumulado em pontos",
+    ], sobrescrever=True)
 
     return out, params
 
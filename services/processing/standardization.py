@@ -3,14 +3,24 @@
 from __future__ import annotations
 from typing import Optional, Tuple
 import numpy as np, pandas as pd
-from services.input.ativos import identificar_parametros_por_ativo, ParametrosAtivo
+from services.input.ativos import identificar_parametros_por_ativo, ParametrosAtivo, tabela_parametros_por_linha
+from services.utils.contexto import copia_rasa
+from services.utils.aliases import espelhar_aliases
 
 COL_PRECO_VENDA = "Preço Venda"
 COL_PRECO_COMPRA = "Preço Compra"
 COL_TICK_ORIGEM = "Deslocamento do ativo antes da padronização"
 
+_LEGADOS_PADRONIZACAO = (
+    "Resultado Simulado Padronizado Bruto",
+    "Resultado Simulado Padronizado Líquido",
+    "Resultado Simulado Padronizado Bruto Acumulado",
+    "Resultado Simulado Padronizado Líquido Acumulado",
+    "Taxas Acumuladas Padronização",
+)
+
 def validar_delta(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
+    out = copia_rasa(df)
     for c in (COL_PRECO_VENDA, COL_PRECO_COMPRA, COL_TICK_ORIGEM):
         if c not in out.columns: out[c] = np.nan
     venda  = pd.to_numeric(out[COL_PRECO_VENDA], errors="coerce")
@@ -31,41 +41,41 @@ identificar_diferenca_com_validacao = validar_delta
 
 def padronizar_estrategia(df: pd.DataFrame, contratos_usuario: Optional[int]=None
 ) -> Tuple[pd.DataFrame, Optional[ParametrosAtivo]]:
+    """
+    Padroniza por linha: cada operação usa os parâmetros do SEU ativo (relatórios mistos WIN/WDO).
+    `contratos_usuario` (se vier) vale para todas as linhas; senão, o padrão de cada ativo.
+    Retorna (df, params do ativo principal) por compatibilidade.
+    """
     if "Ativo" not in df.columns or df["Ativo"].dropna().empty:
         return df, None
     df = validar_delta(df)
     ativo = df["Ativo"].dropna().iloc[0]
     params = identificar_parametros_por_ativo(ativo)
-    contratos = int(contratos_usuario or params.contratos)
-    tick = float(getattr(params, "deslocamento_min", 0.0) or 0.0)
-    mult = float(params.multiplicador)
-    taxa_op = float(params.taxa) * 2.0 * contratos
 
-    delta = pd.to_numeric(df["delta_preco"], errors="coerce").fillna(0.0)
-    ticks = delta if tick <= 0 else np.rint(delta / tick)
+    tab = tabela_parametros_por_linha(df["Ativo"])
+    tick = tab["deslocamento_min"].to_numpy()
+    mult = tab["multiplicador"].to_numpy()
+    contratos = (np.full(len(df), float(int(contratos_usuario))) if contratos_usuario
+                 else tab["contratos"].to_numpy())
+    taxa_op = tab["taxa"].to_numpy() * 2.0 * contratos
+
+    delta = pd.to_numeric(df["delta_preco"], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ticks = np.where(tick > 0, np.rint(delta / np.where(tick > 0, tick, 1.0)), delta)
 
-    pl_bruto   = (ticks * mult * contratos).astype(float).round(2)
+    pl_bruto   = pd.Series(ticks * mult * contratos, index=df.index, dtype=float).round(2)
     pl_liquido = (pl_bruto - taxa_op).round(2)
 
     df["pl_bruto_padronizado"]   = pl_bruto
     df["pl_liquido_padronizado"] = pl_liquido
     df["pl_bruto_acumulado"]     = pl_bruto.cumsum()
     df["pl_liquido_acumulado"]   = pl_liquido.cumsum()
-    n = len(df)
-    df["custos_operacionais_acumulados"] = np.round(taxa_op * (np.arange(n)+1), 2)
+    df["custos_operacionais_acumulados"] = np.round(np.cumsum(taxa_op), 2)
     df["ativacao_automacao"] = True
 
     # --- ALIÁS / COLUNAS LEGADAS (compat com painel e assign_variables) ---
-    # espelha nomes novos -> nomes antigos esperados em outras partes do app
-    aliases = {
-        "Resultado Simulado Padronizado Bruto": "pl_bruto_padronizado",
-        "Resultado Simulado Padronizado Líquido": "pl_liquido_padronizado",
-        "Resultado Simulado Padronizado Bruto Acumulado": "pl_bruto_acumulado",
-        "Resultado Simulado Padronizado Líquido Acumulado": "pl_liquido_acumulado",
-        "Taxas Acumuladas Padronização": "custos_operacionais_acumulados",
-    }
-    for antigo, novo in aliases.items():
-        if novo in df.columns and antigo not in df.columns:
-            df[antigo] = df[novo]
+    # referências às colunas novas (registro em services.utils.aliases, sem duplicar arrays);
+    # sempre re-espelha: no recálculo de contratos as colunas legadas já existem
+    espelhar_aliases(df, _LEGADOS_PADRONIZACAO, sobrescrever=True)
 
     return df, params
@@ -5,13 +5,14 @@ from __future__ import annotations
 import json
 import os
 from contextlib import contextmanager
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import and_, create_engine, event, func, select
+from sqlalchemy.orm import Session, noload, sessionmaker
 
 # Ajuste o caminho dos modelos conforme seu projeto
-from models.strategy import Base, Strategy, Upload, StrategyUpload, Insight
+from models.strategy import Base, Strategy, Upload, StrategyUpload, Insight, ResultRun
 
 
 # --- DB setup ---------------------------------------------------------------
@@ -23,6 +24,21 @@ DATABASE_URL = f"sqlite:///{DB_PATH}"
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_con, _record) -> None:
+    """WAL (leituras não bloqueiam a escrita do upload) + pragmas por conexão."""
+    cur = dbapi_con.cursor()
+    try:
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")   # seguro em WAL; fsync só no checkpoint
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.execute("PRAGMA cache_size=-16000")    # ~16 MB
+        cur.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cur.close()
+
+
 Base.metadata.create_all(engine)
 
 
@@ -123,18 +139,103 @@ def register_upload(
 
 
 def update_upload_result_dir(upload_id: int, result_dir: str) -> Dict[str, Any]:
-    """Grava o diretório de resultados dessa execução no Upload (requer coluna result_dir)."""
+    """
+    Grava o diretório de resultados dessa execução no Upload (requer coluna result_dir)
+    e registra a execução concluída no índice result_runs.
+    """
     with get_session() as s:
         up: Upload = s.get(Upload, int(upload_id))
         if not up:
             return {}
-        setattr(up, "result_dir", result_dir)  # coluna TEXT/NULL no modelo Upload
+        up.result_dir = result_dir
         s.add(up)
+        _index_result_run(s, result_dir, owner=up.owner, upload_id=up.id)
         s.flush()
         s.refresh(up)
         return up.to_dict()
 
 
+# --- Índice de execuções -----------------------------------------------------
+def _index_result_run(
+    s: Session,
+    result_dir: str,
+    *,
+    owner: Optional[str] = None,
+    strategy_id: Optional[int] = None,
+    upload_id: Optional[int] = None,
+) -> ResultRun:
+    """Upsert por result_dir; sem strategy_id, usa a estratégia vinculada ao upload."""
+    if strategy_id is None and upload_id is not None:
+        strategy_id = (
+            s.query(StrategyUpload.strategy_id)
+            .filter(StrategyUpload.upload_id == int(upload_id))
+            .order_by(StrategyUpload.id.desc())
+            .limit(1)
+            .scalar()
+        )
+    run = s.query(ResultRun).filter(ResultRun.result_dir == str(result_dir)).one_or_none()
+    if run is None:
+        run = ResultRun(result_dir=str(result_dir))
+        s.add(run)
+    run.owner = owner or run.owner or "anonimo"
+    run.strategy_id = strategy_id if strategy_id is not None else run.strategy_id
+    run.upload_id = upload_id if upload_id is not None else run.upload_id
+    run.completed_at = datetime.utcnow()
+    return run
+
+
+def register_result_run(
+    result_dir: str,
+    *,
+    owner: Optional[str] = None,
+    strategy_id: Optional[int] = None,
+    upload_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Registra (ou renova) uma execução concluída no índice."""
+    with get_session() as s:
+        run = _index_result_run(s, result_dir, owner=owner, strategy_id=strategy_id, upload_id=upload_id)
+        s.flush()
+        return run.to_dict()
+
+
+def latest_result_dir(
+    *,
+    owner: Optional[str] = None,
+    strategy_id: Optional[int] = None,
+    upload_id: Optional[int] = None,
+) -> Optional[str]:
+    """Pasta da execução mais recente (filtros opcionais); uma consulta indexada, sem varrer disco."""
+    with get_session() as s:
+        q = s.query(ResultRun.result_dir)
+        if owner:
+            q = q.filter(ResultRun.owner == owner)
+        if strategy_id is not None:
+            q = q.filter(ResultRun.strategy_id == int(strategy_id))
+        if upload_id is not None:
+            q = q.filter(ResultRun.upload_id == int(upload_id))
+        return q.order_by(ResultRun.completed_at.desc(), ResultRun.id.desc()).limit(1).scalar()
+
+
+def list_result_runs(
+    *,
+    owner: Optional[str] = None,
+    strategy_id: Optional[int] = None,
+    upload_id: Optional[int] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """Execuções mais recentes primeiro (mesmos filtros de latest_result_dir)."""
+    with get_session() as s:
+        q = s.query(ResultRun)
+        if owner:
+            q = q.filter(ResultRun.owner == owner)
+        if strategy_id is not None:
+            q = q.filter(ResultRun.strategy_id == int(strategy_id))
+        if upload_id is not None:
+            q = q.filter(ResultRun.upload_id == int(upload_id))
+        rows = q.order_by(ResultRun.completed_at.desc(), ResultRun.id.desc()).limit(int(limit)).all()
+        return [r.to_dict() for r in rows]
+
+
 def get_upload(upload_id: int) -> Optional[Dict[str, Any]]:
     with get_session() as s:
         up = s.get(Upload, int(upload_id))
@@ -178,47 +279,106 @@ def attach_upload(strategy_id: int, upload_id: int) -> bool:
         return True
 
 
+def register_uploads_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Registra vários uploads de uma vez (uma transação por lote):
+    Upload + Strategy (criada se não vier strategy_id) + vínculo + result_dir.
+    Cada item: owner, filename, path, filetype, size_bytes, checksum,
+    e opcionalmente strategy_id, nome, ativo, status, result_dir.
+    """
+    out: List[Dict[str, Any]] = []
+    if not items:
+        return out
+    with get_session() as s:
+        pares = []
+        for it in items:
+            up = Upload(
+                owner=it.get("owner") or "anonimo",
+                filename=it["filename"],
+                path=it["path"],
+                filetype=it.get("filetype"),
+                size_bytes=it.get("size_bytes"),
+                checksum=it.get("checksum"),
+                result_dir=it.get("result_dir"),
+            )
+            s.add(up)
+
+            st = s.get(Strategy, int(it["strategy_id"])) if it.get("strategy_id") else None
+            if st is None:
+                st = Strategy(
+                    nome=it.get("nome") or it["filename"],
+                    ativo=it.get("ativo"),
+                    owner=it.get("owner") or "anonimo",
+                    status=it.get("status") or "draft",
+                )
+                s.add(st)
+            pares.append((st, up))
+
+        # um único flush gera todos os ids
+        s.flush()
+        for st, up in pares:
+            s.add(StrategyUpload(strategy_id=st.id, upload_id=up.id))
+            if up.result_dir:
+                s.add(ResultRun(result_dir=up.result_dir, owner=up.owner, strategy_id=st.id, upload_id=up.id))
+            out.append({"strategy": st.to_dict(), "upload": up.to_dict()})
+    return out
+
+
 # --- Cards / Dashboard -------------------------------------------------------
-def list_strategy_cards(owner: Optional[str] = None) -> List[Dict[str, Any]]:
+CARDS_POR_PAGINA = 24
+
+
+def list_strategy_cards(
+    owner: Optional[str] = None, *, limit: Optional[int] = None, offset: int = 0
+) -> List[Dict[str, Any]]:
     """
-    Retorna dados para os cards:
+    Retorna dados para os cards (mais recentes primeiro, paginável com limit/offset):
       - dados básicos da Strategy (to_dict)
       - uploads_count: total de uploads vinculados
       - last_upload: último upload (para filename, id, result_dir, etc.)
+    Uma única consulta: contagem e último upload vêm de funções de janela sobre
+    strategy_uploads; os relacionamentos (uploads/insights) não são carregados.
     """
     with get_session() as s:
-        q = s.query(Strategy)
+        vinculos = (
+            select(
+                StrategyUpload.strategy_id.label("strategy_id"),
+                StrategyUpload.upload_id.label("upload_id"),
+                func.count().over(partition_by=StrategyUpload.strategy_id).label("uploads_count"),
+                func.row_number().over(
+                    partition_by=StrategyUpload.strategy_id,
+                    order_by=(Upload.created_at.desc(), Upload.id.desc()),
+                ).label("ordem"),
+            )
+            .join(Upload, Upload.id == StrategyUpload.upload_id)
+            .join(Strategy, Strategy.id == StrategyUpload.strategy_id)
+        )
+        if owner:
+            vinculos = vinculos.where(Strategy.owner == owner)
+        vinculos = vinculos.subquery()
+
+        q = (
+            s.query(Strategy, vinculos.c.uploads_count, Upload)
+            .outerjoin(vinculos, and_(vinculos.c.strategy_id == Strategy.id, vinculos.c.ordem == 1))
+            .outerjoin(Upload, Upload.id == vinculos.c.upload_id)
+            .options(noload(Strategy.uploads), noload(Strategy.insights), noload(Upload.strategies))
+        )
         if owner:
             q = q.filter(Strategy.owner == owner)
-        rows = q.order_by(Strategy.created_at.desc()).all()
-
-        cards: List[Dict[str, Any]] = []
-        for st in rows:
-            # total de uploads via N-N
-            count = (
-                s.query(StrategyUpload)
-                .filter(StrategyUpload.strategy_id == st.id)
-                .count()
-            )
-
-            # último upload via JOIN (mais recente)
-            last_up = (
-                s.query(Upload)
-                .join(StrategyUpload, StrategyUpload.upload_id == Upload.id)
-                .filter(StrategyUpload.strategy_id == st.id)
-                .order_by(Upload.created_at.desc())
-                .first()
-            )
-
-            cards.append(
-                {
-                    **st.to_dict(),
-                    "uploads_count": count,
-                    "last_upload": last_up.to_dict() if last_up else None,
-                }
-            )
-
-        return cards
+        q = q.order_by(Strategy.created_at.desc(), Strategy.id.desc())
+        if limit is not None:
+            q = q.limit(max(0, int(limit)))
+        if offset:
+            q = q.offset(max(0, int(offset)))
+
+        return [
+            {
+                **st.to_dict(),
+                "uploads_count": int(count or 0),
+                "last_upload": last_up.to_dict() if last_up else None,
+            }
+            for st, count, last_up in q.all()
+        ]
 
 
 # --- Insights ---------------------------------------------------------------
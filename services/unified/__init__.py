@@ -3,5 +3,6 @@ __all__ = [
     "inputs",
     "backtest",
     "master",
+    "linhas",
 ]
 
@@ -2,22 +2,35 @@ from __future__ import annotations
 
 import os
 import pandas as pd
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from services.utils.file_io import carregar_json
+from services.utils.aliases import espelhar_aliases, nome_canonico
+from services.utils.artefatos import artefato_existe, carregar_dataframe
 
 
-def load_prebacktest(temp_path: str) -> pd.DataFrame:
-    """Load the prebacktest DataFrame saved with orient="split".
+def load_prebacktest(temp_path: str, colunas: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Load the prebacktest DataFrame from the artifact store (Arrow, or legacy split JSON).
 
-    Prefers namespaced path temp/backtest/prebacktest.json with fallback to temp/prebacktest.json
-    for backward compatibility.
+    `colunas` loads only those columns (e.g. the ones the backtest reads). Looks in temp/
+    first and falls back to the legacy namespaced temp/backtest/ copy of older runs.
     """
-    caminho_ns = os.path.join(temp_path, "backtest", "prebacktest.json")
-    caminho_root = os.path.join(temp_path, "prebacktest.json")
-    if os.path.exists(caminho_ns):
-        return pd.read_json(caminho_ns, orient="split")
-    return pd.read_json(caminho_root, orient="split")
+    if not artefato_existe(temp_path, "prebacktest"):
+        legado = os.path.join(temp_path, "backtest")
+        if artefato_existe(legado, "prebacktest"):
+            return carregar_dataframe(legado, "prebacktest", colunas)
+    return carregar_dataframe(temp_path, "prebacktest", colunas)
+
+
+def load_ultimo_resultado(temp_path: str, colunas: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Load the full pipeline DataFrame saved as the ultimo_resultado artifact.
+
+    Legacy JSON date columns come back as datetime; the legacy column aliases that are
+    not stored in the artifact are re-mirrored.
+    """
+    if colunas is not None:  # legados não são gravados: projeta pela canônica
+        colunas = list(dict.fromkeys(nome_canonico(c) for c in colunas))
+    return espelhar_aliases(carregar_dataframe(temp_path, "ultimo_resultado", colunas))
 
 
 def load_core_stats(temp_path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
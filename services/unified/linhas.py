@@ -0,0 +1,132 @@
+"""Row-level queries over the stored result frames (ultimo_resultado / prebacktest).
+
+Backs the paginated row API: time-range filter on the datetime index, column
+projection (legacy alias names accepted), optional downsampling (stride, or LTTB /
+min-max buckets from visual.reducao_series) and offset/limit paging. The full frame
+is read once from the artifact store and kept in the process-wide artifact cache
+(invalidated when the artifact is rewritten).
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.utils.aliases import nome_canonico
+from services.utils.artefatos import artefato_existe, caminho_artefato, carregar_dataframe, dataframe_para_split
+from services.utils.cache_artefatos import ler_com_cache
+
+ARTEFATOS_LINHAS = ("ultimo_resultado", "prebacktest")
+LIMITE_PADRAO = 1000
+LIMITE_MAXIMO = 10000
+
+
+def _base_do_artefato(temp_path: str, nome: str) -> str:
+    # prebacktest de execuções antigas ficava só em backtest/
+    if nome == "prebacktest" and not artefato_existe(temp_path, nome):
+        legado = os.path.join(temp_path, "backtest")
+        if artefato_existe(legado, nome):
+            return legado
+    return temp_path
+
+
+def frame_armazenado(temp_path: str, nome: str) -> pd.DataFrame:
+    """Full stored frame of the artifact (process-wide cache; treat as read-only)."""
+    if nome not in ARTEFATOS_LINHAS:
+        raise ValueError(f"Artefato sem API de linhas: {nome}")
+    base = _base_do_artefato(temp_path, nome)
+    caminho = caminho_artefato(base, nome)
+    if caminho is None:
+        raise FileNotFoundError(f"Artefato não encontrado: {os.path.join(temp_path, nome)}")
+    return ler_com_cache(caminho, lambda _: carregar_dataframe(base, nome), tipo="df")
+
+
+def _projetar(df: pd.DataFrame, colunas: Optional[Iterable[str]]) -> pd.DataFrame:
+    """Select `colunas` in the requested order; legacy alias names resolve to the canonical column."""
+    if not colunas:
+        return df
+    origem, saida = [], []
+    for c in colunas:
+        real = c if c in df.columns else nome_canonico(c)
+        if real in df.columns and c not in saida:
+            origem.append(real)
+            saida.append(c)
+    out = df[origem]
+    if origem != saida:
+        out = out.set_axis(saida, axis=1)
+    return out
+
+
+def _filtrar_periodo(df: pd.DataFrame, inicio: Optional[str], fim: Optional[str]) -> pd.DataFrame:
+    if not inicio and not fim:
+        return df
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("Artefato sem índice de data/hora: filtro por período indisponível.")
+    ini = pd.Timestamp(inicio) if inicio else None
+    fi = pd.Timestamp(fim) if fim else None
+    if df.index.is_monotonic_increasing:  # busca binária, sem máscara sobre tudo
+        a = df.index.searchsorted(ini, side="left") if ini is not None else 0
+        b = df.index.searchsorted(fi, side="right") if fi is not None else len(df)
+        return df.iloc[a:b]
+    mask = np.ones(len(df), dtype=bool)
+    if ini is not None:
+        mask &= df.index >= ini
+    if fi is not None:
+        mask &= df.index <= fi
+    return df[mask]
+
+
+METODOS_REDUCAO = ("passo", "lttb", "minmax")
+
+
+def reduzir_pontos(df: pd.DataFrame, max_pontos: int, metodo: str = "passo") -> pd.DataFrame:
+    """Downsample to ~`max_pontos` rows (keeps the first and last row).
+
+    "passo" is a uniform stride; "lttb"/"minmax" (visual.reducao_series) follow the first
+    numeric column and also keep its global extremes.
+    """
+    if metodo not in METODOS_REDUCAO:
+        raise ValueError(f"metodo inválido: {metodo} (use {', '.join(METODOS_REDUCAO)})")
+    if max_pontos <= 0 or len(df) <= max_pontos:
+        return df
+    numericas = df.select_dtypes("number").columns
+    if metodo == "passo" or len(numericas) == 0:
+        idx = np.unique(np.linspace(0, len(df) - 1, num=max_pontos).round().astype(np.int64))
+    else:
+        from visual.reducao_series import indices_reduzidos
+        idx = indices_reduzidos(df.index, df[numericas[0]], max_pontos, metodo)
+    return df.iloc[idx]
+
+
+def consultar_linhas(
+    temp_path: str,
+    nome: str,
+    *,
+    offset: int = 0,
+    limit: int = LIMITE_PADRAO,
+    inicio: Optional[str] = None,
+    fim: Optional[str] = None,
+    colunas: Optional[Iterable[str]] = None,
+    max_pontos: Optional[int] = None,
+    metodo: str = "passo",
+) -> Dict[str, Any]:
+    """One page of rows: period filter → columns → downsampling (max_pontos) → offset/limit.
+
+    Returns the orient="split" payload plus total/offset/limit.
+    """
+    if offset < 0 or limit <= 0:
+        raise ValueError("offset deve ser >= 0 e limit > 0.")
+    limit = min(limit, LIMITE_MAXIMO)
+
+    df = _filtrar_periodo(frame_armazenado(temp_path, nome), inicio, fim)
+    df = _projetar(df, colunas)
+    if max_pontos:
+        df = reduzir_pontos(df, int(max_pontos), metodo)
+
+    total = len(df)
+    pagina = df.iloc[offset:offset + limit]
+    payload = dataframe_para_split(pagina)
+    payload.update({"total": total, "offset": offset, "limit": limit})
+    return payload
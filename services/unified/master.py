@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+from services.logic.backtest import COLUNAS_BACKTEST
 from services.unified.inputs import load_prebacktest
 from services.unified.backtest import run_backtest
 
@@ -11,7 +12,7 @@ def run_all(params: Dict[str, Any], *, temp_path: str) -> Dict[str, Any]:
 
     Keeps existing logic untouched; adds only glue.
     """
-    df_pre = load_prebacktest(temp_path)
+    df_pre = load_prebacktest(temp_path, colunas=COLUNAS_BACKTEST)
 
     metricas_backtest, metricas_original, frase = run_backtest(
         df_pre, params, temp_path=temp_path
@@ -23,6 +23,7 @@ from .formatters import (
     ordenar_colunas,
     extrair_id_divida,
     # novas utilitárias de normalização
+    converter_numero_br,
     tratar_formatos_monetarios,
     corrigir_valores_numericos,
     normalizar_colunas_monetarias,
@@ -46,6 +47,40 @@ from .process_lock import (
     is_processing_locked,
 )
 
+from .dtypes import (
+    compactar_dtypes,
+    logar_relatorio_dtypes,
+)
+
+from .aliases import (
+    ALIASES_LEGADOS,
+    espelhar_aliases,
+    remover_aliases,
+    resolver_coluna,
+)
+
+from .contexto import (
+    ContextoPipeline,
+    ativar_copy_on_write,
+    copia_rasa,
+)
+
+from .serializacao import (
+    desserializar_json,
+    serializar_json,
+)
+
+from .artefatos import (
+    carregar_dataframe,
+    carregar_split,
+    salvar_dataframe,
+)
+
+from .cache_artefatos import (
+    cache_artefatos,
+    ler_com_cache,
+)
+
 
 __all__ = [
     # file_io
@@ -62,6 +97,7 @@ __all__ = [
     'excluir_colunas',
     'ordenar_colunas',
     'extrair_id_divida',
+    'converter_numero_br',
     'tratar_formatos_monetarios',
     'corrigir_valores_numericos',
     'normalizar_colunas_monetarias',
@@ -76,4 +112,26 @@ __all__ = [
     "create_processing_lock",
     "clear_processing_lock",
     "is_processing_locked",
+    # dtypes
+    "compactar_dtypes",
+    "logar_relatorio_dtypes",
+    # aliases de colunas legadas
+    "ALIASES_LEGADOS",
+    "espelhar_aliases",
+    "remover_aliases",
+    "resolver_coluna",
+    # contexto (sem cópias)
+    "ContextoPipeline",
+    "ativar_copy_on_write",
+    "copia_rasa",
+    # serialização JSON (orjson/stdlib)
+    "desserializar_json",
+    "serializar_json",
+    # store colunar de DataFrames
+    "carregar_dataframe",
+    "carregar_split",
+    "salvar_dataframe",
+    # cache LRU de artefatos (rotas da API)
+    "cache_artefatos",
+    "ler_com_cache",
 ]
@@ -0,0 +1,78 @@
+# services/utils/aliases.py
+"""
+PT:
+    Registro único de nomes legados de colunas (painel/assign/CSV) → nomes canônicos.
+
+    As colunas legadas não guardam arrays próprios: `espelhar_aliases` as cria como
+    referência à coluna canônica (com Copy-on-Write do pandas, sem copiar dados).
+    Na serialização, `remover_aliases` tira as duplicatas dos artefatos que não têm
+    contrato com nomes legados (ex.: ultimo_resultado.json); quem carrega esses artefatos
+    re-espelha na leitura. Exportações com contrato legado (CSV, prebacktest) continuam
+    emitindo os nomes antigos.
+
+EN:
+    Single registry of legacy column names → canonical names, resolved at read/export time.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import pandas as pd
+
+# legado → canônico
+ALIASES_LEGADOS = {
+    # pré-padronização (criar_colunas_operacoes)
+    "Contratos Negociados": "contratos_negociados",
+    "Resultado da Operação em real antes da padronização": "resultado_operacao_real_antes",
+    "Deslocamento do ativo antes da padronização": "deslocamento_antes",
+    "Taxas antes da padronização": "taxas_antes",
+    "Resultado líquido antes da padronização": "resultado_liquido_antes",
+    "Resultado líquido Total Acumulado antes da padronização": "resultado_liquido_acumulado_antes",
+    "Resultado Total Acumulado em pontos": "resultado_pontos_acumulado",
+    # padronização (padronizar_estrategia)
+    "Resultado Simulado Padronizado Bruto": "pl_bruto_padronizado",
+    "Resultado Simulado Padronizado Líquido": "pl_liquido_padronizado",
+    "Resultado Simulado Padronizado Bruto Acumulado": "pl_bruto_acumulado",
+    "Resultado Simulado Padronizado Líquido Acumulado": "pl_liquido_acumulado",
+    "Taxas Acumuladas Padronização": "custos_operacionais_acumulados",
+}
+
+CANONICOS = {v: k for k, v in ALIASES_LEGADOS.items()}
+
+
+def nome_canonico(nome: str) -> str:
+    return ALIASES_LEGADOS.get(nome, nome)
+
+
+def resolver_coluna(df: pd.DataFrame, nome: str) -> Optional[pd.Series]:
+    """Série pelo nome pedido (legado ou canônico), resolvendo pelo registro; None se ausente."""
+    if nome in df.columns:
+        return df[nome]
+    alt = ALIASES_LEGADOS.get(nome) or CANONICOS.get(nome)
+    if alt is not None and alt in df.columns:
+        return df[alt]
+    return None
+
+
+def espelhar_aliases(
+    df: pd.DataFrame,
+    legados: Optional[Iterable[str]] = None,
+    sobrescrever: bool = False,
+) -> pd.DataFrame:
+    """
+    IN-PLACE: cria as colunas legadas (todas ou `legados`) apontando para a canônica.
+    `sobrescrever=True` re-aponta mesmo se a legada já existir (ex.: recálculo de contratos).
+    """
+    for legado in (legados if legados is not None else ALIASES_LEGADOS):
+        canonico = ALIASES_LEGADOS.get(legado)
+        if canonico is None or canonico not in df.columns:
+            continue
+        if sobrescrever or legado not in df.columns:
+            df[legado] = df[canonico]
+    return df
+
+
+def remover_aliases(df: pd.DataFrame) -> pd.DataFrame:
+    """Visão do DF sem as colunas legadas cuja canônica está presente (para serializar)."""
+    drop = [leg for leg, can in ALIASES_LEGADOS.items() if leg in df.columns and can in df.columns]
+    return df.drop(columns=drop) if drop else df
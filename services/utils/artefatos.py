@@ -0,0 +1,360 @@
+# services/utils/artefatos.py
+"""
+PT:
+    Armazenamento colunar dos DataFrames do pipeline (ultimo_resultado, prebacktest,
+    resultado_backtest).
+
+    - Com pyarrow: grava Arrow IPC (Feather v2, sem compressão) em `<nome>.arrow`.
+      A leitura é memory-mapped e projeta só as colunas pedidas (o backtest lê ~12 colunas
+      em vez do DF inteiro em texto).
+    - Sem pyarrow (ou se a conversão falhar): grava `<nome>.json` orient="split" (formato
+      antigo); a leitura desse formato continua suportada para pastas antigas.
+
+    O formato JSON "split" só é gerado sob demanda para quem o expõe ao front
+    (`dataframe_para_split`).
+
+    `EscritorArtefatos` grava cada artefato de uma pasta de resultados uma única vez
+    (atômico, deduplicado por hash, espelhos por hardlink) e mantém o `manifest.json`.
+
+EN:
+    Columnar artifact store (Arrow IPC, memory-mapped reads with column projection) with
+    orient="split" JSON as fallback/legacy format, plus a write-once manifest writer.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from services.utils.cache_artefatos import ler_com_cache
+from services.utils.serializacao import serializar_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    _HAS_PYARROW = True
+except ImportError:  # dependência opcional
+    pa = feather = None
+    _HAS_PYARROW = False
+
+EXT_ARROW = ".arrow"
+EXT_JSON = ".json"
+
+# colunas de data que o orient="split" devolve como epoch (ms)
+_DATE_COLS = ("Abertura", "Fechamento", "Data Abertura", "Data Fechamento")
+
+
+def caminho_artefato(temp_path: str, nome: str) -> Optional[str]:
+    """Caminho existente do artefato `nome` (Arrow preferido a JSON); None se ausente."""
+    if _HAS_PYARROW:
+        p = os.path.join(temp_path, nome + EXT_ARROW)
+        if os.path.exists(p):
+            return p
+    p = os.path.join(temp_path, nome + EXT_JSON)
+    return p if os.path.exists(p) else None
+
+
+def artefato_existe(temp_path: str, nome: str) -> bool:
+    return caminho_artefato(temp_path, nome) is not None
+
+
+def _remover(caminho: str) -> None:
+    try:
+        os.remove(caminho)
+    except FileNotFoundError:
+        pass
+
+
+def _tmp(caminho: str) -> str:
+    return f"{caminho}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+
+def gravar_atomico(caminho: str, dados: bytes) -> None:
+    """Grava em arquivo temporário na mesma pasta e troca com os.replace (leitor nunca vê meio arquivo)."""
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    tmp = _tmp(caminho)
+    try:
+        with open(tmp, "wb") as f:
+            f.write(dados)
+        os.replace(tmp, caminho)
+    finally:
+        _remover(tmp)
+
+
+def salvar_dataframe(df: pd.DataFrame, temp_path: str, nome: str) -> str:
+    """
+    Grava (atomicamente) o DF como `<nome>.arrow` (pyarrow) ou `<nome>.json` split (fallback).
+    Remove a versão no outro formato para não deixar artefato velho. Retorna o caminho.
+    """
+    os.makedirs(temp_path or ".", exist_ok=True)
+    caminho_arrow = os.path.join(temp_path, nome + EXT_ARROW)
+    caminho_json = os.path.join(temp_path, nome + EXT_JSON)
+
+    if _HAS_PYARROW:
+        tmp = _tmp(caminho_arrow)
+        try:
+            tabela = pa.Table.from_pandas(df, preserve_index=True)
+            feather.write_feather(tabela, tmp, compression="uncompressed")
+            os.replace(tmp, caminho_arrow)
+            _remover(caminho_json)
+            return caminho_arrow
+        except Exception as e:  # ex.: coluna object com tipos mistos
+            logging.warning("⚠️ %s: Arrow indisponível (%s); gravando JSON split.", nome, e)
+            _remover(caminho_arrow)
+        finally:
+            _remover(tmp)
+
+    gravar_atomico(caminho_json, df.to_json(orient="split", force_ascii=False).encode("utf-8"))
+    return caminho_json
+
+
+def _colunas_indice(schema) -> list:
+    meta = schema.pandas_metadata or {}
+    return [c for c in meta.get("index_columns", []) if isinstance(c, str)]
+
+
+def _ler_arrow(caminho: str, colunas: Optional[Iterable[str]]) -> pd.DataFrame:
+    with pa.memory_map(caminho, "r") as fonte:
+        tabela = pa.ipc.open_file(fonte).read_all()
+        if colunas is not None:
+            existentes = set(tabela.column_names)
+            pedidas = [c for c in colunas if c in existentes]
+            tabela = tabela.select(pedidas + [c for c in _colunas_indice(tabela.schema) if c not in pedidas])
+        df = tabela.to_pandas()
+        # listas (ex.: Sequencia_Valores_*) voltam como ndarray → lista, como no JSON
+        for campo in tabela.schema:
+            if pa.types.is_list(campo.type) and campo.name in df.columns:
+                df[campo.name] = [v.tolist() if v is not None else v for v in df[campo.name]]
+    return df
+
+
+def _ler_json(caminho: str, colunas: Optional[Iterable[str]]) -> pd.DataFrame:
+    df = pd.read_json(caminho, orient="split")
+    if colunas is not None:
+        df = df[[c for c in colunas if c in df.columns]]
+    for c in _DATE_COLS:
+        if c in df.columns and pd.api.types.is_integer_dtype(df[c]):
+            df[c] = pd.to_datetime(df[c], unit="ms", errors="coerce")
+    return df
+
+
+def carregar_dataframe(
+    temp_path: str,
+    nome: str,
+    colunas: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Lê o artefato `nome`. `colunas` projeta só as colunas pedidas (ausentes são ignoradas).
+    Levanta FileNotFoundError se não houver nem `.arrow` nem `.json`.
+    """
+    caminho = caminho_artefato(temp_path, nome)
+    if caminho is None:
+        raise FileNotFoundError(f"Artefato não encontrado: {os.path.join(temp_path, nome)}")
+    colunas = list(colunas) if colunas is not None else None
+    if caminho.endswith(EXT_ARROW):
+        return _ler_arrow(caminho, colunas)
+    return _ler_json(caminho, colunas)
+
+
+def dataframe_para_split(df: pd.DataFrame) -> Dict[str, Any]:
+    """Payload no formato orient="split" (o mesmo que o JSON em disco tinha)."""
+    return json.loads(df.to_json(orient="split", force_ascii=False))
+
+
+def carregar_split(temp_path: str, nome: str, *, default=None) -> Any:
+    """
+    Artefato como dict orient="split" para respostas ao front; `default` se ausente.
+    Vem do cache do processo (services.utils.cache_artefatos): somente leitura.
+    """
+    caminho = caminho_artefato(temp_path, nome)
+    if caminho is None:
+        logging.warning("⚠️ Artefato ausente, usando default. Caminho: %s", os.path.join(temp_path, nome))
+        return default
+    return ler_com_cache(caminho, _ler_split, tipo="split")
+
+
+def _ler_split(caminho: str) -> Any:
+    if caminho.endswith(EXT_JSON):
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return dataframe_para_split(_ler_arrow(caminho, None))
+
+
+# ------------------------------------------------------------------------------
+# Escrita única com manifesto
+# ------------------------------------------------------------------------------
+
+MANIFESTO = "manifest.json"
+VERSAO_MANIFESTO = 1
+
+
+class TextoJSON(str):
+    """Texto JSON exatamente como gravado (validação lê isto em vez de reler o arquivo)."""
+
+
+def _hash(dados: bytes) -> str:
+    return hashlib.blake2b(dados, digest_size=16).hexdigest()
+
+
+class EscritorArtefatos:
+    """
+    Escritor dos artefatos de uma pasta de resultados.
+
+    - Cada artefato lógico é serializado uma vez e gravado atomicamente; se o hash bater
+      com o registrado no manifesto (e o arquivo existir), a gravação é pulada.
+    - Espelhos (ex.: drawdown/x.json, backtest/x.json) são hardlinks do arquivo da raiz;
+      se o sistema não permitir, ficam como alias no manifesto (leitores caem na raiz).
+    - `manifest.json` registra arquivo, hash, bytes, schema e espelhos de cada artefato.
+    - `novos` guarda {nome: TextoJSON | DataFrame} do que foi gravado nesta rodada.
+    - `validador(nome, dados)` (opcional) roda em memória antes da gravação atômica e só
+      para artefatos que mudaram (ex.: contracts.validacao.validar_payload).
+    """
+
+    def __init__(
+        self,
+        base_dir: str,
+        schemas: Optional[Dict[str, str]] = None,
+        validador: Optional[Callable[[str, Any], Any]] = None,
+    ):
+        self.base_dir = str(base_dir)
+        self.schemas = schemas or {}  # nome do arquivo → schema (ex.: "x.json" → "x.v1.json")
+        self.validador = validador
+        os.makedirs(self.base_dir, exist_ok=True)
+        self.manifesto = self._ler_manifesto()
+        self.novos: Dict[str, Any] = {}
+
+    # -------------------------- manifesto --------------------------
+    def _ler_manifesto(self) -> Dict[str, Any]:
+        caminho = os.path.join(self.base_dir, MANIFESTO)
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+            if dados.get("versao") == VERSAO_MANIFESTO:
+                dados.setdefault("artefatos", {})
+                dados.setdefault("aliases", {})
+                return dados
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning("⚠️ manifest.json ilegível em %s (%s); recriando.", self.base_dir, e)
+        return {"versao": VERSAO_MANIFESTO, "artefatos": {}, "aliases": {}}
+
+    def salvar_manifesto(self) -> None:
+        texto = json.dumps(self.manifesto, ensure_ascii=False, indent=2, sort_keys=True)
+        gravar_atomico(os.path.join(self.base_dir, MANIFESTO), texto.encode("utf-8"))
+
+    def _inalterado(self, nome: str, hash_: str) -> bool:
+        """
+        Mesmo hash no manifesto E arquivo intocado desde o registro (tamanho + mtime_ns):
+        uma escrita fora do escritor (ex.: salvar_json direto) não deixa o hash velho mandar pular.
+        """
+        reg = self.manifesto["artefatos"].get(nome)
+        if not reg or reg.get("hash") != hash_:
+            return False
+        try:
+            st = os.stat(os.path.join(self.base_dir, reg.get("arquivo", nome)))
+        except OSError:
+            return False
+        return st.st_size == reg.get("bytes") and st.st_mtime_ns == reg.get("mtime_ns")
+
+    def _registrar(self, nome: str, arquivo: str, hash_: str, n_bytes: int,
+                   schema: Optional[str], espelhos: Sequence[str], formato: str) -> None:
+        try:
+            mtime_ns = os.stat(os.path.join(self.base_dir, arquivo)).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        self.manifesto["artefatos"][nome] = {
+            "arquivo": arquivo,
+            "hash": hash_,
+            "bytes": int(n_bytes),
+            "mtime_ns": mtime_ns,
+            "schema": schema or self.schemas.get(os.path.basename(arquivo)),
+            "formato": formato,
+            "espelhos": list(espelhos),
+            "gravado_em": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    # -------------------------- espelhos --------------------------
+    def _espelhar(self, arquivo: str, espelhos: Sequence[str]) -> None:
+        origem = os.path.join(self.base_dir, arquivo)
+        for rel in espelhos:
+            destino = os.path.join(self.base_dir, rel)
+            try:
+                if os.path.exists(destino) and os.path.samefile(origem, destino):
+                    continue
+                os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+                tmp = _tmp(destino)
+                os.link(origem, tmp)
+                os.replace(tmp, destino)
+                self.manifesto["aliases"].pop(rel, None)
+            except OSError as e:
+                # sem hardlink (ex.: FS sem suporte): alias no manifesto, sem cópia velha no lugar
+                logging.info("ℹ️ Espelho %s como alias de %s (%s).", rel, arquivo, e)
+                _remover(destino)
+                self.manifesto["aliases"][rel] = arquivo
+
+    # -------------------------- gravação --------------------------
+    def gravar_bytes(
+        self,
+        nome: str,
+        conteudo: bytes,
+        *,
+        espelhos: Sequence[str] = (),
+        schema: Optional[str] = None,
+        dados: Any = None,
+    ) -> bool:
+        """
+        Grava JSON já serializado em `nome` (caminho relativo à pasta). Retorna se gravou.
+        `dados` é o objeto de origem (validado no lugar do texto, sem re-parse).
+        """
+        hash_ = _hash(conteudo)
+        gravou = not self._inalterado(nome, hash_)
+        if gravou:
+            if self.validador is not None:
+                self.validador(os.path.basename(nome), conteudo if dados is None else dados)
+            gravar_atomico(os.path.join(self.base_dir, nome), conteudo)
+            self.novos[nome] = TextoJSON(conteudo.decode("utf-8"))
+        self._registrar(nome, nome, hash_, len(conteudo), schema, espelhos, "json")
+        self._espelhar(nome, espelhos)
+        return gravou
+
+    def gravar_texto(self, nome: str, texto: str, **kwargs) -> bool:
+        """Texto JSON pronto (ex.: df.to_json)."""
+        return self.gravar_bytes(nome, texto.encode("utf-8"), **kwargs)
+
+    def gravar_json(self, nome: str, dados: Any, *, pretty: Optional[bool] = None, **kwargs) -> bool:
+        """Objeto Python → JSON compacto (NumPy/datas tratados pelo backend de serialização)."""
+        return self.gravar_bytes(nome, serializar_json(dados, pretty=pretty), dados=dados, **kwargs)
+
+    def gravar_binario(self, nome: str, conteudo: bytes, *, formato: str = "bin") -> bool:
+        """Artefato binário (sem validação JSON); mesmo pulo por hash e gravação atômica."""
+        hash_ = _hash(conteudo)
+        gravou = not self._inalterado(nome, hash_)
+        if gravou:
+            gravar_atomico(os.path.join(self.base_dir, nome), conteudo)
+            self.novos[nome] = conteudo
+        self._registrar(nome, nome, hash_, len(conteudo), None, (), formato)
+        return gravou
+
+    def gravar_dataframe(self, nome: str, df: pd.DataFrame, *, schema: Optional[str] = None) -> bool:
+        """DF no store colunar; pula a serialização se o conteúdo (hash) não mudou."""
+        from services.utils.pipeline_dag import hash_conteudo
+
+        hash_ = hash_conteudo(df)
+        if self._inalterado(nome, hash_):
+            return False
+        caminho = salvar_dataframe(df, self.base_dir, nome)
+        arquivo = os.path.basename(caminho)
+        formato = "arrow" if arquivo.endswith(EXT_ARROW) else "json-split"
+        self._registrar(nome, arquivo, hash_, os.path.getsize(caminho), schema, (), formato)
+        self.novos[nome] = df
+        return True
+
+    def arquivos(self) -> List[str]:
+        return sorted(r.get("arquivo", n) for n, r in self.manifesto["artefatos"].items())
@@ -0,0 +1,114 @@
+# services/utils/cache_artefatos.py
+"""
+PT:
+    Cache LRU em processo dos artefatos lidos pelas rotas da API (compartilhado por todas).
+
+    - Chave: (dispositivo, inode, mtime_ns, tamanho) do arquivo + tipo de leitura. A escrita
+      atômica (os.replace) troca inode/mtime, então uma nova gravação invalida sozinha;
+      espelhos por hardlink (drawdown/, backtest/) caem na mesma entrada da raiz.
+    - Limite em bytes (tamanho do arquivo em disco como custo aproximado):
+        INSIGHT_CACHE_ARTEFATOS_MB=128  (0 desliga)
+    - Objetos devolvidos são compartilhados entre requisições: trate como somente leitura
+      (copie antes de alterar).
+
+EN:
+    Bounded (by bytes) in-process LRU cache for parsed artifacts, keyed by file identity
+    and mtime so atomic rewrites invalidate entries; shared by every API route.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_LIMITE_ENV = "INSIGHT_CACHE_ARTEFATOS_MB"
+_LIMITE_PADRAO_MB = 128
+
+
+def _limite_bytes() -> int:
+    try:
+        return max(0, int(float(os.getenv(_LIMITE_ENV, _LIMITE_PADRAO_MB)) * 1024 * 1024))
+    except ValueError:
+        return _LIMITE_PADRAO_MB * 1024 * 1024
+
+
+class CacheArtefatos:
+    """LRU limitado por bytes; leitura fora do lock (duas leituras concorrentes são inofensivas)."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self._itens: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._por_caminho: Dict[Tuple[str, str], Tuple] = {}  # versão atual de cada arquivo
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, caminho: str, carregar: Callable[[str], Any], tipo: str = "json") -> Any:
+        """Retorna `carregar(caminho)` do cache se o arquivo não mudou. Levanta OSError se não existir."""
+        st = os.stat(caminho)
+        chave = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, tipo)
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return item[0]
+            self.faltas += 1
+
+        valor = carregar(caminho)
+        custo = int(st.st_size)
+        if custo > self.max_bytes:
+            return valor
+
+        ref = (os.path.realpath(caminho), tipo)
+        with self._lock:
+            antiga = self._por_caminho.get(ref)
+            if antiga is not None and antiga != chave:
+                self._descartar(antiga)
+            if chave not in self._itens:
+                self._itens[chave] = (valor, custo)
+                self._bytes += custo
+            self._por_caminho[ref] = chave
+            while self._bytes > self.max_bytes and self._itens:
+                self._descartar(next(iter(self._itens)))
+        return valor
+
+    def _descartar(self, chave: Tuple) -> None:
+        item = self._itens.pop(chave, None)
+        if item is not None:
+            self._bytes -= item[1]
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+            self._por_caminho.clear()
+            self._bytes = 0
+
+    def estatisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {"itens": len(self._itens), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "acertos": self.acertos, "faltas": self.faltas}
+
+
+_cache: Optional[CacheArtefatos] = None
+_cache_lock = threading.Lock()
+
+
+def cache_artefatos() -> Optional[CacheArtefatos]:
+    """Instância do processo (None se desligado via INSIGHT_CACHE_ARTEFATOS_MB=0)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheArtefatos(_limite_bytes())
+    return _cache if _cache.max_bytes > 0 else None
+
+
+def ler_com_cache(caminho: str, carregar: Callable[[str], Any], tipo: str = "json") -> Any:
+    """`carregar(caminho)` passando pelo cache do processo (direto se desligado)."""
+    cache = cache_artefatos()
+    if cache is None:
+        return carregar(caminho)
+    return cache.obter(caminho, carregar, tipo)
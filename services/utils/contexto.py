@@ -0,0 +1,142 @@
+# services/utils/contexto.py
+"""
+PT:
+    Contexto do pipeline sem cópias por etapa.
+
+    Regras de mutação (valem para todas as etapas do pipeline):
+      1) A etapa recebe o DF e devolve um DF NOVO criado com `copia_rasa(df)`:
+         o objeto é novo, mas as colunas existentes são as MESMAS arrays (sem duplicar).
+      2) A etapa só ACRESCENTA colunas ou SUBSTITUI colunas inteiras (`out[c] = ...`).
+         Escritas parciais (`out.loc[mask, c] = v`) são permitidas: com Copy-on-Write
+         o pandas copia só o bloco tocado, nunca a entrada de quem chamou.
+      3) Snapshots (cache do DAG, prebacktest) são `copia_rasa` — compartilham as colunas.
+
+    Copy-on-Write do pandas (`mode.copy_on_write`) é ligado uma vez na inicialização do app
+    (`create_app` → `ativar_copy_on_write`) e fica ligado; a opção é global do processo, então
+    não é alternada por requisição/thread. Sem ele (scripts/CLI), `copia_rasa` cai para cópia
+    profunda (comportamento antigo), então funções chamadas isoladamente continuam seguras.
+
+    Modo debug (INSIGHT_DEBUG_COPIAS=1 ou ContextoPipeline(debug=True)): por etapa, conta os
+    bytes de colunas pré-existentes que deixaram de compartilhar memória com a entrada
+    (copiados/reescritos) e os bytes de colunas novas.
+
+EN:
+    Copy-free pipeline context: shallow copies + pandas Copy-on-Write, append-only stages,
+    and an optional per-stage copied-bytes report.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_DEBUG_ENV = "INSIGHT_DEBUG_COPIAS"
+
+
+def ativar_copy_on_write() -> bool:
+    """Liga o Copy-on-Write do pandas (idempotente). Retorna se ficou ativo."""
+    try:
+        pd.set_option("mode.copy_on_write", True)
+        return True
+    except Exception as e:  # pandas sem a opção
+        logging.warning("Copy-on-Write indisponível nesta versão do pandas: %s", e)
+        return False
+
+
+def copy_on_write_ativo() -> bool:
+    try:
+        return bool(pd.get_option("mode.copy_on_write"))
+    except Exception:
+        return False
+
+
+def copia_rasa(df: pd.DataFrame) -> pd.DataFrame:
+    """Novo DataFrame compartilhando as colunas (CoW ativo); senão, cópia profunda."""
+    return df.copy(deep=not copy_on_write_ativo())
+
+
+# ------------------------------------------------------------------------------
+# Contagem de bytes copiados
+# ------------------------------------------------------------------------------
+
+def _buffer(s: pd.Series) -> Optional[np.ndarray]:
+    """Array que de fato guarda os dados da coluna (sem materializar)."""
+    arr = s.array
+    if isinstance(arr, pd.Categorical):
+        return arr.codes
+    for attr in ("_ndarray", "_data"):  # datetime/timedelta/string, masked (Int64/boolean)
+        dados = getattr(arr, attr, None)
+        if isinstance(dados, np.ndarray):
+            return dados
+    try:
+        return s.to_numpy(copy=False)
+    except Exception:
+        return None
+
+
+def medir_copias(antes: Optional[pd.DataFrame], depois: pd.DataFrame) -> Tuple[int, int]:
+    """
+    (bytes_copiados, bytes_novos) de `antes` → `depois`:
+      - copiados: colunas presentes nos dois cuja memória não é mais compartilhada;
+      - novos: colunas que só existem em `depois`.
+    """
+    copiados = novos = 0
+    cols_antes = set(antes.columns) if isinstance(antes, pd.DataFrame) else set()
+    for c in depois.columns:
+        b_dep = _buffer(depois[c])
+        if b_dep is None:
+            continue
+        if c not in cols_antes:
+            novos += b_dep.nbytes
+            continue
+        b_ant = _buffer(antes[c])
+        if b_ant is None or not np.shares_memory(b_ant, b_dep):
+            copiados += b_dep.nbytes
+    return copiados, novos
+
+
+class ContextoPipeline:
+    """
+    Dono do DF corrente do pipeline. `etapa(nome, func, df, ...)` executa a etapa,
+    guarda a saída como DF corrente e, em modo debug, registra bytes copiados/novos.
+    """
+
+    def __init__(self, debug: Optional[bool] = None):
+        if debug is None:
+            debug = os.getenv(_DEBUG_ENV, "").strip().lower() in ("1", "true", "sim", "yes")
+        self.debug = bool(debug)
+        self.df: Optional[pd.DataFrame] = None
+        self.relatorio: List[Dict[str, Any]] = []
+
+    def etapa(self, nome: str, func: Callable[..., Any], df: pd.DataFrame, *args, **kwargs) -> Any:
+        t0 = time.perf_counter()
+        saida = func(df, *args, **kwargs)
+        out = saida[0] if isinstance(saida, tuple) else saida
+        if isinstance(out, pd.DataFrame):
+            self.df = out
+            if self.debug:
+                copiados, novos = medir_copias(df, out)
+                registro = {
+                    "etapa": nome,
+                    "bytes_copiados": int(copiados),
+                    "bytes_novos": int(novos),
+                    "bytes_total": int(out.memory_usage(deep=False).sum()),
+                    "segundos": round(time.perf_counter() - t0, 4),
+                }
+                self.relatorio.append(registro)
+                logging.info(
+                    "📋 [%s] copiados %.1f KB | novos %.1f KB | DF %.1f KB",
+                    nome, copiados / 1024, novos / 1024, registro["bytes_total"] / 1024,
+                )
+        return saida
+
+    def snapshot(self) -> Optional[pd.DataFrame]:
+        """Cópia rasa do DF corrente (compartilha as colunas)."""
+        return None if self.df is None else copia_rasa(self.df)
+
+    def total_copiado(self) -> int:
+        return sum(r["bytes_copiados"] for r in self.relatorio)
@@ -0,0 +1,185 @@
+"""
+PT:
+Política de dtypes compactos para o DataFrame do pipeline.
+Aplicada após a ingestão e na saída de cada etapa para reduzir a memória por upload:
+- texto de baixa cardinalidade conhecido (COLUNAS_CATEGORICAS) → category
+- contagens e ids numéricos → int32
+- flags → boolean (nullable) quando vierem como object/float
+- colunas só de exibição → float32 (opcional)
+
+EN:
+Compact dtype policy for the pipeline DataFrame.
+Applied after ingestion and at each stage output to reduce per-upload memory.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.utils.aliases import ALIASES_LEGADOS, espelhar_aliases
+
+
+# Texto de baixa cardinalidade conhecido (sempre vira category). Só estas: colunas de texto
+# livre/ids são comparadas e concatenadas como str a jusante e não devem virar category.
+COLUNAS_CATEGORICAS = ("Ativo", "Lado")
+
+# Contagens / ids inteiros
+COLUNAS_INT32 = (
+    "contratos_negociados",
+    "Contratos Negociados",
+    "ID Ciclo",
+    "qtd_emprestimos_ciclo",
+    "qtd_amortizacoes_ciclo",
+    "qtd_lucros_ciclo",
+)
+
+# Flags
+COLUNAS_FLAG = (
+    "alerta_tick_invalido",
+    "ativacao_automacao",
+    "Alerta_Divergência_Diferença",
+    "Ativação Automação",
+)
+
+# Só exibição (nunca entram em somas/acumulados) → float32 opcional
+COLUNAS_EXIBICAO = (
+    "Res. Operação (%)",
+    "desvio_vs_tick",
+    "Posição Relativa Dívida",
+    "Posição Relativa Lucro",
+)
+
+# Auto-detecção de categóricas (opt-in, auto_categoricas=True): no máx. 50% de valores
+# distintos e até 256 categorias. IDs (D#E#, L#, ...) ficam de fora mesmo assim.
+_MAX_RATIO_CATEGORIA = 0.5
+_MAX_CATEGORIAS = 256
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def _bytes(df: pd.DataFrame) -> int:
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+
+def _baixa_cardinalidade(s: pd.Series) -> bool:
+    n = len(s)
+    if n == 0:
+        return False
+    try:
+        nunique = s.nunique(dropna=True)
+    except TypeError:
+        # células com listas/dicts (ex.: Sequencia_Valores_*) não são hasheáveis
+        return False
+    if nunique == 0 or nunique > _MAX_CATEGORIAS:
+        return False
+    if not s.dropna().map(type).eq(str).all():
+        return False
+    return (nunique / n) <= _MAX_RATIO_CATEGORIA
+
+
+def _para_int32(s: pd.Series) -> Optional[pd.Series]:
+    if s.dtype == np.int32:
+        return None
+    num = pd.to_numeric(s, errors="coerce")
+    if num.isna().any():
+        return None
+    if len(num) and (num.min() < _INT32_MIN or num.max() > _INT32_MAX):
+        return None
+    if not np.all(np.mod(num.to_numpy(dtype="float64"), 1) == 0):
+        return None
+    return num.astype(np.int32)
+
+
+def _para_flag(s: pd.Series) -> Optional[pd.Series]:
+    # bool numpy já ocupa 1 byte e não tem nulos → mantém
+    if s.dtype == bool or str(s.dtype) == "boolean":
+        return None
+    try:
+        return s.astype("boolean")
+    except (TypeError, ValueError):
+        return None
+
+
+def compactar_dtypes(
+    df: pd.DataFrame,
+    *,
+    float32_exibicao: bool = False,
+    categoricas: Iterable[str] = COLUNAS_CATEGORICAS,
+    auto_categoricas: bool = False,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    PT: Aplica a política de dtypes compactos IN-PLACE e retorna (df, relatorio).
+        O relatório traz bytes antes/depois, bytes economizados e as colunas convertidas.
+        Só `categoricas` viram category; a auto-detecção por cardinalidade é opt-in.
+    EN: Applies the compact dtype policy IN-PLACE and returns (df, report).
+    """
+    relatorio: Dict[str, Any] = {"bytes_antes": 0, "bytes_depois": 0, "bytes_economizados": 0, "convertidas": {}}
+    if df is None or not isinstance(df, pd.DataFrame) or df.empty:
+        return df, relatorio
+
+    antes = _bytes(df)
+    convertidas: Dict[str, str] = {}
+    fixas = set(categoricas)
+    # colunas legadas são referências à canônica: converte só a canônica e re-aponta
+    legados = [c for c in df.columns if ALIASES_LEGADOS.get(c) in df.columns]
+
+    for col in df.columns:
+        if col in legados:
+            continue
+        s = df[col]
+        if not isinstance(s, pd.Series):
+            # colunas duplicadas → ignora
+            continue
+        try:
+            novo = None
+            if col in COLUNAS_FLAG:
+                novo = _para_flag(s)
+            elif col in COLUNAS_INT32:
+                novo = _para_int32(s)
+            elif s.dtype == object and not isinstance(s.dtype, pd.CategoricalDtype):
+                if col in fixas or (auto_categoricas and not str(col).startswith("ID ") and _baixa_cardinalidade(s)):
+                    novo = s.astype("category")
+            elif float32_exibicao and col in COLUNAS_EXIBICAO and s.dtype == np.float64:
+                novo = s.astype(np.float32)
+
+            if novo is not None:
+                df[col] = novo
+                convertidas[str(col)] = str(novo.dtype)
+        except Exception as e:
+            logging.debug("dtype não compactado para '%s': %s", col, e)
+
+    if legados:
+        espelhar_aliases(df, legados, sobrescrever=True)
+        for col in legados:
+            canonico = ALIASES_LEGADOS[col]
+            if canonico in convertidas:
+                convertidas[str(col)] = convertidas[canonico]
+
+    depois = _bytes(df)
+    relatorio.update({
+        "bytes_antes": antes,
+        "bytes_depois": depois,
+        "bytes_economizados": antes - depois,
+        "convertidas": convertidas,
+    })
+    return df, relatorio
+
+
+def logar_relatorio_dtypes(relatorio: Dict[str, Any], etapa: str = "") -> None:
+    """PT: Loga o relatório de compactação. EN: Logs the compaction report."""
+    if not relatorio or not relatorio.get("bytes_antes"):
+        return
+    antes = relatorio["bytes_antes"]
+    economia = relatorio["bytes_economizados"]
+    pct = (economia / antes * 100.0) if antes else 0.0
+    logging.info(
+        "🧮 dtypes [%s]: %.1f KB → %.1f KB (−%.1f KB, %.1f%%) | %d coluna(s) convertida(s)",
+        etapa or "-", antes / 1024, relatorio["bytes_depois"] / 1024, economia / 1024, pct,
+        len(relatorio.get("convertidas", {})),
+    )
@@ -17,14 +17,15 @@ File I/O (JSON/CSV) and template/placeholder generation for Insight Futures.
 """
 
 from datetime import datetime
-import json
 import logging
 import os
 from typing import Any, Optional, List
 
 import pandas as pd
 
+from .cache_artefatos import ler_com_cache
 from .formatters import formatar_colunas_para_br
+from .serializacao import desserializar_json, serializar_json
 
 
 def arquivo_permitido(nome_arquivo: str, extensoes_validas: List[str]) -> bool:
@@ -32,20 +33,25 @@ def arquivo_permitido(nome_arquivo: str, extensoes_validas: List[str]) -> bool:
     return "." in nome_arquivo and nome_arquivo.rsplit(".", 1)[1].lower() in extensoes_validas
 
 
-def carregar_json(diretorio: str, nome_arquivo: str, *, raise_if_missing: bool = True, default=None):
+def _ler_json(caminho: str) -> Any:
+    with open(caminho, "rb") as f:
+        return desserializar_json(f.read())
+
+
+def carregar_json(diretorio: str, nome_arquivo: str, *, raise_if_missing: bool = True, default=None,
+                  cache: bool = True):
     """
     PT:
         Carrega um JSON a partir de (diretório, nome_arquivo).
         Quando raise_if_missing=False, retorna `default` se o arquivo não existir.
+        Com cache=True o objeto vem do cache do processo (invalidado por mtime/inode) e é
+        compartilhado: não altere o retorno.
 
     EN:
         Loads a JSON from (directory, file_name).
         When raise_if_missing=False, returns `default` if the file does not exist.
+        With cache=True the parsed object comes from the process-wide cache (read-only).
     """
-    import os
-    import json
-    import logging
-
     caminho = os.path.join(diretorio, nome_arquivo)
     if not os.path.exists(caminho):
         if raise_if_missing:
@@ -53,8 +59,9 @@ def carregar_json(diretorio: str, nome_arquivo: str, *, raise_if_missing: bool =
         logging.warning("⚠️ JSON ausente, usando default. Caminho: %s", caminho)
         return default
 
-    with open(caminho, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if cache:
+        return ler_com_cache(caminho, _ler_json)
+    return _ler_json(caminho)
 
 
 def salvar_resultados(
@@ -92,11 +99,14 @@ def salvar_resultados(
 
 
 
-def salvar_json(data: Any, caminho: str) -> None:
-    """PT/EN: Salva dados como JSON no caminho informado."""
+def salvar_json(data: Any, caminho: str, pretty: Optional[bool] = None) -> None:
+    """
+    PT: Salva dados como JSON (compacto; NumPy/datas tratados pelo backend). `pretty=True` indenta.
+    EN: Saves data as compact JSON (NumPy/datetimes handled by the backend). `pretty=True` indents.
+    """
     os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
-    with open(caminho, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(caminho, "wb") as f:
+        f.write(serializar_json(data, pretty=pretty))
 
 
 def salvar_json_com_timestamp(data: Any, base_path: str, nome_base: str) -> None:
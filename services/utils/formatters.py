@@ -144,6 +144,35 @@ def converter_lista_json_serializavel(lista: List[Dict[str, Any]]) -> List[Dict[
 # Normalização monetária / numérica
 # -----------------------
 
+def converter_numero_br(s: pd.Series, fill_value: Optional[float] = 0.0) -> pd.Series:
+    """
+    PT: Converte uma série para número aceitando formatos BR ("1.234,56", "12,5%").
+        Fast path: se o dtype já for numérico (openpyxl/CSV), não faz nenhum trabalho de string;
+        object com números puros também não. Só strings passam pelo parser, vetorizado (.str):
+        remove '%' (sem escalar), remove pontos de milhar quando há vírgula e troca ',' → '.'.
+        Inválidos viram `fill_value` (None mantém NaN).
+    EN: Converts a series to float accepting BR formats. Numeric dtypes skip all string work;
+        only object columns are parsed, with vectorized .str operations.
+    """
+    if not isinstance(s, pd.Series):
+        s = pd.Series(s)
+
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        out = s
+    else:
+        try:
+            # object com int/float (ou strings já "limpas" tipo "120000")
+            out = pd.to_numeric(s, errors="raise")
+        except (ValueError, TypeError):
+            txt = s.astype(str).str.strip().str.replace("%", "", regex=False)
+            # vírgula decimal (BR): pontos são milhar; sem vírgula, o ponto já é decimal ("1.5")
+            br = txt.str.contains(",", regex=False)
+            txt = txt.mask(br, txt.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+            out = pd.to_numeric(txt, errors="coerce")
+
+    return out if fill_value is None else out.fillna(fill_value)
+
+
 def tratar_formatos_monetarios(df: pd.DataFrame, colunas_monetarias: List[str]) -> pd.DataFrame:
     """
     PT: Converte colunas monetárias BR/EN para float (ponto decimal).
@@ -152,17 +181,7 @@ def tratar_formatos_monetarios(df: pd.DataFrame, colunas_monetarias: List[str])
     corrigidas = []
     for col in colunas_monetarias or []:
         if col in df.columns:
-            exemplo = str(df[col].dropna().astype(str).iloc[0]) if df[col].dropna().shape[0] else ""
-            if "," in exemplo and "." in exemplo:
-                df[col] = (
-                    df[col].astype(str).str.strip()
-                    .str.replace(".", "x", regex=False)
-                    .str.replace(",", ".", regex=False)
-                    .str.replace("x", "", regex=False)
-                )
-            elif "," in exemplo:
-                df[col] = df[col].astype(str).str.replace(",", ".", regex=False)
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
+            df[col] = converter_numero_br(df[col])
             corrigidas.append(col)
     if corrigidas:
         logging.info("✅ Colunas monetárias corrigidas: %s", ", ".join(corrigidas))
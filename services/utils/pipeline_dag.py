@@ -0,0 +1,266 @@
+# services/utils/pipeline_dag.py
+"""
+PT:
+    Pipeline declarado como DAG de nós com cache por hash de conteúdo.
+
+    Cada nó declara de quais nós depende, quais parâmetros lê e (opcionalmente) quais
+    colunas dos DataFrames de entrada usa. A chave de cache do nó é o hash de:
+      - nome do nó + valores dos parâmetros declarados;
+      - para cada dependência: hash das colunas declaradas (+ índice) ou, sem declaração,
+        a identidade da saída inteira (chave do nó produtor / hash do conteúdo da entrada).
+    Se a chave não mudou desde a última execução, a saída em cache é reaproveitada.
+    `reter` limita quais nós guardam a saída entre execuções (os demais só vivem durante
+    a execução), para o cache não segurar todos os DataFrames intermediários.
+    Assim, trocar só `contratos_usuario` reexecuta da padronização em diante, e nós que
+    leem apenas colunas pré-padronização (ex.: resumo pré) nem rodam.
+
+    Nós independentes (todas as dependências prontas) rodam em paralelo num pool de threads.
+
+EN:
+    Pipeline declared as a DAG of nodes with content-hash caching and concurrent
+    execution of independent nodes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class No:
+    """
+    nome:    identificador do nó
+    funcao:  chamada como funcao(*saidas_das_dependencias, **params_declarados)
+    depende: nomes dos nós de entrada (na ordem dos argumentos)
+    params:  nomes dos parâmetros do pipeline lidos pelo nó
+    colunas: colunas usadas dos DataFrames de entrada (None = saída inteira)
+    cache:   False força reexecução sempre
+    """
+    nome: str
+    funcao: Callable[..., Any]
+    depende: Tuple[str, ...] = ()
+    params: Tuple[str, ...] = ()
+    colunas: Optional[Tuple[str, ...]] = None
+    cache: bool = True
+
+
+# ------------------------------------------------------------------------------
+# Hash de conteúdo
+# ------------------------------------------------------------------------------
+
+def _hash_bytes(*partes: bytes) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for p in partes:
+        h.update(p)
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _hash_serie(s: pd.Series) -> str:
+    try:
+        valores = pd.util.hash_pandas_object(s, index=False).to_numpy()
+    except TypeError:
+        # células não-hasháveis (ex.: listas em Sequencia_Valores_*)
+        valores = pd.util.hash_pandas_object(s.astype(str), index=False).to_numpy()
+    return _hash_bytes(str(s.name).encode(), str(s.dtype).encode(), valores.tobytes())
+
+
+def _hash_indice(idx: pd.Index) -> str:
+    return _hash_bytes(b"__index__", pd.util.hash_pandas_object(idx).to_numpy().tobytes())
+
+
+def hash_conteudo(obj: Any) -> str:
+    """Hash estável do conteúdo (DataFrame/Series/ndarray/JSON-like; fallback: repr)."""
+    if isinstance(obj, pd.DataFrame):
+        return _hash_bytes(_hash_indice(obj.index).encode(),
+                           *(_hash_serie(obj[c]).encode() for c in obj.columns))
+    if isinstance(obj, pd.Series):
+        return _hash_bytes(_hash_indice(obj.index).encode(), _hash_serie(obj).encode())
+    if isinstance(obj, np.ndarray):
+        return _hash_bytes(str(obj.dtype).encode(), obj.tobytes())
+    if isinstance(obj, dict) and any(isinstance(v, (pd.DataFrame, pd.Series, np.ndarray)) for v in obj.values()):
+        return _hash_bytes(*(f"{k}={hash_conteudo(v)}".encode() for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))))
+    try:
+        txt = json.dumps(obj, sort_keys=True, default=str, ensure_ascii=False)
+    except Exception:
+        txt = repr(obj)
+    return _hash_bytes(txt.encode("utf-8"))
+
+
+class _Saida:
+    """Saída de um nó + hashes preguiçosos (por coluna, índice e total)."""
+
+    __slots__ = ("valor", "chave", "_cols", "_idx", "_lock")
+
+    def __init__(self, valor: Any, chave: Optional[str] = None):
+        self.valor = valor
+        self.chave = chave  # identidade da saída inteira (chave do nó produtor)
+        self._cols: Dict[str, str] = {}
+        self._idx: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def identidade(self) -> str:
+        with self._lock:
+            if self.chave is None:
+                self.chave = hash_conteudo(self.valor)
+            return self.chave
+
+    def identidade_colunas(self, colunas: Sequence[str]) -> str:
+        df = self.valor
+        if not isinstance(df, pd.DataFrame):
+            return self.identidade()
+        with self._lock:
+            if self._idx is None:
+                self._idx = _hash_indice(df.index)
+            partes = [self._idx]
+            for c in colunas:
+                if c not in df.columns:
+                    partes.append(f"∅{c}")
+                    continue
+                if c not in self._cols:
+                    self._cols[c] = _hash_serie(df[c])
+                partes.append(self._cols[c])
+        return _hash_bytes(*(p.encode() for p in partes))
+
+
+# ------------------------------------------------------------------------------
+# DAG
+# ------------------------------------------------------------------------------
+
+@dataclass
+class PipelineDAG:
+    nos: Sequence[No]
+    max_workers: int = 4
+    reter: Optional[Tuple[str, ...]] = None  # nós com saída mantida entre execuções (None = todos)
+    _cache: Dict[str, Tuple[str, Any]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self._por_nome: Dict[str, No] = {}
+        for no in self.nos:
+            if no.nome in self._por_nome:
+                raise ValueError(f"Nó duplicado no pipeline: {no.nome}")
+            self._por_nome[no.nome] = no
+        for no in self.nos:
+            for d in no.depende:
+                if d not in self._por_nome:
+                    raise ValueError(f"Nó '{no.nome}' depende de '{d}', que não existe.")
+        # última execução: nome -> "cache" | "executado" | "entrada"
+        self.ultima_execucao: Dict[str, str] = {}
+
+    def adicionar(self, nos: Iterable[No]) -> "PipelineDAG":
+        """Devolve um novo DAG com nós extras, preservando o cache atual."""
+        novo = PipelineDAG(list(self.nos) + list(nos), max_workers=self.max_workers, reter=self.reter)
+        novo._cache = dict(self._cache)
+        return novo
+
+    def _fechamento(self, alvos: Iterable[str], entradas: Dict[str, Any]) -> List[str]:
+        """Nós necessários para os alvos (parando nas entradas fornecidas), em ordem topológica."""
+        visit: Dict[str, int] = {}
+        ordem: List[str] = []
+
+        def _dfs(nome: str):
+            estado = visit.get(nome)
+            if estado == 2:
+                return
+            if estado == 1:
+                raise ValueError(f"Ciclo no pipeline envolvendo '{nome}'.")
+            visit[nome] = 1
+            if nome not in entradas:
+                for d in self._por_nome[nome].depende:
+                    _dfs(d)
+            visit[nome] = 2
+            ordem.append(nome)
+
+        for a in alvos:
+            if a not in self._por_nome and a not in entradas:
+                raise KeyError(f"Nó desconhecido: {a}")
+            _dfs(a)
+        return ordem
+
+    def _chave(self, no: No, saidas: Dict[str, _Saida], params: Dict[str, Any]) -> str:
+        partes = [no.nome.encode()]
+        for p in no.params:
+            partes.append(f"{p}={hash_conteudo(params.get(p))}".encode())
+        for d in no.depende:
+            s = saidas[d]
+            ident = s.identidade_colunas(no.colunas) if no.colunas is not None else s.identidade()
+            partes.append(f"{d}:{ident}".encode())
+        return _hash_bytes(*partes)
+
+    def executar(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        alvos: Optional[Iterable[str]] = None,
+        entradas: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Executa os nós necessários para `alvos` (padrão: todos).
+        `entradas` fornece saídas prontas para nós (não executados; identidade = hash do conteúdo).
+        Retorna {nome: saída} de todos os nós envolvidos.
+        """
+        params = dict(params or {})
+        entradas = dict(entradas or {})
+        alvos = list(alvos) if alvos is not None else [n.nome for n in self.nos]
+        ordem = self._fechamento(alvos, entradas)
+
+        saidas: Dict[str, _Saida] = {n: _Saida(v) for n, v in entradas.items() if n in ordem}
+        self.ultima_execucao = {n: "entrada" for n in saidas}
+        pendentes = [n for n in ordem if n not in saidas]
+
+        def _rodar(no: No, chave: str):
+            t0 = time.perf_counter()
+            valor = no.funcao(*(saidas[d].valor for d in no.depende),
+                              **{p: params.get(p) for p in no.params})
+            return valor, time.perf_counter() - t0
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            em_voo: Dict[Any, Tuple[No, str]] = {}
+            while pendentes or em_voo:
+                # despacha tudo o que já tem as dependências prontas
+                prontos = [n for n in pendentes if all(d in saidas for d in self._por_nome[n].depende)]
+                for nome in prontos:
+                    pendentes.remove(nome)
+                    no = self._por_nome[nome]
+                    chave = self._chave(no, saidas, params)
+                    hit = self._cache.get(nome)
+                    if no.cache and hit is not None and hit[0] == chave:
+                        saidas[nome] = _Saida(hit[1], chave)
+                        self.ultima_execucao[nome] = "cache"
+                        continue
+                    em_voo[pool.submit(_rodar, no, chave)] = (no, chave)
+
+                if not em_voo:
+                    if pendentes and not prontos:
+                        raise RuntimeError(f"Pipeline travado; pendentes: {pendentes}")
+                    continue
+
+                feitos, _ = wait(list(em_voo), return_when=FIRST_COMPLETED)
+                for fut in feitos:
+                    no, chave = em_voo.pop(fut)
+                    valor, dt = fut.result()  # propaga a exceção do nó
+                    saidas[no.nome] = _Saida(valor, chave)
+                    if no.cache and (self.reter is None or no.nome in self.reter):
+                        self._cache[no.nome] = (chave, valor)
+                    self.ultima_execucao[no.nome] = "executado"
+                    logging.debug("🔧 nó %s executado em %.3fs", no.nome, dt)
+
+        reusados = [n for n, st in self.ultima_execucao.items() if st == "cache"]
+        if reusados:
+            logging.info("♻️ Pipeline: %d nó(s) reaproveitados do cache (%s)", len(reusados), ", ".join(reusados))
+        return {n: s.valor for n, s in saidas.items()}
+
+    def invalidar(self, *nomes: str) -> None:
+        """Descarta o cache dos nós indicados (todos se nenhum for passado)."""
+        if not nomes:
+            self._cache.clear()
+        for n in nomes:
+            self._cache.pop(n, None)
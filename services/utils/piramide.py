@@ -0,0 +1,192 @@
+# services/utils/piramide.py
+"""
+PT:
+    Pirâmide multirresolução das curvas do fluxo para gráficos com zoom.
+
+    - Para cada coluna (COLUNAS_PIRAMIDE) guarda a série bruta (nível 0) e, para cada
+      nível k ≥ 1, o mínimo e o máximo de cada bucket de 2**k linhas consecutivas.
+      Primeiro/último de um bucket são lidos direto da série bruta (índices fixos).
+    - Artefato binário compacto e determinístico (`piramide_fluxo.bin`): cabeçalho JSON +
+      arrays int64/float64 alinhados, lidos sem cópia (np.frombuffer) e mantidos no
+      cache do processo.
+    - `janela(coluna, inicio, fim, largura)` escolhe o nível em que a janela cabe em
+      ~largura buckets: custo O(largura) (+ as duas bordas exatas), independente do total.
+
+EN:
+    Precomputed min/max power-of-two bucket pyramid for the fluxo curves, stored as a
+    compact binary artifact; viewport queries run in O(width).
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.utils.aliases import CANONICOS, nome_canonico, resolver_coluna
+from services.utils.cache_artefatos import ler_com_cache
+
+ARQUIVO_PIRAMIDE = "piramide_fluxo.bin"
+COLUNAS_PIRAMIDE = ("Caixa Líquido", "Dívida Acumulada", "Lucro Acumulado")
+LARGURA_PADRAO = 1000
+LARGURA_MAXIMA = 10000
+
+_MAGICO = b"IFPIR1\n"
+_ALINHAMENTO = 8
+
+
+# ------------------------------------------------------------------------------
+# Construção
+# ------------------------------------------------------------------------------
+
+def _niveis(valores: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """[(min, max)] dos níveis 1..K (bucket de 2**k linhas); NaN ignorado (fmin/fmax)."""
+    niveis = []
+    mins = maxs = valores
+    while len(mins) > 1:
+        if len(mins) % 2:  # bucket final incompleto: repete o último valor
+            mins = np.append(mins, mins[-1])
+            maxs = np.append(maxs, maxs[-1])
+        mins = np.fmin(mins[0::2], mins[1::2])
+        maxs = np.fmax(maxs[0::2], maxs[1::2])
+        niveis.append((mins, maxs))
+    return niveis
+
+
+def construir_piramide(df: pd.DataFrame, colunas: Iterable[str] = COLUNAS_PIRAMIDE) -> Optional[bytes]:
+    """Bytes do artefato a partir do DF do fluxo (índice de data/hora); None sem colunas/índice."""
+    if not isinstance(df.index, pd.DatetimeIndex) or len(df) == 0:
+        return None
+    ordem = np.argsort(df.index.asi8, kind="stable")  # pirâmide segue a ordem temporal
+    arrays: Dict[str, np.ndarray] = {"t": df.index.asi8[ordem].astype("<i8")}
+    presentes = []
+    for col in colunas:
+        serie = resolver_coluna(df, col)
+        if serie is None:
+            continue
+        valores = pd.to_numeric(serie, errors="coerce")
+        tipo = "<i8" if pd.api.types.is_integer_dtype(valores) else "<f8"  # centavos/pontos ficam inteiros
+        bruto = valores.to_numpy(dtype=tipo)[ordem]
+        arrays[f"{col}|0"] = bruto
+        for k, (mins, maxs) in enumerate(_niveis(bruto), start=1):
+            arrays[f"{col}|{k}|min"] = mins
+            arrays[f"{col}|{k}|max"] = maxs
+        presentes.append(col)
+    if not presentes:
+        return None
+
+    indice, offset = [], 0
+    for nome, arr in arrays.items():
+        indice.append({"nome": nome, "dtype": arr.dtype.str, "offset": offset, "n": int(arr.size)})
+        offset += arr.nbytes
+    cabecalho = json.dumps({"n": len(df), "colunas": presentes, "arrays": indice},
+                           ensure_ascii=False, sort_keys=True).encode("utf-8")
+    inicio_dados = len(_MAGICO) + 4 + len(cabecalho)
+    pad = (-inicio_dados) % _ALINHAMENTO
+    partes = [_MAGICO, struct.pack("<I", len(cabecalho) + pad), cabecalho, b" " * pad]
+    partes.extend(arr.tobytes() for arr in arrays.values())
+    return b"".join(partes)
+
+
+# ------------------------------------------------------------------------------
+# Leitura / consulta
+# ------------------------------------------------------------------------------
+
+def _iso(ns: np.ndarray) -> List[str]:
+    return [s.replace("T", " ") for s in np.datetime_as_string(ns.astype("datetime64[ns]"), unit="s")]
+
+
+def _nan_para_none(valores: np.ndarray) -> List[Optional[float]]:
+    return [None if math.isnan(v) else v for v in valores.tolist()]
+
+
+class Piramide:
+    """Visão (sem cópia) sobre os bytes do artefato."""
+
+    def __init__(self, dados: bytes):
+        if not dados.startswith(_MAGICO):
+            raise ValueError("Arquivo não é uma pirâmide do Insight Futures.")
+        ini = len(_MAGICO)
+        (tam,) = struct.unpack_from("<I", dados, ini)
+        cab = json.loads(dados[ini + 4: ini + 4 + tam])
+        base = ini + 4 + tam
+        self.n = cab["n"]
+        self.colunas = cab["colunas"]
+        self._arrays = {
+            a["nome"]: np.frombuffer(dados, dtype=np.dtype(a["dtype"]), count=a["n"], offset=base + a["offset"])
+            for a in cab["arrays"]
+        }
+        self.t = self._arrays["t"]
+
+    def _coluna(self, coluna: str) -> str:
+        if coluna in self.colunas:
+            return coluna
+        for alt in (nome_canonico(coluna), CANONICOS.get(coluna)):
+            if alt in self.colunas:
+                return alt
+        raise KeyError(f"Coluna fora da pirâmide: {coluna} (disponíveis: {', '.join(self.colunas)})")
+
+    def janela(self, coluna: str, inicio: Optional[str] = None, fim: Optional[str] = None,
+               largura: int = LARGURA_PADRAO) -> Dict[str, Any]:
+        """
+        Buckets (t, t_fim, min, max, primeiro, ultimo) cobrindo [inicio, fim] em ~largura pontos.
+        Nível 0 (linhas brutas) quando a janela já cabe na largura.
+        """
+        coluna = self._coluna(coluna)
+        largura = max(1, min(int(largura), LARGURA_MAXIMA))
+        a = int(np.searchsorted(self.t, pd.Timestamp(inicio).value, side="left")) if inicio else 0
+        b = int(np.searchsorted(self.t, pd.Timestamp(fim).value, side="right")) if fim else self.n
+        bruto = self._arrays[f"{coluna}|0"]
+        linhas = max(0, b - a)
+
+        if linhas <= largura:
+            v = bruto[a:b]
+            t = _iso(self.t[a:b])
+            valores = _nan_para_none(v)
+            return {"coluna": coluna, "nivel": 0, "bucket": 1, "linhas": linhas, "t": t, "t_fim": t,
+                    "min": valores, "max": valores, "primeiro": valores, "ultimo": valores}
+
+        k = max(1, math.ceil(math.log2(linhas / largura)))
+        s = 1 << k
+        j0, j1 = a // s, (b - 1) // s  # buckets que tocam a janela
+        mins = self._arrays[f"{coluna}|{k}|min"][j0:j1 + 1].copy()
+        maxs = self._arrays[f"{coluna}|{k}|max"][j0:j1 + 1].copy()
+        # bordas exatas: buckets parciais recalculados só com as linhas dentro da janela
+        for pos, (lo, hi) in ((0, (a, min(b, (j0 + 1) * s))), (len(mins) - 1, (max(a, j1 * s), b))):
+            trecho = bruto[lo:hi]
+            trecho = trecho[~np.isnan(trecho)]
+            if len(trecho):
+                mins[pos], maxs[pos] = trecho.min(), trecho.max()
+
+        js = np.arange(j0, j1 + 1)
+        ini_linhas = np.maximum(js * s, a)
+        fim_linhas = np.minimum((js + 1) * s, b) - 1
+        return {
+            "coluna": coluna,
+            "nivel": k,
+            "bucket": s,
+            "linhas": linhas,
+            "t": _iso(self.t[ini_linhas]),
+            "t_fim": _iso(self.t[fim_linhas]),
+            "min": _nan_para_none(mins),
+            "max": _nan_para_none(maxs),
+            "primeiro": _nan_para_none(bruto[ini_linhas]),
+            "ultimo": _nan_para_none(bruto[fim_linhas]),
+        }
+
+
+def _ler_piramide(caminho: str) -> Piramide:
+    with open(caminho, "rb") as f:
+        return Piramide(f.read())
+
+
+def carregar_piramide(temp_path: str) -> Piramide:
+    """Pirâmide de temp_path (cache do processo). FileNotFoundError se não foi gerada."""
+    caminho = os.path.join(temp_path, ARQUIVO_PIRAMIDE)
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"Artefato não encontrado: {caminho}")
+    return ler_com_cache(caminho, _ler_piramide, tipo="piramide")
@@ -0,0 +1,89 @@
+# services/utils/serializacao.py
+"""
+PT:
+    Backend único de (de)serialização JSON dos artefatos.
+
+    - Com orjson: uma passada em Rust que já entende escalares/arrays NumPy e chaves não-str;
+      NaN/±inf viram null (JSON válido para o front).
+    - Sem orjson: json da stdlib com `default` para NumPy/datas (sem o passeio recursivo de
+      `converter_valores_json_serializaveis`); NaN segue o comportamento da stdlib.
+
+    Datas/horas viram `str(valor)` nos dois backends ("2024-01-02 09:30:00"), o mesmo
+    formato que os conversores antigos gravavam.
+
+    Saída compacta por padrão; `pretty=True` (ou INSIGHT_JSON_PRETTY=1) gera indentação
+    de 2 espaços para depuração.
+
+EN:
+    Single JSON backend for artifacts: orjson when available (native NumPy, NaN → null),
+    stdlib fallback with a `default` hook; compact by default, optional pretty output.
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime, time as dtime
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:  # dependência opcional
+    orjson = None
+    _HAS_ORJSON = False
+
+_PRETTY_ENV = "INSIGHT_JSON_PRETTY"
+
+
+def pretty_padrao() -> bool:
+    return os.getenv(_PRETTY_ENV, "").strip().lower() in ("1", "true", "sim", "yes")
+
+
+def _padrao(obj: Any) -> Any:
+    """Tipos que o backend não serializa sozinho (mesmas regras nos dois backends)."""
+    if isinstance(obj, (datetime, date, dtime, pd.Timedelta)):
+        return None if obj is pd.NaT else str(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (tuple, set, frozenset)):  # namedtuple (ex.: ParametrosAtivo) → lista
+        return list(obj)
+    if obj is pd.NA:
+        return None
+    if hasattr(obj, "model_dump"):  # pydantic v2
+        return obj.model_dump()
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+
+if _HAS_ORJSON:
+    _OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def serializar_json(obj: Any, pretty: Optional[bool] = None) -> bytes:
+    """Objeto → JSON UTF-8 (compacto; `pretty` indenta com 2 espaços)."""
+    if pretty is None:
+        pretty = pretty_padrao()
+    if _HAS_ORJSON:
+        return orjson.dumps(obj, default=_padrao, option=_OPTS | (orjson.OPT_INDENT_2 if pretty else 0))
+    if pretty:
+        texto = json.dumps(obj, ensure_ascii=False, indent=2, default=_padrao)
+    else:
+        texto = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_padrao)
+    return texto.encode("utf-8")
+
+
+def desserializar_json(dados: Union[bytes, str]) -> Any:
+    """JSON (bytes ou str) → objeto Python."""
+    if _HAS_ORJSON:
+        try:
+            return orjson.loads(dados)
+        except orjson.JSONDecodeError:
+            pass  # arquivos antigos com NaN/Infinity (json da stdlib aceita)
+    return json.loads(dados)
@@ -0,0 +1,66 @@
+# services/utils/tarefas.py
+"""
+PT:
+    Tarefas em segundo plano do processo web (fora do ciclo da requisição).
+
+    - Pool de threads pequeno e preguiçoso (INSIGHT_TAREFAS_WORKERS, padrão 1).
+    - `enfileirar(chave, fn, *args)`: a mesma chave não entra duas vezes enquanto está
+      pendente; exceções são logadas, nunca chegam à requisição.
+    - `pendente(chave)`: para a UI mostrar placeholder enquanto a tarefa não terminou.
+
+EN:
+    Small in-process background job runner (deduplicated by key, errors logged).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pendentes: Dict[str, Future] = {}
+_lock = threading.Lock()
+
+
+def _workers() -> int:
+    try:
+        return max(1, int(os.getenv("INSIGHT_TAREFAS_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="insight-tarefa")
+    return _pool
+
+
+def _rodar(chave: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logging.exception("Falha na tarefa em segundo plano %s", chave)
+        return None
+    finally:
+        with _lock:
+            _pendentes.pop(chave, None)
+
+
+def enfileirar(chave: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """Agenda fn(*args, **kwargs); se `chave` já está pendente, devolve a tarefa existente."""
+    with _lock:
+        atual = _pendentes.get(chave)
+        if atual is not None:
+            return atual
+        # _rodar só remove a chave depois de obter o lock: o registro abaixo vem antes
+        futuro = _executor().submit(_rodar, chave, fn, args, kwargs)
+        _pendentes[chave] = futuro
+        return futuro
+
+
+def pendente(chave: str) -> bool:
+    with _lock:
+        return chave in _pendentes
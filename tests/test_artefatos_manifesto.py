@@ -0,0 +1,39 @@
+# tests/test_artefatos_manifesto.py
+"""Pulo por hash do EscritorArtefatos não pode confiar num manifesto velho."""
+import json
+import os
+
+from services.utils.artefatos import EscritorArtefatos
+from services.utils.file_io import salvar_json
+
+ESPELHO = "backtest/metricas_backtest.json"
+
+
+def _ler(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_escrita_fora_do_escritor_invalida_o_pulo(tmp_path):
+    escritor = EscritorArtefatos(str(tmp_path))
+    assert escritor.gravar_json("metricas_backtest.json", {"a": 1}, espelhos=(ESPELHO,))
+    escritor.salvar_manifesto()
+
+    # escrita direta (sem manifesto), mesmo tamanho de arquivo
+    salvar_json({"a": 2}, os.path.join(tmp_path, "metricas_backtest.json"))
+
+    escritor = EscritorArtefatos(str(tmp_path))
+    assert escritor.gravar_json("metricas_backtest.json", {"a": 1}, espelhos=(ESPELHO,))
+    escritor.salvar_manifesto()
+
+    assert _ler(tmp_path / "metricas_backtest.json") == {"a": 1}
+    assert _ler(tmp_path / ESPELHO) == {"a": 1}
+
+
+def test_conteudo_igual_continua_pulando(tmp_path):
+    escritor = EscritorArtefatos(str(tmp_path))
+    assert escritor.gravar_json("metricas_backtest.json", {"a": 1}, espelhos=(ESPELHO,))
+    escritor.salvar_manifesto()
+
+    escritor = EscritorArtefatos(str(tmp_path))
+    assert not escritor.gravar_json("metricas_backtest.json", {"a": 1}, espelhos=(ESPELHO,))
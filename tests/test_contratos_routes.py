@@ -0,0 +1,84 @@
+# tests/test_contratos_routes.py
+"""Rotas de contratos com o store colunar em Arrow (ultimo_resultado.arrow, sem .json)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.core.orchestrator import InsightFutures  # noqa: E402
+from app.webserver import create_app  # noqa: E402
+
+
+def _relatorio(caminho, n=80):
+    """Relatório no formato do Profit (capa + cabeçalho), um único ativo."""
+    rng = np.random.default_rng(0)
+    t0 = pd.Timestamp("2024-01-02 09:30")
+    linhas = []
+    for i in range(n):
+        ab = t0 + pd.Timedelta(minutes=487 * i)
+        fe = ab + pd.Timedelta(minutes=12)
+        d = 5.0 * int(rng.integers(-30, 50))
+        linhas.append(["WINM24", ab.strftime("%d/%m/%Y %H:%M:%S"), fe.strftime("%d/%m/%Y %H:%M:%S"),
+                       1, 1, "C", 120000.0, 120000.0 + d, d * 0.2, d])
+    colunas = ["Ativo", "Abertura", "Fechamento", "Qtd Compra", "Qtd Venda", "Lado",
+               "Preço Compra", "Preço Venda", "Res. Operação", "Res. Operação (%)"]
+    capa = [["Relatório"] + [""] * 9, ["Conta: X"] + [""] * 9] + [[""] * 10] * 3
+    pd.DataFrame(capa + [colunas] + linhas).to_excel(caminho, header=False, index=False)
+
+
+@pytest.fixture(scope="module")
+def resultado(tmp_path_factory):
+    base = tmp_path_factory.mktemp("contratos")
+    planilha = base / "ops.xlsx"
+    _relatorio(planilha)
+    temp_path = base / "resultado"
+    InsightFutures(str(planilha), temp_path=str(temp_path), exportar_csv=False)
+    return planilha, temp_path
+
+
+@pytest.fixture
+def client(resultado):
+    planilha, temp_path = resultado
+    c = create_app().test_client()
+    with c.session_transaction() as s:
+        s["user"] = "teste"
+        s["temp_path"] = str(temp_path)
+        s["filepath"] = str(planilha)
+    return c
+
+
+def test_artefato_em_arrow(resultado):
+    _, temp_path = resultado
+    assert (temp_path / "ultimo_resultado.arrow").exists()
+    assert not (temp_path / "ultimo_resultado.json").exists()
+
+
+def test_curva_contratos(client):
+    r = client.post("/curva_contratos", json={"max": 3})
+    assert r.status_code == 200
+    corpo = r.get_json()
+    assert corpo["status"] == "ok"
+    assert corpo["curva"]["contratos"] == [1, 2, 3]
+
+
+def test_curva_igual_ao_recalculo_completo(resultado):
+    from services.processing.escala_contratos import curva_contratos, recalcular_razao
+    from services.unified.inputs import load_ultimo_resultado
+
+    _, temp_path = resultado
+    df = load_ultimo_resultado(str(temp_path))
+    curva = curva_contratos(df, 8).set_index("contratos")
+    for n in (3, 7, 8):
+        completo = recalcular_razao(df, n)
+        assert curva.at[n, "maxima_divida"] == completo["Máxima Dívida Acumulada"].min()
+        assert curva.at[n, "media_maximas_dividas"] == completo["Média das Máximas Dívidas"].iloc[-1]
+
+
+def test_recalcular_usa_resultados_persistidos(client, monkeypatch):
+    def _pipeline_completo(*args, **kwargs):
+        raise AssertionError("recalculo não deveria reler a planilha")
+
+    monkeypatch.setattr(InsightFutures, "__init__", _pipeline_completo)
+    r = client.post("/recalcular_fluxo_contratos", json={"contratos": 2})
+    assert r.get_json() == {"status": "ok", "mensagem": "Fluxo recalculado com sucesso!"}
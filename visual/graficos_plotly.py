@@ -10,16 +10,31 @@ __all__ = [
 ]
 import logging
 
-def gerar_grafico_fluxo_caixa(df):
-    x = df.index.tolist()
-    y = df['Caixa Líquido'].tolist()
+def _meta_serie(coluna, pontos, reduzida, artefato="ultimo_resultado"):
+    """layout.meta para o front buscar a série completa no zoom (/api/insights/linhas)."""
+    if not reduzida:
+        return None
+    return {"serie": {"artefato": artefato, "coluna": coluna, "pontos": int(pontos),
+                      "reduzida": True, "metodo": "lttb"}}
+
+
+def gerar_grafico_fluxo_caixa(df, max_pontos=None, webgl=None):
+    from visual.reducao_series import LIMIAR_WEBGL, reduzir_serie, usar_webgl
+
+    # séries longas: LTTB até ~INSIGHT_GRAFICO_PONTOS pontos (extremos preservados)
+    x, y, reduzida = reduzir_serie(df.index, df['Caixa Líquido'], max_pontos)
+    x = x.tolist() if hasattr(x, "tolist") else x
+    y = y.tolist() if hasattr(y, "tolist") else y
 
-    trace = go.Scatter(x=x, y=y, mode='lines+markers', name='Fluxo de Caixa',
-                       line=dict(color='#34d399'), marker=dict(color='#34d399'))
+    Trace = go.Scattergl if usar_webgl(len(y), webgl) else go.Scatter
+    modo = 'lines' if reduzida or len(y) > LIMIAR_WEBGL else 'lines+markers'
+    trace = Trace(x=x, y=y, mode=modo, name='Fluxo de Caixa',
+                  line=dict(color='#34d399'), marker=dict(color='#34d399'))
     layout = go.Layout(title='Fluxo de Caixa',
                        plot_bgcolor="#112240",
                        paper_bgcolor="#112240",
-                       font=dict(color="white"))
+                       font=dict(color="white"),
+                       meta=_meta_serie('Caixa Líquido', len(df), reduzida))
 
     fig = go.Figure(data=[trace], layout=layout)
     return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
@@ -564,20 +579,34 @@ import pandas as pd
 
 from plotly.utils import PlotlyJSONEncoder
 
-def gerar_grafico_divida_acumulada_simulada(df_simulado: pd.DataFrame, media: float, percentil25: float, minima: float) -> str:
-    fig = go.Figure()
+def gerar_grafico_divida_acumulada_simulada(df_simulado: pd.DataFrame, media: float, percentil25: float, minima: float,
+                                            max_pontos=None, webgl=None) -> str:
+    from visual.reducao_series import LIMIAR_WEBGL, indices_reduzidos, pontos_alvo, usar_webgl
 
+    fig = go.Figure()
 
-    fig.add_trace(go.Scatter(
-        x=df_simulado["Abertura"],
-        y=df_simulado["Dívida Acumulada"].astype(float).tolist(),
-        mode="lines+markers",
+    # séries longas: LTTB até ~INSIGHT_GRAFICO_PONTOS pontos (extremos preservados)
+    serie = df_simulado
+    alvo = pontos_alvo() if max_pontos is None else max_pontos
+    reduzida = bool(alvo) and len(serie) > alvo
+    if reduzida:
+        serie = serie.iloc[indices_reduzidos(serie["Abertura"], serie["Dívida Acumulada"], alvo)]
+
+    Trace = go.Scattergl if usar_webgl(len(serie), webgl) else go.Scatter
+    grande = reduzida or len(serie) > LIMIAR_WEBGL
+    fig.add_trace(Trace(
+        x=serie["Abertura"],
+        y=serie["Dívida Acumulada"].astype(float).tolist(),
+        mode="lines" if grande else "lines+markers",
         name="Dívida Acumulada",
-        text=df_simulado["Dívida Acumulada"].tolist(),  # ✅ transforma ndarray em lista
+        text=serie["Dívida Acumulada"].tolist(),  # ✅ transforma ndarray em lista
         textposition="top center",
         line=dict(color="rgba(255, 138, 128, 0.7)", width=3),
         marker=dict(size=8)
     ))
+    meta = _meta_serie("Dívida Acumulada", len(df_simulado), reduzida)
+    if meta:
+        fig.update_layout(meta=meta)
 
     # Linha da Média com legenda + anotação
     fig.add_trace(go.Scatter(
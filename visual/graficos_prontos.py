@@ -0,0 +1,231 @@
+# visual/graficos_prontos.py
+"""
+PT:
+    Gráficos do painel gerados uma vez e guardados prontos para envio.
+
+    - Cada gráfico (padronizacao, drawdown, lucro, divida) declara os artefatos de que
+      depende; a chave do cache é o hash desses artefatos no manifest.json (ou
+      mtime/tamanho, se não estiverem no manifesto) + VERSAO_GRAFICOS.
+    - O payload pronto (bytes JSON) fica em <temp_path>/graficos/<nome>-<chave>.<formato>.json e no
+      cache do processo; gravar os artefatos de novo muda a chave e invalida sozinho.
+    - `pre_gerar_graficos(temp_path)` roda no fim do pipeline; sem isso, a primeira
+      requisição gera (lazy).
+    - formato "texto" (padrão, legado): figuras como string JSON (o front faz JSON.parse);
+      formato "figura": figuras como objeto, sem a segunda serialização.
+
+EN:
+    Dashboard charts built once and cached as ready-to-send JSON bytes, keyed by the
+    manifest hashes of their input artifacts; legacy string figures are optional.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import logging
+import os
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+from services.utils.artefatos import MANIFESTO, gravar_atomico
+from services.utils.cache_artefatos import ler_com_cache
+from services.utils.file_io import carregar_json
+from services.utils.serializacao import desserializar_json, serializar_json
+
+VERSAO_GRAFICOS = 2  # subir quando a montagem dos gráficos mudar
+PASTA_GRAFICOS = "graficos"
+FORMATOS = ("texto", "figura")
+
+
+# ------------------------------------------------------------------------------
+# Montagem dos payloads (mesmas respostas que as rotas montavam a cada GET)
+# ------------------------------------------------------------------------------
+
+def _payload_padronizacao(temp_path: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    from visual.graficos_plotly import gerar_grafico_barras_horizontais_operacoes, gerar_grafico_pizza
+
+    stats = carregar_json(temp_path, "estatisticas_positivas_negativas.json")
+    fluxo = carregar_json(temp_path, "variaveis_fluxo.json")
+
+    figuras = {
+        # distribuição das operações
+        "barras_operacoes": gerar_grafico_barras_horizontais_operacoes(
+            positivas=stats.get("qtd_positivas", 0),
+            negativas=stats.get("qtd_negativas", 0),
+            neutras=stats.get("qtd_neutras", 0),
+        ),
+        # valores (empréstimos, amortizações, lucros)
+        "pizza_valores": gerar_grafico_pizza(
+            emprestimos=fluxo.get("valor_emprestado", 0),
+            amortizacoes=fluxo.get("amortizacao", 0),
+            lucros=fluxo.get("lucro_gerado", 0),
+            labels=["Empréstimos", "Amortizações", "Lucros"],
+        ),
+        # quantidades de operações
+        "pizza_qtde": gerar_grafico_pizza(
+            emprestimos=fluxo.get("qtde_emprestado", 0),
+            amortizacoes=fluxo.get("qtde_amortizacao", 0),
+            lucros=fluxo.get("qtde_lucro", 0),
+            labels=["Qtde Empréstimos", "Qtde Amortizações", "Qtde Lucros"],
+        ),
+    }
+    return {"status": "ok"}, figuras
+
+
+def _payload_drawdown(temp_path: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    from visual.graficos_plotly import gerar_grafico_ciclos_drawdown_e_lucro
+
+    # FileNotFoundError sobe para a rota ("ainda não foram gerados"); vazios viram DF vazio
+    resumo = carregar_json(temp_path, "resumo_ciclos_divida.json") or []
+    lucro = carregar_json(temp_path, "resultados_ciclos_lucro.json") or []
+    stats_lucro = carregar_json(temp_path, "estatisticas_ciclos_lucro.json") or {}
+
+    df_drawdown = pd.DataFrame(resumo) if isinstance(resumo, (list, dict)) else pd.DataFrame()
+    df_lucro = pd.DataFrame(lucro) if isinstance(lucro, (list, dict)) else pd.DataFrame()
+    if df_drawdown.empty and df_lucro.empty:
+        return {
+            "status": "ok",
+            "mensagem": "Ainda não há dados suficientes para o gráfico de drawdown.",
+            "grafico_ciclos": None,
+        }, {}
+
+    return {"status": "ok"}, {
+        "grafico_ciclos": gerar_grafico_ciclos_drawdown_e_lucro(df_drawdown, df_lucro, stats_lucro),
+    }
+
+
+def _payload_lucro(temp_path: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    from visual.graficos_plotly import gerar_grafico_ciclos_lucro
+
+    df_lucros = carregar_json(temp_path, "resultados_ciclos_lucro.json")
+    df_drawdown = carregar_json(temp_path, "resumo_ciclos_divida.json")
+    return {"status": "ok"}, {"grafico_lucro": gerar_grafico_ciclos_lucro(df_lucros, df_drawdown)}
+
+
+def _payload_divida(temp_path: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    from visual.graficos_plotly import gerar_grafico_divida_acumulada_simulada
+
+    # ciclo completo para os eixos x/y (DataFrame novo: o objeto do cache não é alterado)
+    df_ultimo_ciclo = pd.DataFrame(carregar_json(temp_path, "ultimo_ciclo_completo.json"))
+    df_ultimo_ciclo["Abertura"] = pd.to_datetime(df_ultimo_ciclo["Abertura"], errors="coerce")
+    df_ultimo_ciclo["Dívida Acumulada"] = pd.to_numeric(df_ultimo_ciclo["Dívida Acumulada"], errors="coerce")
+
+    # estatísticas do último ciclo (linhas horizontais)
+    estatisticas = carregar_json(temp_path, "ultimo_ciclo.json")
+    media = estatisticas.get("Média Máximas Até o Ciclo", 0)
+    percentil25 = estatisticas.get("Percentil 75 Máximas Até o Ciclo", 0)
+
+    # resumo é uma lista de ciclos: a mínima é a maior dívida entre eles
+    resumo = carregar_json(temp_path, "resumo_ciclos_divida.json")
+    if isinstance(resumo, dict):
+        minima = resumo.get("Máxima Dívida do Ciclo", 0)
+    else:
+        valores = pd.to_numeric(pd.Series([r.get("Máxima Dívida do Ciclo") for r in resumo or []],
+                                          dtype=object), errors="coerce").dropna()
+        minima = float(valores.min()) if not valores.empty else 0.0
+
+    return {"status": "ok"}, {
+        "grafico_divida": gerar_grafico_divida_acumulada_simulada(
+            df_simulado=df_ultimo_ciclo[["Abertura", "Dívida Acumulada"]],
+            media=media,
+            percentil25=percentil25,
+            minima=minima,
+        ),
+    }
+
+
+# nome → (montador, artefatos de que depende)
+GRAFICOS: Dict[str, Tuple[Callable[[str], Tuple[Dict[str, Any], Dict[str, str]]], Tuple[str, ...]]] = {
+    "padronizacao": (_payload_padronizacao, ("estatisticas_positivas_negativas.json", "variaveis_fluxo.json")),
+    "drawdown": (_payload_drawdown, ("resumo_ciclos_divida.json", "resultados_ciclos_lucro.json",
+                                     "estatisticas_ciclos_lucro.json")),
+    "lucro": (_payload_lucro, ("resultados_ciclos_lucro.json", "resumo_ciclos_divida.json")),
+    "divida": (_payload_divida, ("ultimo_ciclo_completo.json", "ultimo_ciclo.json", "resumo_ciclos_divida.json")),
+}
+
+
+# ------------------------------------------------------------------------------
+# Cache (disco + processo)
+# ------------------------------------------------------------------------------
+
+def _ler_bytes(caminho: str) -> bytes:
+    with open(caminho, "rb") as f:
+        return f.read()
+
+
+def _chave(temp_path: str, dependencias: Tuple[str, ...]) -> str:
+    """Hash das dependências no manifesto (mtime/tamanho como fallback)."""
+    try:
+        manifesto = ler_com_cache(os.path.join(temp_path, MANIFESTO),
+                                  lambda p: desserializar_json(_ler_bytes(p)))
+        artefatos = manifesto.get("artefatos", {})
+    except OSError:
+        artefatos = {}
+    h = hashlib.blake2b(f"v{VERSAO_GRAFICOS}".encode(), digest_size=8)
+    for dep in dependencias:
+        reg = artefatos.get(dep)
+        if reg and reg.get("hash"):
+            h.update(f"{dep}={reg['hash']};".encode())
+            continue
+        try:
+            st = os.stat(os.path.join(temp_path, dep))
+            h.update(f"{dep}@{st.st_mtime_ns}:{st.st_size};".encode())
+        except OSError:
+            h.update(f"{dep}=ausente;".encode())
+    return h.hexdigest()
+
+
+def _bytes_payload(base: Dict[str, Any], figuras: Dict[str, str], formato: str) -> bytes:
+    if formato == "texto":
+        return serializar_json({**base, **figuras}, pretty=False)
+    # figura: objeto no lugar da string (texto do Plotly embutido sem reserializar)
+    try:
+        from orjson import Fragment
+        objetos = {k: Fragment(v) for k, v in figuras.items()}
+    except ImportError:
+        objetos = {k: desserializar_json(v) for k, v in figuras.items()}
+    return serializar_json({**base, **objetos}, pretty=False)
+
+
+def _caminho(temp_path: str, nome: str, chave: str, formato: str) -> str:
+    return os.path.join(temp_path, PASTA_GRAFICOS, f"{nome}-{chave}.{formato}.json")
+
+
+def gerar_grafico(temp_path: str, nome: str) -> str:
+    """Monta o gráfico `nome`, grava os dois formatos e remove versões antigas. Retorna a chave."""
+    montar, deps = GRAFICOS[nome]
+    chave = _chave(temp_path, deps)
+    base, figuras = montar(temp_path)
+    for antigo in glob.glob(os.path.join(temp_path, PASTA_GRAFICOS, f"{nome}-*.json")):
+        if not os.path.basename(antigo).startswith(f"{nome}-{chave}."):
+            try:
+                os.remove(antigo)
+            except OSError:
+                pass
+    for formato in FORMATOS:
+        gravar_atomico(_caminho(temp_path, nome, chave, formato), _bytes_payload(base, figuras, formato))
+    return chave
+
+
+def grafico_pronto(temp_path: str, nome: str, formato: str = "texto") -> bytes:
+    """Bytes JSON prontos do gráfico; gera na primeira vez (ou se os artefatos mudaram)."""
+    if nome not in GRAFICOS:
+        raise KeyError(nome)
+    if formato not in FORMATOS:
+        raise ValueError(f"formato inválido: {formato} (use {' ou '.join(FORMATOS)})")
+    caminho = _caminho(temp_path, nome, _chave(temp_path, GRAFICOS[nome][1]), formato)
+    if not os.path.exists(caminho):
+        caminho = _caminho(temp_path, nome, gerar_grafico(temp_path, nome), formato)
+    return ler_com_cache(caminho, _ler_bytes, tipo="bytes")
+
+
+def pre_gerar_graficos(temp_path: str) -> None:
+    """Gera os gráficos desatualizados ao fim do processamento; falhas ficam para a rota (lazy)."""
+    for nome, (_, deps) in GRAFICOS.items():
+        try:
+            chave = _chave(temp_path, deps)
+            if all(os.path.exists(_caminho(temp_path, nome, chave, f)) for f in FORMATOS):
+                continue  # artefatos iguais aos da última geração
+            gerar_grafico(temp_path, nome)
+        except Exception as e:
+            logging.info("ℹ️ Gráfico %s não pré-gerado (%s); será gerado sob demanda.", nome, e)
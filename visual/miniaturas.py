@@ -0,0 +1,116 @@
+# visual/miniaturas.py
+"""
+PT:
+    Miniaturas (thumbs) dos uploads para os cards de estratégia.
+
+    - Geradas em segundo plano (services.utils.tarefas), depois do pipeline, a partir
+      dos artefatos já gravados em temp_path — a requisição de upload só agenda.
+    - Entrada reduzida a ~PONTOS_MINIATURA pontos: buckets min/max da pirâmide do fluxo
+      (piramide_fluxo.bin) ou, sem ela, a coluna do ultimo_resultado reduzida (minmax).
+    - Saída SVG (polyline) escrita direto, sem matplotlib/pyplot.
+    - Uploads antigos continuam com o PNG legado (upload_<id>.png).
+
+EN:
+    Background SVG thumbnails for uploads, built from a few hundred decimated points
+    without the pyplot stack.
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+import numpy as np
+
+from services.utils.artefatos import carregar_dataframe, gravar_atomico
+
+PONTOS_MINIATURA = 300
+LARGURA, ALTURA, MARGEM = 320, 180, 6  # 16:9
+COR_FUNDO = "#0c1526"
+COR_LINHA = "#4fd1c5"
+
+# coluna preferencial (mesma ordem do thumb antigo)
+COLUNAS_PREFERIDAS = (
+    "Caixa Líquido",
+    "Resultado Líquido Total Acumulado",
+    "Resultado líquido dia",
+    "ResultadoDiario",
+)
+
+
+def _da_piramide(temp_path: str) -> Optional[np.ndarray]:
+    from services.utils.piramide import carregar_piramide
+
+    try:
+        janela = carregar_piramide(temp_path).janela(COLUNAS_PREFERIDAS[0], largura=PONTOS_MINIATURA // 2)
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+    valores = []
+    for mn, mx, ini, fim in zip(janela["min"], janela["max"], janela["primeiro"], janela["ultimo"]):
+        if mn is None:
+            continue
+        # bucket subindo: mínimo antes do máximo; descendo: o contrário
+        valores.extend((mn, mx) if (ini or 0) <= (fim or 0) else (mx, mn))
+    return np.asarray(valores, dtype=np.float64)
+
+
+def _do_resultado(temp_path: str) -> Optional[np.ndarray]:
+    from visual.reducao_series import indices_reduzidos
+
+    df = carregar_dataframe(temp_path, "ultimo_resultado", colunas=COLUNAS_PREFERIDAS)
+    if df.shape[1] == 0:
+        df = carregar_dataframe(temp_path, "ultimo_resultado")
+    coluna = next((c for c in COLUNAS_PREFERIDAS if c in df.columns), None)
+    if coluna is None:
+        numericas = df.select_dtypes("number").columns
+        if not len(numericas):
+            return None
+        coluna = numericas[0]
+    y = df[coluna].to_numpy(dtype=np.float64, na_value=np.nan)
+    return y[indices_reduzidos(None, y, PONTOS_MINIATURA, "minmax")]
+
+
+def serie_miniatura(temp_path: str) -> Optional[np.ndarray]:
+    """~PONTOS_MINIATURA valores (ordem temporal) da curva do upload; None se não houver."""
+    valores = _da_piramide(temp_path)
+    if valores is None or not len(valores):
+        valores = _do_resultado(temp_path)
+    if valores is None:
+        return None
+    valores = valores[~np.isnan(valores)]
+    return valores if len(valores) else None
+
+
+def svg_miniatura(valores: np.ndarray) -> str:
+    """SVG 16:9 (fundo escuro + polyline) dos valores."""
+    n = len(valores)
+    xs = np.linspace(MARGEM, LARGURA - MARGEM, n) if n > 1 else np.full(n, LARGURA / 2)
+    lo, hi = float(np.min(valores)), float(np.max(valores))
+    escala = (ALTURA - 2 * MARGEM) / (hi - lo) if hi > lo else 0.0
+    ys = ALTURA - MARGEM - (valores - lo) * escala if escala else np.full(n, ALTURA / 2)
+    pontos = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {LARGURA} {ALTURA}" '
+        f'width="{LARGURA}" height="{ALTURA}" preserveAspectRatio="none">'
+        f'<rect width="100%" height="100%" fill="{COR_FUNDO}"/>'
+        f'<polyline points="{pontos}" fill="none" stroke="{COR_LINHA}" stroke-width="1.5" '
+        f'stroke-linejoin="round" stroke-linecap="round"/></svg>'
+    )
+
+
+def gerar_miniatura(upload_id: int, temp_path: str, pasta: str) -> str:
+    """Grava <pasta>/upload_<id>.svg a partir dos artefatos de temp_path. Retorna o caminho ('' se sem dados)."""
+    valores = serie_miniatura(temp_path)
+    if valores is None:
+        return ""
+    caminho = os.path.join(pasta, f"upload_{int(upload_id)}.svg")
+    gravar_atomico(caminho, svg_miniatura(valores).encode("utf-8"))
+    return caminho
+
+
+def arquivo_miniatura(pasta: str, upload_id: int) -> Optional[str]:
+    """Nome do thumb pronto (SVG novo ou PNG legado) ou None enquanto não existe."""
+    for ext in ("svg", "png"):
+        nome = f"upload_{int(upload_id)}.{ext}"
+        if os.path.exists(os.path.join(pasta, nome)):
+            return nome
+    return None
@@ -0,0 +1,151 @@
+# visual/reducao_series.py
+"""
+PT:
+    Redução de séries longas para gráficos (alvo ≈ largura em pixels), preservando extremos.
+
+    - `lttb`: Largest-Triangle-Three-Buckets — mantém o formato visual da curva.
+    - `minmax`: mínimo e máximo de cada bucket — nenhum pico/vale some.
+    - Nos dois, o primeiro/último ponto e o mínimo/máximo global são sempre mantidos.
+
+    Configuração (gráficos do painel):
+        INSIGHT_GRAFICO_PONTOS=2000      alvo de pontos por série (0 desliga a redução)
+        INSIGHT_GRAFICO_WEBGL=auto|1|0   Scattergl (WebGL) quando a série plotada passa
+                                         de LIMIAR_WEBGL pontos (auto), sempre (1) ou nunca (0)
+
+    A série completa continua disponível para zoom via /api/insights/linhas/<artefato>
+    (inicio/fim + max_pontos + metodo).
+
+EN:
+    Downsampling for large chart series (LTTB and min/max buckets) that always keeps the
+    endpoints and the global extremes; optional WebGL traces.
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+METODOS = ("lttb", "minmax")
+PONTOS_PADRAO = 2000
+LIMIAR_WEBGL = 5000
+
+
+def pontos_alvo() -> int:
+    try:
+        return max(0, int(os.getenv("INSIGHT_GRAFICO_PONTOS", PONTOS_PADRAO)))
+    except ValueError:
+        return PONTOS_PADRAO
+
+
+def usar_webgl(n_pontos: int, webgl: Optional[bool] = None) -> bool:
+    """Decide Scatter vs Scattergl (parâmetro explícito > INSIGHT_GRAFICO_WEBGL > auto)."""
+    if webgl is not None:
+        return bool(webgl)
+    modo = os.getenv("INSIGHT_GRAFICO_WEBGL", "auto").strip().lower()
+    if modo in ("1", "true", "sim"):
+        return True
+    if modo in ("0", "false", "nao", "não"):
+        return False
+    return n_pontos > LIMIAR_WEBGL
+
+
+def _como_float(valores) -> np.ndarray:
+    """Eixo numérico para os cálculos (datas → ns desde a época)."""
+    arr = np.asarray(valores)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    if arr.dtype == object:
+        convertido = pd.to_datetime(pd.Series(arr), errors="coerce")
+        if convertido.notna().all():
+            return convertido.to_numpy().astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+        return pd.to_numeric(pd.Series(arr), errors="coerce").to_numpy(dtype=np.float64)
+    return arr.astype(np.float64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """Índices escolhidos pelo LTTB (x crescente, sem NaN)."""
+    total = len(y)
+    if n >= total or n < 3:
+        return np.arange(total)
+    escolhidos = np.empty(n, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, total - 1
+    # n-2 buckets entre o primeiro e o último ponto
+    bordas = np.linspace(1, total - 1, n - 1).astype(np.int64)
+    a = 0
+    for i in range(n - 2):
+        ini, fim = bordas[i], bordas[i + 1]
+        # média do próximo bucket (ou o último ponto)
+        prox_ini, prox_fim = bordas[i + 1], (bordas[i + 2] if i + 2 < len(bordas) else total)
+        mx, my = x[prox_ini:prox_fim].mean(), y[prox_ini:prox_fim].mean()
+        xs, ys = x[ini:fim], y[ini:fim]
+        areas = np.abs((x[a] - mx) * (ys - y[a]) - (x[a] - xs) * (my - y[a]))
+        a = ini + int(np.argmax(areas))
+        escolhidos[i + 1] = a
+    return escolhidos
+
+
+def minmax(y: np.ndarray, n: int) -> np.ndarray:
+    """Índices do mínimo e do máximo de cada bucket (≈ n pontos no total)."""
+    total = len(y)
+    if n >= total or n < 4:
+        return np.arange(total)
+    buckets = max(1, n // 2)
+    bordas = np.linspace(0, total, buckets + 1).astype(np.int64)
+    idx = []
+    for ini, fim in zip(bordas[:-1], bordas[1:]):
+        if fim <= ini:
+            continue
+        trecho = y[ini:fim]
+        idx.append(ini + int(np.argmin(trecho)))
+        idx.append(ini + int(np.argmax(trecho)))
+    return np.asarray(idx, dtype=np.int64)
+
+
+def indices_reduzidos(x: Sequence, y: Sequence, n: int, metodo: str = "lttb") -> np.ndarray:
+    """
+    Índices (ordenados, sobre a série original) que representam a série em ~n pontos.
+    NaN em y é ignorado no cálculo; extremos globais e as pontas sempre entram.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"metodo inválido: {metodo} (use {' ou '.join(METODOS)})")
+    yv = np.asarray(pd.to_numeric(pd.Series(np.asarray(y)), errors="coerce"), dtype=np.float64)
+    total = len(yv)
+    if n <= 0 or total <= n:
+        return np.arange(total)
+
+    validos = np.flatnonzero(~np.isnan(yv))
+    if len(validos) <= n:
+        return np.arange(total)
+    yy = yv[validos]
+    if metodo == "lttb":
+        xx = _como_float(x)[validos] if x is not None else validos.astype(np.float64)
+        escolha = lttb(xx, yy, n)
+    else:
+        escolha = minmax(yy, n)
+    extras = [0, len(validos) - 1, int(np.argmin(yy)), int(np.argmax(yy))]
+    return np.unique(np.concatenate([validos[escolha], validos[extras], [0, total - 1]]))
+
+
+def _tomar(valores, idx: np.ndarray) -> list:
+    if isinstance(valores, pd.Series):
+        return valores.iloc[idx].tolist()
+    if isinstance(valores, pd.Index):
+        return valores.take(idx).tolist()
+    if isinstance(valores, list):
+        return [valores[i] for i in idx]
+    return np.asarray(valores)[idx].tolist()
+
+
+def reduzir_serie(x: Sequence, y: Sequence, n: Optional[int] = None,
+                  metodo: str = "lttb") -> Tuple[Sequence, Sequence, bool]:
+    """
+    (x, y, reduzida?) para o trace; `n` padrão = INSIGHT_GRAFICO_PONTOS.
+    Séries que já cabem no alvo voltam como vieram.
+    """
+    n = pontos_alvo() if n is None else n
+    if not n or len(y) <= n:
+        return x, y, False
+    idx = indices_reduzidos(x, y, n, metodo)
+    return _tomar(x, idx), _tomar(y, idx), True
@@ -1,14 +1,13 @@
 
 from flask import Blueprint, session, request, jsonify
-import pandas as pd
 import logging
 
 bp = Blueprint("backtest_routes", __name__)
 
 @bp.route('/rodar_backtest', methods=['POST'])
 def rodar_backtest():
-    from services.logic.backtest import executar_backtest_completo,  gerar_frase_insight
-    import os
+    from services.logic.backtest import COLUNAS_BACKTEST, executar_backtest_completo, gerar_frase_insight
+    from services.unified.inputs import load_prebacktest
 
     try:
         req = request.get_json()
@@ -26,10 +25,11 @@ def rodar_backtest():
 
 
         temp_path = session.get("temp_path", "")
-        df_prebacktest = pd.read_json(os.path.join(temp_path, "prebacktest.json"), orient="split")
+        # só as colunas que o backtest lê (leitura colunar/memory-mapped)
+        df_prebacktest = load_prebacktest(temp_path, colunas=COLUNAS_BACKTEST)
 
 
-        df_backtest_recalculado, metricasback, metricas_original, df_comparativo = executar_backtest_completo(
+        df_backtest_recalculado, metricasback, metricas_original = executar_backtest_completo(
             df_prebacktest, parametros_usuario, temp_path=temp_path, salvar_resultados=True
         )
         from services.utils.formatters import converter_valores_json_serializaveis
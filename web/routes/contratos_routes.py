@@ -14,7 +14,9 @@ def atualizar_contratos():
 
 @bp.route('/recalcular_fluxo_contratos', methods=['POST'])
 def recalcular_fluxo_contratos():
-    from app.core import InsightFutures
+    from app.core.orchestrator import InsightFutures
+    from services.logic.save_data import salvar_todos_resultados
+    from services.utils.artefatos import artefato_existe
     req = request.get_json()
     contratos = int(req.get('contratos', 1))
     session['contratos_desejados'] = contratos
@@ -23,10 +25,13 @@ def recalcular_fluxo_contratos():
     temp_path = session.get("temp_path", "")
 
     try:
-        insight = InsightFutures(filepath)
+        # parte do resultado já persistido (sem reler a planilha); fallback: pipeline completo
+        if temp_path and artefato_existe(temp_path, "ultimo_resultado"):
+            insight = InsightFutures.de_resultados(temp_path)
+        else:
+            insight = InsightFutures(filepath)
         insight.recalcular_com_novos_contratos(contratos_usuario=contratos)
 
-        from services.features_engineering import salvar_todos_resultados
         salvar_todos_resultados(insight, temp_path)
 
         return jsonify({"status": "ok", "mensagem": "Fluxo recalculado com sucesso!"})
@@ -34,3 +39,24 @@ def recalcular_fluxo_contratos():
     except Exception as e:
         return jsonify({"status": "erro", "mensagem": str(e)})
 
+
+@bp.route('/curva_contratos', methods=['POST'])
+def curva_contratos():
+    """Curva what-if por contratos: {"max": N} (1..N) ou {"contratos": [1, 2, 5]}."""
+    from services.unified.inputs import load_ultimo_resultado
+    from services.utils.artefatos import artefato_existe
+    from services.processing.escala_contratos import curva_contratos as _curva
+
+    req = request.get_json(silent=True) or {}
+    temp_path = session.get("temp_path", "")
+    if not temp_path or not artefato_existe(temp_path, "ultimo_resultado"):
+        return jsonify({"status": "erro", "mensagem": "Nenhum resultado processado na sessão."}), 404
+
+    try:
+        lista = req.get('contratos')
+        alvo = [int(c) for c in lista] if lista else min(int(req.get('max', 10)), 500)
+        curva = _curva(load_ultimo_resultado(temp_path), alvo)
+        # formato colunar (compacto para o gráfico)
+        return jsonify({"status": "ok", "curva": curva.to_dict(orient="list")})
+    except Exception as e:
+        return jsonify({"status": "erro", "mensagem": str(e)})
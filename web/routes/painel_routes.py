@@ -1,5 +1,5 @@
 # painel_routes.py
-from flask import Blueprint, render_template, redirect, url_for, session, send_file, abort
+from flask import Blueprint, render_template, redirect, url_for, session, send_file, abort, request
 from pathlib import Path
 import locale
 
@@ -14,19 +14,17 @@ except Exception:
 from datetime import datetime
 import pandas as pd
 
-
-try:
-    from services.logic.conditions import decidir_estado_a_partir_df
-except Exception:
-    decidir_estado_a_partir_df = None  # fallback seguro
+from app.core.paths import ultimo_resultado_dir
+from services.logic.estado_atual import ARQUIVO_ESTADO, ESTADO_VAZIO, montar_estado_atual
+from services.utils.cache_artefatos import ler_com_cache
+from services.utils.file_io import carregar_json
 
 # Serviços (ajuste se seu service tiver outros nomes/assinaturas)
-from services.repository.strategy_service import list_strategy_cards  # , get_strategy_by_id
+from services.repository.strategy_service import list_strategy_cards, CARDS_POR_PAGINA  # , get_strategy_by_id
 
 # Use APENAS um Blueprint
 painel_routes = Blueprint("painel_routes", __name__)
 
-RESULTS_ROOT = Path("outputs/resultados")
 OUTPUTS_ROOT = Path("outputs")
 
 # +++ HELPERS LOCAIS +++
@@ -40,120 +38,44 @@ def _caminhos_candidatos(latest_dir: Path) -> list[Path]:
     ]
     return [latest_dir / n for n in nomes]
 
-def _load_fluxo_df() -> pd.DataFrame | None:
+def _estado_do_csv(caminho: str) -> dict:
+    # legado: pastas sem estado_atual.json (snapshot calculado uma vez por versão do CSV)
+    return montar_estado_atual(pd.read_csv(caminho))
+
+
+def _carregar_estado() -> dict:
     """
-    Tenta carregar o DataFrame do fluxo a partir da pasta mais recente em outputs/resultados/.
-    Não altera dados; só lê.
+    Snapshot do estado atual: estado_atual.json da pasta mais recente (gravado pelo pipeline);
+    sem ele, os CSVs antigos (pasta mais recente ou outputs/ raiz). Tudo via cache do processo.
     """
     try:
         latest = _latest_results_dir()
-        if not latest:
-            return None
-        for p in _caminhos_candidatos(latest):
+        if latest and (latest / ARQUIVO_ESTADO).exists():
+            return carregar_json(str(latest), ARQUIVO_ESTADO)
+        candidatos = _caminhos_candidatos(latest) if latest else []
+        candidatos += [OUTPUTS_ROOT / "fluxocalculado.csv", OUTPUTS_ROOT / "estrategiapadronizada.csv"]
+        for p in candidatos:
             if p.exists() and p.is_file():
-                # CSV padrão (vírgula). Se o teu for ';', troque delimiter.
-                return pd.read_csv(p)
-        # Fallback: tentar na raiz outputs/ (se você às vezes grava lá)
-        root = OUTPUTS_ROOT if 'OUTPUTS_ROOT' in globals() else Path("outputs")
-        for name in ("fluxocalculado.csv", "estrategiapadronizada.csv"):
-            p = root / name
-            if p.exists():
-                return pd.read_csv(p)
-        return None
+                return ler_com_cache(str(p), _estado_do_csv, tipo="estado")
     except Exception:
-        return None
-
+        pass
+    return ESTADO_VAZIO
 
-def _inferir_fase(df: pd.DataFrame) -> str:
-    """
-    Deduz a fase a partir da 'Dívida Acumulada':
-      - < 0 e caindo -> DECLINIO
-      - < 0 e subindo (indo a zero) -> RECUPERACAO
-      - >= 0 -> LUCRO
-    """
-    try:
-        if "Dívida Acumulada" not in df.columns or len(df) == 0:
-            return "LUCRO"
-        div = pd.to_numeric(df["Dívida Acumulada"], errors="coerce").fillna(0.0)
-        if len(div) < 2:
-            return "RECUPERACAO" if div.iloc[-1] < 0 else "LUCRO"
-        atual = div.iloc[-1]
-        prev = div.iloc[-2]
-        if atual < 0 and atual < prev:
-            return "DECLINIO"
-        if atual < 0 and atual >= prev:
-            return "RECUPERACAO"
-        return "LUCRO"
-    except Exception:
-        return "LUCRO"
 
 # +++ ROTA HTMX DO CARD ESTADO ATUAL +++
 @painel_routes.route("/painel/_estado_atual")
 def painel_estado_atual():
     """
     Retorna um parcial Jinja com o estado atual da estratégia.
-    Não reprocessa dados: apenas lê o CSV mais recente de outputs/resultados/.
+    Não reprocessa dados: lê o snapshot estado_atual.json da pasta mais recente (ponteiro).
     """
-    df = _load_fluxo_df()
-    if df is None or len(df) == 0:
-        # Renderiza card “vazio” amigável
-        estado = {
-            "fase": "—",
-            "divida_atual": None,
-            "media_maximas_dividas": None,
-            "p25_maximas_dividas": None,
-            "posicao_relativa_divida": None,
-            "recomendacao": "MANTER",
-            "motivo": "Sem dados recentes encontrados.",
-            "ts": datetime.now(),
-        }
-        return render_template("painel/_estado_atual.html", e=estado)
-
-    # última linha
-    row = df.iloc[-1]
-
-    # leituras seguras (NÃO inventa colunas — só pega se existirem)
-    divida_atual = row.get("Dívida Acumulada", None)
-    media_maximas = row.get("Média das Máximas Dívidas", None)
-    p25_maximas = row.get("Percentil 25 das Máximas Dívidas", None)
-    pos_rel = row.get("Posição Relativa Dívida", None)
-
-    # fase inferida por dinâmica da dívida
-    fase = _inferir_fase(df)
-
-    # decisão consolidada (se o helper existir)
-    if decidir_estado_a_partir_df:
-        try:
-            # parâmetros vazios por padrão; passe os teus se já tiverem prontos
-            recomendacao, motivo = decidir_estado_a_partir_df(df, parametros={})
-        except Exception:
-            recomendacao, motivo = ("MANTER", "Sem decisão consolidada.")
-    else:
-        recomendacao, motivo = ("MANTER", "Decisor não configurado.")
-
-    estado = {
-        "fase": fase,
-        "divida_atual": divida_atual,
-        "media_maximas_dividas": media_maximas,
-        "p25_maximas_dividas": p25_maximas,
-        "posicao_relativa_divida": pos_rel,
-        "recomendacao": recomendacao,
-        "motivo": motivo,
-        "ts": datetime.now(),
-    }
-
+    estado = {**_carregar_estado(), "ts": datetime.now()}
     return render_template("painel/_estado_atual.html", e=estado)
 
 
 def _latest_results_dir() -> Path | None:
-    """Retorna a pasta de resultados mais recente em outputs/resultados/"""
-    if not RESULTS_ROOT.exists():
-        return None
-    dirs = [p for p in RESULTS_ROOT.iterdir() if p.is_dir()]
-    if not dirs:
-        return None
-    dirs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return dirs[0]
+    """Retorna a pasta de resultados mais recente do usuário da sessão (índice result_runs)"""
+    return ultimo_resultado_dir(owner=session.get("user"))
 
 
 def formatar_moeda(valor):
@@ -230,7 +152,8 @@ def exportacoes():
 def pagina_estrategias():
     # Se tiver usuário na sessão e quiser filtrar por owner:
     owner = session.get("user")
-    cards = list_strategy_cards(owner=owner)
+    pagina = max(1, request.args.get("page", 1, type=int))
+    cards = list_strategy_cards(owner=owner, limit=CARDS_POR_PAGINA, offset=(pagina - 1) * CARDS_POR_PAGINA)
     return render_template("painel/estrategias.html", strategies=cards)
 
 # (Opcional) detalhe da estratégia — crie um template "painel/estrategia_detalhe.html" quando quiser
@@ -9,26 +9,22 @@ from flask import Blueprint, request, flash, session, redirect, render_template,
 from werkzeug.utils import secure_filename
 
 from app.core.orchestrator import InsightFutures  # seu orchestrator
-from services.logic.save_data import salvar_todos_resultados
 from app.core.paths import criar_diretorio_resultado, ALLOWED_EXTENSIONS
 from app.core.config import settings
 
+from services.utils.artefatos import caminho_artefato
 from services.utils.file_io import arquivo_permitido
+from services.utils.tarefas import enfileirar
 from services.utils.process_lock import create_processing_lock, clear_processing_lock, is_processing_locked
 from services.repository.strategy_service import (
     register_upload,
     attach_upload,
     list_strategy_cards,
+    CARDS_POR_PAGINA,
     create_strategy,
     update_upload_result_dir,  # <-- salvar result_dir no upload
 )
 
-# ------------ THUMB SETUP (por upload) ------------
-# backend headless para gerar imagens com matplotlib
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
 bp = Blueprint("upload_routes", __name__)
 
 # Garante que as pastas existem
@@ -39,58 +35,17 @@ THUMBS_DIR = os.path.join(settings.static_dir, "thumbs")
 Path(THUMBS_DIR).mkdir(parents=True, exist_ok=True)
 
 
-def _save_upload_thumb(upload_id: int, df) -> str:
+def _agendar_thumb(upload_id: int, temp_path: str) -> None:
     """
-    Gera um thumb 16:9 a partir do DataFrame processado e salva em static/thumbs/upload_<id>.png.
-    Retorna o caminho absoluto salvo (ou string vazia em caso de falha).
+    Agenda o thumb 16:9 do upload (static/thumbs/upload_<id>.svg) em segundo plano, a partir
+    dos artefatos já gravados em temp_path. O card mostra placeholder até o arquivo existir.
     """
-    try:
-        if df is None or getattr(df, "empty", True):
-            return ""
-
-        # coluna preferencial para plot
-        y = None
-        preferred = [
-            "Caixa Líquido",
-            "Resultado Líquido Total Acumulado",
-            "Resultado líquido dia",
-            "ResultadoDiario",
-        ]
-        for col in preferred:
-            if col in df.columns:
-                y = df[col]
-                break
-        if y is None:
-            # fallback: primeira coluna numérica
-            num_cols = [c for c in df.columns if str(df[c].dtype).startswith(("float", "int"))]
-            if num_cols:
-                y = df[num_cols[0]]
-            else:
-                return ""
-
-        # eixo x: índice se for datetime, senão range
-        try:
-            x = df.index if str(df.index.dtype).startswith("datetime64") else range(len(y))
-        except Exception:
-            x = range(len(y))
-
-        out_path = os.path.join(THUMBS_DIR, f"upload_{int(upload_id)}.png")
-
-        plt.figure(figsize=(12, 6))  # ~16:8 (parecido com 16:9)
-        try:
-            plt.plot(x, y)
-            plt.xticks([])
-            plt.yticks([])
-            plt.tight_layout(pad=0.2)
-            # facecolor combinando com tema escuro
-            plt.savefig(out_path, dpi=110, facecolor="#0c1526")
-        finally:
-            plt.close()
+    from visual.miniaturas import gerar_miniatura
 
-        return out_path
+    try:
+        enfileirar(f"thumb:{int(upload_id)}", gerar_miniatura, int(upload_id), str(temp_path), THUMBS_DIR)
     except Exception:
-        logging.exception("Falha ao gerar thumb do upload %s", upload_id)
-        return ""
+        logging.exception("Falha ao agendar thumb do upload %s", upload_id)
 
 
 def _md5(path: str, chunk: int = 1024 * 1024) -> str:
@@ -245,12 +200,11 @@ def upload():
                 logging.info("🚧 Lock criado em %s/.processing.lock", temp_path)
 
                 logging.info("🔍 Iniciando processamento com InsightFutures...")
-                insight = InsightFutures(filepath)
-
-                salvar_todos_resultados(insight, str(temp_path))
+                # resultados gravados uma única vez, direto na pasta do upload
+                insight = InsightFutures(filepath, temp_path=str(temp_path))
 
                 # salva na sessão (compat)
-                session["json_path"] = os.path.join(str(temp_path), "ultimo_resultado.json")
+                session["json_path"] = caminho_artefato(str(temp_path), "ultimo_resultado")
                 session["filepath"] = os.path.abspath(filepath)
 
                 # persistir result_dir no upload (POR UPLOAD)
@@ -260,16 +214,14 @@ def upload():
                 except Exception:
                     logging.exception("Falha ao salvar result_dir no upload %s", upload_row["id"])
 
-                # gerar thumb específica deste upload
                 df = getattr(insight, "data", None)
                 if df is None or getattr(df, "empty", False):
                     logging.info("⚠️ DataFrame vazio ou inválido após processamento.")
                     flash("O processamento falhou. O arquivo pode estar com estrutura inválida.", "danger")
                     return redirect(request.url)
-                try:
-                    _save_upload_thumb(int(upload_row["id"]), df)
-                except Exception:
-                    logging.exception("Falha ao gerar thumb do upload %s", upload_row["id"])
+
+                # thumb específica deste upload (segundo plano, fora da requisição)
+                _agendar_thumb(int(upload_row["id"]), temp_path)
 
                 logging.info("✅ Processamento concluído")
                 flash("Análise concluída! Veja os resultados abaixo.", "success")
@@ -290,7 +242,10 @@ def upload():
             return redirect(request.url)
 
     logging.info("🖼️ Renderizando templates upload.html")
-    strategies = list_strategy_cards(owner=session.get("user"))
+    pagina = max(1, request.args.get("page", 1, type=int))
+    strategies = list_strategy_cards(
+        owner=session.get("user"), limit=CARDS_POR_PAGINA, offset=(pagina - 1) * CARDS_POR_PAGINA
+    )
     return render_template("painel/upload.html", strategies=strategies)
 
 
@@ -360,11 +315,11 @@ def upload_inline():
             create_processing_lock(str(temp_path)); lock_created = True
             logging.info("🚧 Lock criado em %s/.processing.lock", temp_path)
 
-            insight = InsightFutures(filepath)
-            salvar_todos_resultados(insight, str(temp_path))
+            # resultados gravados uma única vez, direto na pasta do upload
+            insight = InsightFutures(filepath, temp_path=str(temp_path))
 
             # salva na sessão (compat)
-            session["json_path"] = os.path.join(str(temp_path), "ultimo_resultado.json")
+            session["json_path"] = caminho_artefato(str(temp_path), "ultimo_resultado")
             session["filepath"] = os.path.abspath(filepath)
 
             # persistir result_dir no upload (POR UPLOAD)
@@ -374,13 +329,10 @@ def upload_inline():
             except Exception:
                 logging.exception("Falha ao salvar result_dir no upload %s", upload_row["id"])
 
-            # gerar thumb específica deste upload
-            try:
-                df = getattr(insight, "data", None)
-                if df is not None and not getattr(df, "empty", False):
-                    _save_upload_thumb(int(upload_row["id"]), df)
-            except Exception:
-                logging.exception("Falha ao gerar thumb do upload %s (inline)", upload_row["id"])
+            # thumb específica deste upload (segundo plano, fora da requisição)
+            df = getattr(insight, "data", None)
+            if df is not None and not getattr(df, "empty", False):
+                _agendar_thumb(int(upload_row["id"]), temp_path)
 
             logging.info("✅ Processamento concluído")
 
@@ -1,5 +1,5 @@
 function carregarGraficoCiclosDrawdown() {
-  fetch("/api/graficos/drawdown")
+  fetch("/api/graficos/drawdown?formato=figura")
     .then(res => res.json())
     .then(data => {
       if (data.status !== "ok") {
@@ -9,7 +9,7 @@ function carregarGraficoCiclosDrawdown() {
 
       const grafico = document.getElementById("grafico-ciclos-drawdown");
       if (grafico && data.grafico_ciclos) {
-        const obj = JSON.parse(data.grafico_ciclos);
+        const obj = data.grafico_ciclos;
         Plotly.newPlot(grafico, obj.data, obj.layout, {displaylogo: false});
       }
     })
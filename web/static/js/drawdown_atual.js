@@ -1,10 +1,11 @@
 function carregarGraficoDividaAcumulada() {
-  fetch("/api/graficos/divida")
+  fetch("/api/graficos/divida?formato=figura")
     .then(res => res.json())
     .then(dados => {
       if (dados.status === "ok" && dados.grafico_divida) {
-        const grafico = JSON.parse(dados.grafico_divida);  // <-- Converte string JSON para objeto JS
-        Plotly.newPlot("grafico-divida-real-time", grafico.data, grafico.layout);
+        const grafico = dados.grafico_divida;  // figura já vem como objeto (?formato=figura)
+        Plotly.newPlot("grafico-divida-real-time", grafico.data, grafico.layout)
+          .then(() => ligarZoomSerieCompleta("grafico-divida-real-time", grafico));
       } else {
         console.warn("⚠️ Dados não carregados para gráfico de dívida acumulada.");
       }
@@ -14,3 +15,34 @@ function carregarGraficoDividaAcumulada() {
     });
 }
 
+// Série reduzida no servidor (layout.meta.serie): no zoom busca só a janela visível
+// em resolução maior (/api/insights/linhas); ao voltar ao zoom total, restaura a reduzida.
+function ligarZoomSerieCompleta(id, figura) {
+  const serie = figura.layout && figura.layout.meta && figura.layout.meta.serie;
+  const el = document.getElementById(id);
+  if (!serie || !serie.reduzida || !el || !el.on) return;
+
+  const original = { x: figura.data[0].x.slice(), y: figura.data[0].y.slice() };
+  // índice vem em epoch ms de timestamps sem fuso: formata em UTC para não deslocar horários
+  const paraData = ms => new Date(ms).toISOString().slice(0, 19).replace("T", " ");
+
+  el.on("plotly_relayout", ev => {
+    if (ev["xaxis.autorange"]) {
+      Plotly.restyle(el, { x: [original.x], y: [original.y] }, [0]);
+      return;
+    }
+    const inicio = ev["xaxis.range[0]"], fim = ev["xaxis.range[1]"];
+    if (!inicio || !fim) return;
+
+    const q = new URLSearchParams({
+      inicio, fim, colunas: serie.coluna, max_pontos: 2000, metodo: serie.metodo, limit: 10000,
+    });
+    fetch(`/api/insights/linhas/${serie.artefato}?${q}`)
+      .then(res => res.json())
+      .then(d => {
+        if (d.status !== "ok" || !d.data.length) return;
+        Plotly.restyle(el, { x: [d.index.map(paraData)], y: [d.data.map(r => r[0])] }, [0]);
+      })
+      .catch(err => console.warn("Zoom sem série completa:", err));
+  });
+}
@@ -35,7 +35,7 @@ function atualizarGraficosInsight() {
 
 
 function carregarGraficosPadronizacao() {
-  fetch("/api/graficos/padronizacao")
+  fetch("/api/graficos/padronizacao?formato=figura")
     .then(res => res.json())
     .then(data => {
       if (data.status !== "ok") {
@@ -46,21 +46,21 @@ function carregarGraficosPadronizacao() {
       // 🔹 Gráfico de barras: distribuição das operações
       const graficoOperacoes = document.getElementById("grafico-operacoes");
       if (graficoOperacoes && data.barras_operacoes) {
-        const obj = JSON.parse(data.barras_operacoes);
+        const obj = data.barras_operacoes;
         Plotly.newPlot(graficoOperacoes, obj.data, obj.layout);
       }
 
       // 🔹 Gráfico pizza: distribuição de valores
       const graficoValores = document.getElementById("grafico-pizza-valores");
       if (graficoValores && data.pizza_valores) {
-        const obj = JSON.parse(data.pizza_valores);
+        const obj = data.pizza_valores;
         Plotly.newPlot(graficoValores, obj.data, obj.layout);
       }
 
       // 🔹 Gráfico pizza: distribuição de quantidades
       const graficoQtde = document.getElementById("grafico-pizza-qtde");
       if (graficoQtde && data.pizza_qtde) {
-        const obj = JSON.parse(data.pizza_qtde);
+        const obj = data.pizza_qtde;
         Plotly.newPlot(graficoQtde, obj.data, obj.layout);
       }
     })
@@ -1,5 +1,5 @@
 function carregarGraficoCiclosLucro() {
-  fetch("/api/graficos/lucro")
+  fetch("/api/graficos/lucro?formato=figura")
     .then(res => res.json())
     .then(data => {
       if (data.status !== "ok") {
@@ -9,7 +9,7 @@ function carregarGraficoCiclosLucro() {
 
       const grafico = document.getElementById("grafico-ciclos-lucro");
       if (grafico && data.grafico_lucro) {
-        const obj = JSON.parse(data.grafico_lucro);
+        const obj = data.grafico_lucro;
         Plotly.newPlot(grafico, obj.data, obj.layout);
       }
     })
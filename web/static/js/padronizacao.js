@@ -48,11 +48,11 @@
       setPercent("#pad_percentual_taxas",   "#barraTaxas",   taxas,   baseAbs);
 
       // 2) Gráficos via API de gráficos
-      const g = await fetch(`/api/graficos/padronizacao?t=${Date.now()}`, { cache: "no-store" });
+      const g = await fetch("/api/graficos/padronizacao?formato=figura", { cache: "no-cache" });
       const gj = await g.json();
-      const op  = gj.barras_operacoes ? JSON.parse(gj.barras_operacoes) : null;
-      const pv  = gj.pizza_valores     ? JSON.parse(gj.pizza_valores)     : null;
-      const pqt = gj.pizza_qtde        ? JSON.parse(gj.pizza_qtde)        : null;
+      const op  = gj.barras_operacoes || null;
+      const pv  = gj.pizza_valores    || null;
+      const pqt = gj.pizza_qtde       || null;
       drawPlotly("grafico-operacoes",    op,  { margin: { t: 20, r: 10, b: 30, l: 40 } });
       drawPlotly("grafico-pizza-valores", pv,  { margin: { t: 20, b: 20 } });
       drawPlotly("grafico-pizza-qtde",    pqt, { margin: { t: 20, b: 20 } });